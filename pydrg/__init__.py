@@ -11,7 +11,7 @@ concise imports like:
         IppsClient, IppsOutput, OppsClient, OppsOutput,
         IpfClient, IpfOutput, LtchClient, LtchOutput, HospiceClient, HospiceOutput,
         CMSDownloader, IPSFDatabase, OPSFDatabase, IPSFProvider, OPSFProvider, UrlLoader,
-        Pypps,
+        Pypps, PyppsProcessPool, AsyncPypps, ResultCache,
     )
 """
 
@@ -83,6 +83,9 @@ from .converter import (
 
 # High-level orchestrator
 from .pypps.pypps import Pypps, PyppsOutput
+from .pypps.process_pool import PyppsProcessPool
+from .pypps.async_pypps import AsyncPypps
+from .pypps.result_cache import ResultCache
 
 __all__ = [
     # Input models
@@ -160,5 +163,8 @@ __all__ = [
     "ICD10ConvertOutput",
     # Orchestrator
     "Pypps",
-    "PyppsOutput"
+    "PyppsOutput",
+    "PyppsProcessPool",
+    "AsyncPypps",
+    "ResultCache",
 ]
@@ -0,0 +1,295 @@
+"""
+Command line interface for batch processing claims.
+
+    python -m pydrg run claims.jsonl -o results.jsonl --errors errors.jsonl \\
+        --modules MSDRG,IPPS --workers 4 --chunk-size 64
+    python -m pydrg generate -n 1000000 -o claims.jsonl --seed 42
+
+Claims are read one JSON object per line from a file or stdin and streamed
+through ``Pypps.process``. Only a bounded window of claims is held in memory at
+any time, so input files can be far larger than RAM.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from contextlib import ExitStack
+from typing import IO, Callable, Iterator, Optional
+
+from pydrg.input.claim import Claim, Modules
+
+
+def _parse_modules(value: str) -> list[Modules]:
+    modules = []
+    for name in value.split(","):
+        name = name.strip().upper()
+        if not name:
+            continue
+        try:
+            modules.append(Modules(name))
+        except ValueError:
+            choices = ", ".join(m.value for m in Modules)
+            raise argparse.ArgumentTypeError(
+                f"unknown module {name!r} (choose from {choices})"
+            )
+    if not modules:
+        raise argparse.ArgumentTypeError("at least one module is required")
+    return modules
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pydrg", description="Process CMS claims with PyDrg."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser(
+        "run",
+        help="Stream claims from a JSONL file through Pypps",
+        description=(
+            "Stream claims (one JSON object per line) through Pypps and write "
+            "one PyppsOutput per line. Claims that fail go to the errors file."
+        ),
+    )
+    run.add_argument(
+        "input", nargs="?", default="-", help="Claims JSONL file, '-' for stdin"
+    )
+    run.add_argument(
+        "-o", "--output", default="-", help="Results JSONL file, '-' for stdout"
+    )
+    run.add_argument(
+        "--errors",
+        default=None,
+        help="JSONL file for failed claims (default: stderr)",
+    )
+    run.add_argument(
+        "--modules",
+        type=_parse_modules,
+        default=None,
+        help=(
+            "Comma separated modules to run for every claim, e.g. MSDRG,IPPS. "
+            "Overrides the modules listed on each claim."
+        ),
+    )
+    run.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="Worker processes, each with its own JVM (default: 1, in-process)",
+    )
+    run.add_argument(
+        "--chunk-size",
+        type=_positive_int,
+        default=64,
+        help="Claims sent to a worker process at a time (default: 64)",
+    )
+    run.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Write results as they complete instead of in input order",
+    )
+    run.add_argument("--jar-path", default="./jars", help="JAR directory")
+    run.add_argument("--db-path", default="./data/pypps.db", help="Database path")
+    run.add_argument(
+        "--no-download",
+        action="store_true",
+        help="Do not download missing CMS JARs",
+    )
+    run.add_argument(
+        "--log-level",
+        default="WARNING",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Log level (default: WARNING)",
+    )
+    run.set_defaults(func=run_command)
+
+    generate = subparsers.add_parser(
+        "generate",
+        help="Write seeded synthetic claims as JSONL",
+        description="Generate synthetic claims for load and scale testing.",
+    )
+    generate.add_argument(
+        "-n", "--count", type=_positive_int, required=True, help="Number of claims"
+    )
+    generate.add_argument(
+        "-o", "--output", default="-", help="Claims JSONL file, '-' for stdout"
+    )
+    generate.add_argument(
+        "--seed", type=int, default=0, help="Random seed (default: 0)"
+    )
+    generate.add_argument(
+        "--start",
+        type=int,
+        default=0,
+        help="Index of the first claim, to split a run across machines",
+    )
+    generate.add_argument(
+        "--families",
+        type=_parse_families,
+        default=None,
+        help="Claim family weights, e.g. ipps=3,opps=2,esrd (default: all equal)",
+    )
+    generate.add_argument(
+        "--db-path",
+        default=None,
+        help="Draw providers from the IPSF/OPSF tables in this SQLite database",
+    )
+    generate.set_defaults(func=generate_command)
+    return parser
+
+
+def _parse_families(value: str) -> dict[str, float]:
+    from pydrg.helpers.claim_generator import FAMILIES
+
+    families = {}
+    for item in value.split(","):
+        name, _, weight = item.strip().partition("=")
+        name = name.strip().lower()
+        if name not in FAMILIES:
+            raise argparse.ArgumentTypeError(
+                f"unknown claim family {name!r} (choose from {', '.join(FAMILIES)})"
+            )
+        try:
+            families[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight for {name}: {weight!r}")
+    return families
+
+
+class _ClaimReader:
+    """Parse claims lazily, reporting unparseable lines to the errors stream."""
+
+    def __init__(
+        self, lines: IO[str], errors: IO[str], modules: Optional[list[Modules]]
+    ):
+        self.lines = lines
+        self.errors = errors
+        self.modules = modules
+        self.read = 0
+        self.invalid = 0
+
+    def __iter__(self) -> Iterator[Claim]:
+        for line_number, line in enumerate(self.lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            self.read += 1
+            try:
+                claim = Claim.model_validate_json(line)
+            except Exception as e:
+                self.invalid += 1
+                record = {"line": line_number, "error": f"Invalid claim: {e}"}
+                self.errors.write(json.dumps(record) + "\n")
+                continue
+            if self.modules is not None:
+                claim.modules = list(self.modules)
+            yield claim
+
+
+def _open(
+    stack: ExitStack, path: Optional[str], mode: str, default: IO[str]
+) -> IO[str]:
+    if path is None or path == "-":
+        return default
+    return stack.enter_context(open(path, mode, encoding="utf-8"))
+
+
+def _outputs(args, claims: _ClaimReader):
+    pypps_kwargs = dict(
+        jar_path=args.jar_path,
+        db_path=args.db_path,
+        build_jar_dirs=not args.no_download,
+        log_level=getattr(logging, args.log_level),
+        lazy_clients=True,
+        modules=args.modules,
+    )
+    if args.workers > 1:
+        from pydrg.pypps.process_pool import PyppsProcessPool
+
+        with PyppsProcessPool(
+            processes=args.workers, chunk_size=args.chunk_size, **pypps_kwargs
+        ) as pool:
+            yield from pool.process_many(claims, ordered=not args.unordered)
+    else:
+        from pydrg.pypps.pypps import Pypps
+
+        with Pypps(**pypps_kwargs) as pypps:
+            yield from pypps.process_many(claims, workers=1)
+
+
+def run_command(args) -> int:
+    logging.basicConfig(level=getattr(logging, args.log_level))
+    start = time.perf_counter()
+    succeeded = failed = 0
+    with ExitStack() as stack:
+        output = _open(stack, args.output, "w", sys.stdout)
+        errors = _open(stack, args.errors, "w", sys.stderr)
+        input_file = _open(stack, args.input, "r", sys.stdin)
+        claims = _ClaimReader(input_file, errors, args.modules)
+        try:
+            for result in _outputs(args, claims):
+                if result.error is not None:
+                    failed += 1
+                    record = {"claim_id": result.claim_id, "error": result.error}
+                    errors.write(json.dumps(record) + "\n")
+                else:
+                    succeeded += 1
+                    output.write(result.model_dump_json(exclude_none=True) + "\n")
+        except KeyboardInterrupt:
+            print("Interrupted", file=sys.stderr)
+            return 130
+        finally:
+            output.flush()
+            errors.flush()
+            elapsed = time.perf_counter() - start
+            rate = claims.read / elapsed if elapsed > 0 else 0.0
+            print(
+                f"Processed {claims.read} claims in {elapsed:.2f}s "
+                f"({rate:.1f} claims/sec): {succeeded} succeeded, "
+                f"{failed} failed, {claims.invalid} invalid",
+                file=sys.stderr,
+            )
+    return 0
+
+
+def generate_command(args) -> int:
+    from pydrg.helpers.claim_generator import ClaimGenerator
+
+    overrides = {"families": args.families} if args.families else {}
+    generator = ClaimGenerator(seed=args.seed, **overrides)
+    if args.db_path is not None:
+        from sqlalchemy import create_engine
+
+        engine = create_engine(f"sqlite:///{args.db_path}")
+        try:
+            generator.use_database_providers(engine)
+        finally:
+            engine.dispose()
+
+    start = time.perf_counter()
+    written = 0
+    with ExitStack() as stack:
+        output = _open(stack, args.output, "w", sys.stdout)
+        for claim in generator.generate(args.count, args.start):
+            output.write(claim.model_dump_json(exclude_defaults=True) + "\n")
+            written += 1
+        output.flush()
+    elapsed = time.perf_counter() - start
+    print(f"Generated {written} claims in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    command: Callable[[argparse.Namespace], int] = args.func
+    return command(args)
@@ -2,6 +2,8 @@ from .cms_downloader import CMSDownloader
 from .utils import ReturnCode, float_or_none, py_date_to_java_date
 from .zipCL_loader import load_records, Zip9Data
 from .claim_examples import claim_example, json_claim_example, opps_claim_example
+from .metrics import MetricsRegistry, get_registry
+from .claim_generator import ClaimGenerator, ClaimGeneratorConfig
 
 __all__ = [
     "CMSDownloader",
@@ -13,4 +15,8 @@ __all__ = [
     "json_claim_example",
     "opps_claim_example",
     "Zip9Data",
+    "MetricsRegistry",
+    "get_registry",
+    "ClaimGenerator",
+    "ClaimGeneratorConfig",
 ]
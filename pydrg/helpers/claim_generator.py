@@ -0,0 +1,636 @@
+"""
+Seeded synthetic claim generator for load and scale testing.
+
+Claims are generated lazily, one at a time, so any volume can be streamed to a
+JSONL file or straight into ``Pypps.process_many``:
+
+    from pydrg.helpers.claim_generator import ClaimGenerator
+
+    generator = ClaimGenerator(seed=42, families={"ipps": 3, "opps": 1})
+    generator.write_jsonl("claims.jsonl", 10_000_000)
+
+The same seed and configuration always produce the same claims. Codes,
+providers, dates and the mix of claim families are configurable through
+``ClaimGeneratorConfig``; ``use_database_providers`` swaps the default
+providers for CCNs found in the local IPSF/OPSF tables.
+"""
+
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate, count as counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import sqlalchemy
+from pydantic import BaseModel, Field, model_validator
+from sqlalchemy import select
+
+from pydrg.input.claim import (
+    Claim,
+    DiagnosisCode,
+    LineItem,
+    Modules,
+    PoaType,
+    ProcedureCode,
+    Provider,
+    ValueCode,
+)
+from pydrg.input.irf_pai import IrfPai
+from pydrg.input.oasis import OasisAssessment
+
+FAMILIES = ("ipps", "opps", "hha", "irf", "esrd", "hospice")
+
+# Modules each claim family is routed through when ``assign_modules`` is set
+FAMILY_MODULES = {
+    "ipps": [Modules.MCE, Modules.MSDRG, Modules.IPPS],
+    "opps": [Modules.IOCE, Modules.OPPS],
+    "hha": [Modules.HHAG, Modules.HHA],
+    "irf": [Modules.CMG, Modules.IRF],
+    "esrd": [Modules.ESRD],
+    "hospice": [Modules.HOSPICE],
+}
+
+# Provider file each family's pricer reads, None when it uses none
+FAMILY_PROVIDER_FILES = {
+    "ipps": "ipsf",
+    "opps": "opsf",
+    "hha": "ipsf",
+    "irf": "ipsf",
+    "esrd": "opsf",
+    "hospice": None,
+}
+
+# Ranges of the last four CCN digits assigned to each facility type
+CCN_RANGES = {
+    "ipps": [(1, 879)],
+    "opps": [(1, 879)],
+    "irf": [(3025, 3099)],
+    "hha": [(7000, 8499), (9000, 9799)],
+    "esrd": [(2300, 2499), (3500, 3699)],
+    "hospice": [(1500, 1799)],
+}
+
+DEFAULT_PROVIDERS = {
+    "ipps": ["010001"],
+    "opps": ["010001"],
+    "hha": ["010001"],
+    "irf": ["013025"],
+    "esrd": ["012525"],
+    "hospice": ["010001"],
+}
+
+IPPS_PRINCIPAL_DXS: Dict[str, float] = {
+    "A419": 8,
+    "I214": 6,
+    "I5023": 6,
+    "J189": 6,
+    "N390": 5,
+    "J441": 5,
+    "I639": 4,
+    "K922": 3,
+    "E1165": 3,
+    "N179": 3,
+    "K8000": 2,
+    "S72001A": 2,
+    "I4891": 3,
+    "J9601": 2,
+    "A021": 1,
+}
+IPPS_PROCEDURES: Dict[str, float] = {
+    "0DTJ4ZZ": 2,
+    "02703ZZ": 2,
+    "0SR9019": 2,
+    "5A1955Z": 3,
+    "0BH17EZ": 2,
+    "30233N1": 4,
+    "0FT44ZZ": 1,
+    "027034Z": 2,
+    "3E0G76Z": 1,
+}
+SECONDARY_DXS: Dict[str, float] = {
+    "E119": 8,
+    "I10": 10,
+    "E785": 6,
+    "I2510": 5,
+    "J449": 4,
+    "E871": 3,
+    "D649": 3,
+    "F17210": 3,
+    "Z794": 3,
+    "N183": 3,
+    "E6601": 2,
+    "I82411": 1,
+    "K219": 3,
+    "F329": 2,
+    "Z7901": 2,
+}
+OPPS_PRINCIPAL_DXS: Dict[str, float] = {
+    "R079": 6,
+    "M545": 6,
+    "R109": 5,
+    "J069": 4,
+    "S6991XA": 2,
+    "R51": 3,
+    "N390": 3,
+    "K5900": 2,
+    "M25561": 2,
+    "S3215XK": 1,
+}
+# (revenue code, HCPCS) pairs billed on outpatient lines
+OPPS_SERVICES: Dict[Tuple[str, str], float] = {
+    ("0450", "99284"): 6,
+    ("0450", "99283"): 5,
+    ("0320", "71046"): 5,
+    ("0300", "80053"): 6,
+    ("0300", "85025"): 6,
+    ("0610", "72196"): 2,
+    ("0360", "29305"): 1,
+    ("0636", "J1885"): 3,
+    ("0510", "G0463"): 4,
+    ("0730", "93005"): 4,
+    ("0350", "70450"): 3,
+    ("0300", "81001"): 3,
+    ("0260", "96374"): 3,
+    ("0250", ""): 2,
+}
+HHA_PRINCIPAL_DXS: Dict[str, float] = {
+    "I10": 4,
+    "I5022": 4,
+    "M1711": 3,
+    "E119": 3,
+    "J449": 3,
+    "I69351": 2,
+    "S72001D": 2,
+    "L89154": 1,
+}
+HHA_VISIT_REVENUE_CODES = {
+    "0420": 4,
+    "0430": 3,
+    "0440": 1,
+    "0550": 6,
+    "0560": 1,
+    "0570": 2,
+}
+IRF_CASES: Dict[Tuple[str, str], float] = {
+    # principal dx -> impairment group code
+    ("I63511", "0001.2   "): 4,
+    ("I6389", "0001.1   "): 3,
+    ("S72001A", "0008.11  "): 3,
+    ("M1711", "0008.51  "): 3,
+    ("G20", "0003.2   "): 1,
+    ("D61.03", "0012.9   "): 1,
+}
+ESRD_PRINCIPAL_DXS: Dict[str, float] = {"N186": 10, "I120": 4, "E1122": 3}
+HOSPICE_PRINCIPAL_DXS: Dict[str, float] = {
+    "C349": 4,
+    "G309": 4,
+    "I5022": 3,
+    "J449": 3,
+    "C259": 2,
+    "G20": 1,
+    "C189": 2,
+}
+
+
+class ClaimGeneratorConfig(BaseModel):
+    """
+    Distributions used by ``ClaimGenerator``.
+
+    Code tables map each code to a relative weight. ``families`` weighs the
+    claim families and ``providers`` lists the provider CCNs drawn for each
+    family. Claims have a thru date uniformly distributed in
+    ``[start_date, end_date]``.
+    """
+
+    families: Dict[str, float] = Field(
+        default_factory=lambda: {f: 1.0 for f in FAMILIES}
+    )
+    providers: Dict[str, List[str]] = Field(
+        default_factory=lambda: {f: list(c) for f, c in DEFAULT_PROVIDERS.items()}
+    )
+    start_date: datetime = datetime(2024, 10, 1)
+    end_date: datetime = datetime(2025, 9, 30)
+    claim_id_prefix: str = "SYN"
+    assign_modules: bool = True
+
+    ipps_principal_dxs: Dict[str, float] = Field(
+        default_factory=lambda: dict(IPPS_PRINCIPAL_DXS)
+    )
+    ipps_procedures: Dict[str, float] = Field(
+        default_factory=lambda: dict(IPPS_PROCEDURES)
+    )
+    secondary_dxs: Dict[str, float] = Field(default_factory=lambda: dict(SECONDARY_DXS))
+    opps_principal_dxs: Dict[str, float] = Field(
+        default_factory=lambda: dict(OPPS_PRINCIPAL_DXS)
+    )
+    opps_services: Dict[Tuple[str, str], float] = Field(
+        default_factory=lambda: dict(OPPS_SERVICES)
+    )
+    hha_principal_dxs: Dict[str, float] = Field(
+        default_factory=lambda: dict(HHA_PRINCIPAL_DXS)
+    )
+    irf_cases: Dict[Tuple[str, str], float] = Field(
+        default_factory=lambda: dict(IRF_CASES)
+    )
+    esrd_principal_dxs: Dict[str, float] = Field(
+        default_factory=lambda: dict(ESRD_PRINCIPAL_DXS)
+    )
+    hospice_principal_dxs: Dict[str, float] = Field(
+        default_factory=lambda: dict(HOSPICE_PRINCIPAL_DXS)
+    )
+
+    max_secondary_dxs: int = 8
+    max_procedures: int = 3
+    ipps_los: Tuple[int, int] = (1, 14)
+    opps_lines: Tuple[int, int] = (3, 40)
+    hospice_days: Tuple[int, int] = (5, 30)
+
+    @model_validator(mode="after")
+    def check_config(self):
+        unknown = set(self.families) - set(FAMILIES)
+        if unknown:
+            raise ValueError(f"Unknown claim families: {sorted(unknown)}")
+        if not any(weight > 0 for weight in self.families.values()):
+            raise ValueError("At least one claim family needs a positive weight")
+        for family, weight in self.families.items():
+            if weight > 0 and not self.providers.get(family):
+                raise ValueError(f"No providers configured for {family} claims")
+        if self.start_date > self.end_date:
+            raise ValueError("start_date cannot be after end_date")
+        return self
+
+
+class _Weighted:
+    """Weighted sampler with precomputed cumulative weights."""
+
+    def __init__(self, table: Dict):
+        self.values = list(table)
+        self.cum_weights = list(accumulate(table.values()))
+
+    def __call__(self, rng: random.Random):
+        return rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+
+def ccn_matches_family(ccn: str, family: str) -> bool:
+    """True if the CCN's facility-type digits fall in the ranges used by ``family``."""
+    if len(ccn) != 6 or not ccn[2:].isdigit():
+        return False
+    number = int(ccn[2:])
+    return any(low <= number <= high for low, high in CCN_RANGES[family])
+
+
+def load_provider_ccns(
+    engine: sqlalchemy.Engine, family: str, limit: int = 1000
+) -> List[str]:
+    """
+    Return up to ``limit`` CCNs from the provider file ``family`` is priced
+    with, keeping only CCNs whose number range matches the facility type.
+    """
+    provider_file = FAMILY_PROVIDER_FILES[family]
+    if provider_file is None:
+        return []
+    if provider_file == "ipsf":
+        from pydrg.pricers.ipsf import IPSF as table
+    else:
+        from pydrg.pricers.opsf import OPSF as table
+    if not sqlalchemy.inspect(engine).has_table(table.__tablename__):
+        return []
+    query = select(table.provider_ccn).distinct().order_by(table.provider_ccn)
+    ccns = []
+    with engine.connect() as conn:
+        for (ccn,) in conn.execute(query):
+            if ccn and ccn_matches_family(ccn, family):
+                ccns.append(ccn)
+                if len(ccns) >= limit:
+                    break
+    return ccns
+
+
+class ClaimGenerator:
+    """
+    Streaming generator of valid synthetic ``Claim`` objects.
+
+    Each claim family (IPPS inpatient, OPPS outpatient, HHA with an
+    ``OasisAssessment``, IRF with an ``IrfPai``, ESRD and hospice) is built to
+    the shape its grouper and pricer expect. Output is reproducible for a given
+    ``seed`` and configuration.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        config: Optional[ClaimGeneratorConfig] = None,
+        **overrides,
+    ):
+        if config is None:
+            config = ClaimGeneratorConfig(**overrides)
+        elif overrides:
+            config = ClaimGeneratorConfig(**{**config.model_dump(), **overrides})
+        self.seed = seed
+        self.config = config
+        self._build_samplers()
+
+    def _build_samplers(self):
+        config = self.config
+        families = {f: w for f, w in config.families.items() if w > 0}
+        self._family = _Weighted(families)
+        self._ipps_dx = _Weighted(config.ipps_principal_dxs)
+        self._ipps_px = _Weighted(config.ipps_procedures)
+        self._secondary_dx = _Weighted(config.secondary_dxs)
+        self._opps_dx = _Weighted(config.opps_principal_dxs)
+        self._opps_service = _Weighted(config.opps_services)
+        self._hha_dx = _Weighted(config.hha_principal_dxs)
+        self._hha_visit = _Weighted(HHA_VISIT_REVENUE_CODES)
+        self._irf_case = _Weighted(config.irf_cases)
+        self._esrd_dx = _Weighted(config.esrd_principal_dxs)
+        self._hospice_dx = _Weighted(config.hospice_principal_dxs)
+        self._date_span = (config.end_date - config.start_date).days
+
+    def use_database_providers(self, engine: sqlalchemy.Engine, limit: int = 1000):
+        """
+        Draw providers from the local IPSF/OPSF tables. Families with no
+        matching CCNs keep their configured providers.
+        """
+        for family in FAMILIES:
+            ccns = load_provider_ccns(engine, family, limit)
+            if ccns:
+                self.config.providers[family] = ccns
+        return self
+
+    def generate(self, count: Optional[int] = None, start: int = 0) -> Iterator[Claim]:
+        """
+        Yield ``count`` claims (endlessly when None) numbered from ``start``.
+
+        Every claim is drawn from its own RNG seeded by ``seed`` and its index,
+        so claim N is the same whichever range it is generated in. Workers can
+        split a large run into ranges and produce identical output.
+        """
+        indexes = counter(start) if count is None else range(start, start + count)
+        builders = {
+            "ipps": self._ipps_claim,
+            "opps": self._opps_claim,
+            "hha": self._hha_claim,
+            "irf": self._irf_claim,
+            "esrd": self._esrd_claim,
+            "hospice": self._hospice_claim,
+        }
+        for index in indexes:
+            rng = random.Random(self.seed * 10**12 + index)
+            family = self._family(rng)
+            claim = builders[family](rng)
+            claim.claimid = f"{self.config.claim_id_prefix}{self.seed}-{index:09d}"
+            claim.billing_provider = Provider(
+                other_id=rng.choice(self.config.providers[family])
+            )
+            if self.config.assign_modules:
+                claim.modules = list(FAMILY_MODULES[family])
+            yield claim
+
+    def write_jsonl(self, path: str, count: int, start: int = 0) -> int:
+        """Write ``count`` claims to ``path`` as JSONL, returning the number written."""
+        written = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for claim in self.generate(count, start):
+                f.write(claim.model_dump_json(exclude_defaults=True) + "\n")
+                written += 1
+        return written
+
+    # Shared pieces
+
+    def _thru_date(self, rng: random.Random) -> datetime:
+        return self.config.start_date + timedelta(days=rng.randint(0, self._date_span))
+
+    def _patient(self, claim: Claim, rng: random.Random, min_age: int, max_age: int):
+        age = rng.randint(min_age, max_age)
+        claim.patient.age = age
+        claim.patient.sex = rng.choice(("M", "F"))
+        birthday = (claim.thru_date or self.config.end_date) - timedelta(
+            days=age * 365 + rng.randint(1, 364)
+        )
+        claim.patient.date_of_birth = datetime(
+            birthday.year, birthday.month, birthday.day
+        )
+
+    def _secondary_dxs(
+        self, rng: random.Random, principal: str, poa: bool
+    ) -> List[DiagnosisCode]:
+        codes = []
+        for _ in range(rng.randint(0, self.config.max_secondary_dxs)):
+            code = self._secondary_dx(rng)
+            if code != principal and code not in codes:
+                codes.append(code)
+        return [
+            DiagnosisCode(
+                code=code,
+                poa=(
+                    rng.choice((PoaType.Y, PoaType.Y, PoaType.Y, PoaType.N))
+                    if poa
+                    else PoaType.BLANK
+                ),
+            )
+            for code in codes
+        ]
+
+    # Claim families
+
+    def _ipps_claim(self, rng: random.Random) -> Claim:
+        claim = Claim(
+            bill_type="111",
+            patient_status=rng.choice(("01", "01", "01", "03", "06", "20")),
+        )
+        thru = self._thru_date(rng)
+        los = rng.randint(*self.config.ipps_los)
+        admit = thru - timedelta(days=los)
+        claim.admit_date = claim.from_date = admit
+        claim.thru_date = thru
+        claim.los = los
+        self._patient(claim, rng, 65, 95)
+        principal = self._ipps_dx(rng)
+        claim.principal_dx = DiagnosisCode(code=principal, poa=PoaType.Y)
+        claim.admit_dx = DiagnosisCode(code=principal, poa=PoaType.Y)
+        claim.secondary_dxs = self._secondary_dxs(rng, principal, poa=True)
+        for _ in range(rng.randint(0, self.config.max_procedures)):
+            claim.inpatient_pxs.append(
+                ProcedureCode(
+                    code=self._ipps_px(rng),
+                    date=admit + timedelta(days=rng.randint(0, los)),
+                )
+            )
+        claim.total_charges = round(rng.uniform(8_000, 40_000) * max(los, 1) ** 0.5, 2)
+        return claim
+
+    def _opps_claim(self, rng: random.Random) -> Claim:
+        claim = Claim(bill_type="131", patient_status="01")
+        thru = self._thru_date(rng)
+        start = thru - timedelta(days=rng.choice((0, 0, 0, 1, 2)))
+        claim.from_date = start
+        claim.thru_date = thru
+        self._patient(claim, rng, 65, 95)
+        principal = self._opps_dx(rng)
+        claim.principal_dx = DiagnosisCode(code=principal)
+        claim.secondary_dxs = self._secondary_dxs(rng, principal, poa=False)
+        span = (thru - start).days
+        for _ in range(rng.randint(*self.config.opps_lines)):
+            revenue_code, hcpcs = self._opps_service(rng)
+            claim.lines.append(
+                LineItem(
+                    service_date=start + timedelta(days=rng.randint(0, span)),
+                    revenue_code=revenue_code,
+                    hcpcs=hcpcs,
+                    units=1 if hcpcs else rng.randint(1, 4),
+                    charges=round(rng.uniform(20, 2_500), 2),
+                )
+            )
+        claim.total_charges = round(sum(line.charges for line in claim.lines), 2)
+        return claim
+
+    def _hha_claim(self, rng: random.Random) -> Claim:
+        claim = Claim(bill_type="329", patient_status="01")
+        thru = self._thru_date(rng)
+        start = thru - timedelta(days=29)
+        claim.admit_date = claim.from_date = start
+        claim.thru_date = thru
+        claim.los = 30
+        self._patient(claim, rng, 65, 95)
+        principal = self._hha_dx(rng)
+        claim.principal_dx = DiagnosisCode(code=principal, poa=PoaType.Y)
+        claim.secondary_dxs = self._secondary_dxs(rng, principal, poa=True)
+        for _ in range(rng.randint(4, 14)):
+            claim.lines.append(
+                LineItem(
+                    service_date=start + timedelta(days=rng.randint(0, 29)),
+                    revenue_code=self._hha_visit(rng),
+                    units=rng.randint(1, 6),
+                    charges=round(rng.uniform(100, 400), 2),
+                )
+            )
+        flags = [rng.random() < 0.3 for _ in range(9)]
+        claim.oasis_assessment = OasisAssessment(
+            fall_risk=flags[0],
+            weight_loss=flags[1],
+            multiple_hospital_stays=flags[2],
+            multiple_ed_visits=flags[3],
+            mental_behavior_risk=flags[4],
+            compliance_risk=flags[5],
+            five_or_more_meds=flags[6],
+            exhaustion=flags[7],
+            other_risk=flags[8],
+            none_of_above=not any(flags),
+            grooming=str(rng.randint(0, 3)),
+            dress_upper=str(rng.randint(0, 3)),
+            dress_lower=str(rng.randint(0, 3)),
+            bathing=str(rng.randint(0, 6)),
+            toileting=str(rng.randint(0, 4)),
+            transferring=str(rng.randint(0, 5)),
+            ambulation=str(rng.randint(0, 6)),
+        )
+        return claim
+
+    def _irf_claim(self, rng: random.Random) -> Claim:
+        claim = Claim(
+            bill_type="111", patient_status=rng.choice(("01", "01", "06", "62"))
+        )
+        thru = self._thru_date(rng)
+        los = rng.randint(7, 30)
+        admit = thru - timedelta(days=los)
+        claim.admit_date = claim.from_date = admit
+        claim.thru_date = thru
+        claim.los = los
+        self._patient(claim, rng, 65, 95)
+        principal, impairment_group = self._irf_case(rng)
+        claim.principal_dx = DiagnosisCode(code=principal, poa=PoaType.Y)
+        claim.secondary_dxs = self._secondary_dxs(rng, principal, poa=True)
+        claim.irf_pai = IrfPai(impairment_admit_group_code=impairment_group)
+        for field in (
+            "eating_self_admsn_cd",
+            "oral_hygne_admsn_cd",
+            "toileting_hygne_admsn_cd",
+            "bathing_hygne_admsn_cd",
+            "upper_body_dressing_cd",
+            "lower_body_dressing_cd",
+            "footwear_dressing_cd",
+            "sit_to_lying_cd",
+            "lying_to_sit_cd",
+            "sit_to_stand_cd",
+            "chair_bed_transfer_cd",
+            "toilet_transfer_cd",
+            "walk_10_feet_cd",
+            "walk_50_feet_cd",
+            "walk_150_feet_cd",
+            "step_1_cd",
+        ):
+            setattr(claim.irf_pai, field, f"{rng.randint(1, 6):02d}")
+        claim.irf_pai.urinary_continence_cd = str(rng.randint(0, 4))
+        claim.irf_pai.bowel_continence_cd = str(rng.randint(0, 3))
+        return claim
+
+    def _esrd_claim(self, rng: random.Random) -> Claim:
+        claim = Claim(bill_type="721", patient_status="01", cond_codes=["74"])
+        thru = self._thru_date(rng)
+        start = datetime(thru.year, thru.month, 1)
+        claim.from_date = start
+        claim.thru_date = thru
+        self._patient(claim, rng, 20, 90)
+        claim.esrd_initial_date = start - timedelta(days=rng.randint(30, 3_000))
+        claim.principal_dx = DiagnosisCode(code=self._esrd_dx(rng))
+        claim.secondary_dxs = self._secondary_dxs(
+            rng, claim.principal_dx.code, poa=False
+        )
+        claim.value_codes = [
+            ValueCode(code="A8", amount=round(rng.uniform(45, 130), 1)),
+            ValueCode(code="A9", amount=round(rng.uniform(150, 195), 1)),
+        ]
+        # Three sessions a week through the thru date
+        day = start + timedelta(days=rng.randint(0, 1))
+        while day <= thru:
+            claim.lines.append(
+                LineItem(
+                    service_date=day,
+                    revenue_code="0821",
+                    units=1,
+                    charges=round(rng.uniform(300, 900), 2),
+                )
+            )
+            day += timedelta(days=2 if day.weekday() in (0, 2) else 3)
+        if not claim.lines:
+            claim.lines.append(
+                LineItem(service_date=thru, revenue_code="0821", units=1, charges=500.0)
+            )
+        return claim
+
+    def _hospice_claim(self, rng: random.Random) -> Claim:
+        claim = Claim(
+            bill_type="812", patient_status=rng.choice(("30", "30", "40", "41"))
+        )
+        thru = self._thru_date(rng)
+        days = rng.randint(*self.config.hospice_days)
+        start = thru - timedelta(days=days - 1)
+        claim.admit_date = claim.from_date = start
+        claim.thru_date = thru
+        claim.los = days
+        self._patient(claim, rng, 65, 100)
+        claim.principal_dx = DiagnosisCode(code=self._hospice_dx(rng))
+        cbsa = rng.choice((35300, 16740, 35620, 31080, 12060))
+        claim.value_codes = [
+            ValueCode(code="61", amount=float(cbsa)),
+            ValueCode(code="G8", amount=float(cbsa)),
+        ]
+        claim.lines.append(
+            LineItem(
+                hcpcs="Q5001",
+                revenue_code="0651",
+                service_date=start,
+                units=days,
+                charges=round(days * rng.uniform(180, 260), 2),
+            )
+        )
+        for _ in range(rng.randint(0, 4)):
+            claim.lines.append(
+                LineItem(
+                    hcpcs="G0299",
+                    revenue_code="0551",
+                    service_date=start + timedelta(days=rng.randint(0, days - 1)),
+                    units=rng.randint(1, 4),
+                    charges=round(rng.uniform(150, 600), 2),
+                )
+            )
+        return claim
@@ -0,0 +1,276 @@
+"""
+Lightweight metrics for claim processing.
+
+Every client records how long it spends building the Java input, running the
+Java component and extracting the Python output. Timings go into a process-wide
+``MetricsRegistry`` of counters and latency histograms that can be read as a
+snapshot dict or as Prometheus text exposition format.
+
+    from pydrg.helpers.metrics import get_registry
+
+    registry = get_registry()
+    print(registry.snapshot()["histograms"])
+    print(registry.to_prometheus())
+"""
+
+import bisect
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+# Upper bounds, in seconds, of the default latency buckets
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+STAGE_SECONDS = "pydrg_stage_seconds"
+STAGE_ERRORS = "pydrg_stage_errors_total"
+CLAIMS_TOTAL = "pydrg_claims_total"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """
+    Fixed-size latency histogram.
+
+    Memory does not grow with the number of observations. Percentiles are
+    estimated by linear interpolation inside the bucket that holds the
+    requested rank, and clamped to the observed min/max.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Estimate the ``q``-th percentile (0-100) of the observed values."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1.0, q / 100.0 * self.count)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count == 0:
+                continue
+            if seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                lower = max(lower, self.min)
+                upper = min(upper, self.max)
+                fraction = (rank - seen) / bucket_count
+                return lower + (upper - lower) * fraction
+            seen += bucket_count
+        return self.max
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "min": self.min if self.count else 0.0,
+                "max": self.max,
+                "mean": self.mean,
+                "p50": self.percentile(50),
+                "p95": self.percentile(95),
+                "p99": self.percentile(99),
+                "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+            }
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe registry of labelled counters and latency histograms."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.enabled = True
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, LatencyHistogram]] = {}
+        self._lock = Lock()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = LatencyHistogram(self.buckets)
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        if not self.enabled:
+            return
+        self.histogram(name, **labels).observe(seconds)
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Return all metrics as plain data:
+        ``{"counters": {name: [{"labels": {...}, "value": n}]},
+           "histograms": {name: [{"labels": {...}, "count": n, "p99": s, ...}]}}``
+        """
+        with self._lock:
+            counters = {
+                name: [
+                    {"labels": dict(key), "value": value}
+                    for key, value in series.items()
+                ]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: list(series.items()) for name, series in self._histograms.items()
+            }
+        return {
+            "counters": counters,
+            "histograms": {
+                name: [
+                    {"labels": dict(key), **histogram.snapshot()}
+                    for key, histogram in series
+                ]
+                for name, series in histograms.items()
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: dict(series) for name, series in self._histograms.items()
+            }
+        for name, series in sorted(counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            for key, value in series.items():
+                lines.append(f"{name}{_format_labels(key)} {value}")
+        for name, histogram_series in sorted(histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for labels_key, histogram in histogram_series.items():
+                with histogram._lock:
+                    counts = list(histogram.counts)
+                    total, count = histogram.sum, histogram.count
+                cumulative = 0
+                for bound, bucket_count in zip([*histogram.buckets, "+Inf"], counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(labels_key, ("le", str(bound)))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels_key)} {total}")
+                lines.append(f"{name}_count{_format_labels(labels_key)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+# Per-claim stage timings, set while Pypps collects timings for a claim
+_claim_timings: ContextVar[Optional[Dict[str, Dict[str, float]]]] = ContextVar(
+    "pydrg_claim_timings", default=None
+)
+
+
+def get_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _registry
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, Dict[str, float]]]:
+    """
+    Collect the stage timings recorded in this context into a dict of
+    ``{module: {stage: seconds}}``. Work submitted to other threads is included
+    when it runs in a copy of this context (see ``contextvars.copy_context``).
+    """
+    timings: Dict[str, Dict[str, float]] = {}
+    token = _claim_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _claim_timings.reset(token)
+
+
+@contextmanager
+def stage_timer(module: str, stage: str) -> Iterator[None]:
+    """
+    Time one processing stage of a module, e.g. ``stage_timer("msdrg", "java")``.
+
+    The elapsed time is recorded in the ``pydrg_stage_seconds`` histogram,
+    failures are counted in ``pydrg_stage_errors_total`` and, when
+    ``collect_timings`` is active, the time is added to the per-claim timings.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        _registry.inc(STAGE_ERRORS, module=module, stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _registry.observe(STAGE_SECONDS, elapsed, module=module, stage=stage)
+        timings = _claim_timings.get()
+        if timings is not None:
+            module_timings = timings.setdefault(module, {})
+            module_timings[stage] = module_timings.get(stage, 0.0) + elapsed
@@ -1,8 +1,10 @@
 from datetime import datetime
 import functools
+import hashlib
 import io
+import os
 from contextlib import redirect_stderr
-from typing import Optional
+from typing import Iterable, Optional
 from os import getenv
 import jpype
 from pydantic import BaseModel
@@ -95,6 +97,20 @@ def create_supported_years(pps: str) -> jpype.JObject:
     return java_array
 
 
+def attach_jvm_thread():
+    """
+    Attach the calling thread to the JVM as a daemon thread.
+
+    Intended as a thread pool initializer so worker threads are attached once up
+    front rather than on their first Java call, and never hold up JVM shutdown.
+    """
+    if not jpype.isJVMStarted():
+        return
+    java_thread = jpype.JClass("java.lang.Thread")
+    if not java_thread.isAttached():
+        java_thread.attachAsDaemon()
+
+
 def handle_java_exceptions(func):
     """
     Decorator to catch and handle Java exceptions from jpype calls.
@@ -134,3 +150,27 @@ def handle_java_exceptions(func):
             raise RuntimeError(error_msg) from java_ex
 
     return wrapper
+
+
+def fingerprint_paths(paths: Iterable[str]) -> str:
+    """
+    Fingerprint the files under ``paths`` (name, size and modification time)
+    so a new JAR or a rebuilt database invalidates cached results.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.isfile(path):
+            files = [path]
+        elif os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+                if name.endswith(".jar")
+            )
+        else:
+            continue
+        for file_path in files:
+            stat = os.stat(file_path)
+            digest.update(f"{file_path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
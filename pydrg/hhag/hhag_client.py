@@ -1,6 +1,7 @@
 import jpype
 from pydrg.input.claim import Claim
 from pydrg.hhag.hhag_output import HhagOutput
+from pydrg.helpers.metrics import stage_timer
 from pydrg.helpers.utils import handle_java_exceptions
 
 
@@ -116,8 +117,11 @@ class HhagClient:
         Process the claim through the HHAG system.
         Remember that the HHA Grouper requires OASIS assesment data to be entered..
         """
-        claim_obj = self.create_input_claim(claim)
-        self.hhag_grouper_obj.group(claim_obj)
-        hhag_output = HhagOutput()
-        hhag_output.from_java(claim_obj)
+        with stage_timer("hhag", "input"):
+            claim_obj = self.create_input_claim(claim)
+        with stage_timer("hhag", "java"):
+            self.hhag_grouper_obj.group(claim_obj)
+        with stage_timer("hhag", "output"):
+            hhag_output = HhagOutput()
+            hhag_output.from_java(claim_obj)
         return hhag_output
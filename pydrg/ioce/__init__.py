@@ -1,5 +1,7 @@
+from .description_store import IoceDescriptionStore
 from .ioce_client import IoceClient
 from .ioce_output import (
+    IoceExtractionProfile,
     IoceOutput,
     IoceOutputDiagnosisCode,
     IoceOutputEdit,
@@ -12,6 +14,8 @@ from .ioce_output import (
 
 __all__ = [
     "IoceClient",
+    "IoceDescriptionStore",
+    "IoceExtractionProfile",
     "IoceOutput",
     "IoceProcessingInformation",
     "IoceOutputDiagnosisCode",
@@ -0,0 +1,164 @@
+import logging
+import os
+import sqlite3
+from threading import Lock
+from typing import Iterable, Optional, Tuple
+
+from pydrg.helpers.utils import fingerprint_paths
+
+# Candidate codes of the small IOCE description tables, probed for every
+# internal version by ``IoceClient.export_descriptions``. The IOCE cannot list
+# its tables, so these ranges are a superset; codes without a description are
+# not stored. HCPCS, APC and diagnosis tables are too large to probe and are
+# exported from the codes a caller passes in (or has already looked up).
+IOCE_STATUS_INDICATORS = (
+    "A",
+    "B",
+    "C",
+    "D",
+    "E",
+    "E1",
+    "E2",
+    "F",
+    "G",
+    "H",
+    "J1",
+    "J2",
+    "K",
+    "L",
+    "M",
+    "N",
+    "P",
+    "Q1",
+    "Q2",
+    "Q3",
+    "Q4",
+    "R",
+    "S",
+    "T",
+    "U",
+    "V",
+    "W",
+    "Y",
+    "Z",
+)
+IOCE_TABLE_CODES = {
+    "edit": tuple(str(edit) for edit in range(1, 200)),
+    "status_indicator": IOCE_STATUS_INDICATORS,
+    "claim_processed_flag": tuple(str(flag) for flag in range(10)),
+    "packaging_flag": tuple(str(flag) for flag in range(10)),
+    "payment_adjustment_flag": tuple(str(flag) for flag in range(100)),
+    "disposition": tuple(str(kind) for kind in range(1, 8)),
+    "disposition_value": tuple(
+        (str(kind), str(value)) for kind in range(1, 8) for value in range(10)
+    ),
+    "return_code": tuple(str(code) for code in range(100)),
+}
+
+
+class IoceDescriptionStore:
+    """
+    On-disk dictionary of IOCE descriptions keyed by (internal version,
+    description kind, code), read by ``IoceClient.describe`` before it calls
+    Java.
+
+    The store records a fingerprint of ``jar_paths`` (the ioce-standalone
+    JAR). Opening it against a different JAR empties it, so descriptions are
+    rebuilt from the new JAR as they are looked up or exported again.
+
+    Usage:
+        client = IoceClient(description_store="./data/ioce_descriptions.db")
+        client.export_descriptions([261, 262], hcpcs=hcpcs_codes)
+    """
+
+    def __init__(self, path: str, jar_paths: Iterable[str] = ()):
+        self.path = path
+        self.jar_paths = list(jar_paths)
+        self.fingerprint = fingerprint_paths(self.jar_paths)
+        self.logger = logging.getLogger("IoceDescriptionStore")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS descriptions ("
+            "internal_version INTEGER NOT NULL, kind TEXT NOT NULL, "
+            "code TEXT NOT NULL, description TEXT NOT NULL, "
+            "PRIMARY KEY (internal_version, kind, code)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE key = 'fingerprint'"
+            ).fetchone()
+            if row is None or row[0] != self.fingerprint:
+                if row is not None:
+                    self.logger.info(
+                        f"IOCE JAR changed, rebuilding description store {path}"
+                    )
+                self._db.execute("DELETE FROM descriptions")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                    (self.fingerprint,),
+                )
+
+    def __getstate__(self):
+        return {"path": self.path, "jar_paths": self.jar_paths}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @staticmethod
+    def code_key(code) -> str:
+        """Store form of a code; disposition values are (type, value) pairs."""
+        if isinstance(code, tuple):
+            return "|".join(code)
+        return str(code)
+
+    def get(self, internal_version: int, kind: str, code) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT description FROM descriptions "
+                "WHERE internal_version = ? AND kind = ? AND code = ?",
+                (internal_version, kind, self.code_key(code)),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def put_many(self, rows: Iterable[Tuple[int, str, object, str]]) -> int:
+        """Store ``(internal_version, kind, code, description)`` rows."""
+        rows = [
+            (version, kind, self.code_key(code), description)
+            for version, kind, code, description in rows
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO descriptions "
+                "(internal_version, kind, code, description) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def put(self, internal_version: int, kind: str, code, description: str):
+        self.put_many([(internal_version, kind, code, description)])
+
+    def versions(self) -> list[int]:
+        """Internal versions with at least one stored description."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT internal_version FROM descriptions ORDER BY 1"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM descriptions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -1,6 +1,9 @@
 import json
+import os
 from datetime import datetime
-from typing import List
+from functools import partial
+from threading import Lock, local
+from typing import Iterable, List, Optional
 
 import jpype
 
@@ -8,20 +11,81 @@ from pydrg.input.claim import (
     Claim,
     PoaType,
 )
-from pydrg.ioce.ioce_output import IoceOutput
+from pydrg.ioce.description_store import IOCE_TABLE_CODES, IoceDescriptionStore
+from pydrg.ioce.ioce_output import IoceExtractionProfile, IoceOutput
 from pydrg.plugins import apply_client_methods, run_client_load_classes
+from pydrg.helpers.metrics import get_registry, stage_timer
 from pydrg.helpers.utils import handle_java_exceptions
 
+IOCE_DESCRIPTION_CACHE = "pydrg_ioce_description_cache_total"
+
+# Description kind -> (IoceComponent method, whether it takes the internal version)
+IOCE_DESCRIPTION_METHODS = {
+    "return_code": ("getLatestErrorDescription", False),
+    "claim_processed_flag": ("getClaimProcessedFlagDescription", True),
+    "disposition": ("getClaimDispositionDescription", True),
+    "disposition_value": ("getClaimDispositionValueDescription", True),
+    "edit": ("getEditDescription", True),
+    "diagnosis": ("getDiagnosisDescription", True),
+    "hcpcs": ("getHcpcsDescription", True),
+    "apc": ("getApcDescription", True),
+    "status_indicator": ("getStatusIndicatorDescription", True),
+    "packaging_flag": ("getPackagingFlagDescription", True),
+    "payment_adjustment_flag": ("getPaymentAdjustmentFlagDescription", True),
+}
 
-class IoceClient:
-    """Client for processing claims through the IOCE (Integrated Outpatient Code Editor) software"""
 
-    def __init__(self):
+class IoceClient:
+    """
+    Client for processing claims through the IOCE (Integrated Outpatient Code Editor) software
+
+    Thread safety: CMS does not document IoceComponent as thread-safe, so by
+    default a client must only be used from one thread at a time. With
+    ``thread_local=True`` every thread that calls ``process`` or looks up a
+    description gets its own IoceComponent, built on first use, and one client
+    can be shared by any number of threads. The OceClaimFactory singleton only
+    creates new claim objects and is shared, and the description cache and
+    store are safe to share.
+    """
+
+    def __init__(
+        self,
+        description_cache_size: int = 100_000,
+        description_store: Optional[str | IoceDescriptionStore] = None,
+        lazy_descriptions: bool = False,
+        thread_local: bool = False,
+        extraction_profile: IoceExtractionProfile | str = IoceExtractionProfile.FULL,
+    ):
+        """
+        description_cache_size: number of descriptions kept in memory, keyed
+            by (internal version, description kind, code). 0 disables the cache.
+        description_store: path of an on-disk description dictionary (or an
+            IoceDescriptionStore) read before calling Java. It is emptied when
+            the ioce-standalone JAR changes; fill it with
+            ``export_descriptions``.
+        lazy_descriptions: default for ``process``: bind description fields
+            to their codes and look each one up only when it is read or the
+            output is serialized.
+        thread_local: give every thread its own IoceComponent (see the class
+            docstring) so claims can be edited in parallel.
+        extraction_profile: default for how much of the Java output
+            ``process`` converts (see ``IoceExtractionProfile``).
+        """
         if not jpype.isJVMStarted():
             raise RuntimeError(
                 "JVM is not started. Please start the JVM before using IoceClient."
             )
+        self._init_description_cache(description_cache_size)
+        self.thread_local = thread_local
+        self._local = local()
         self.load_classes()
+        if isinstance(description_store, str):
+            description_store = IoceDescriptionStore(
+                description_store, self.ioce_jar_paths()
+            )
+        self.description_store = description_store
+        self.lazy_descriptions = lazy_descriptions
+        self.extraction_profile = IoceExtractionProfile(extraction_profile)
         try:
             run_client_load_classes(self)
         except Exception:
@@ -62,10 +126,40 @@ class IoceClient:
             # Initialize factory and component
             self.factory = self.oce_claim_factory_class.getInstance()
             self.ioce_component = self.ioce_component_class()
+            # The component built above becomes the loading thread's own
+            self._local.component = self.ioce_component
 
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Ioce Java classes: {e}")
 
+    def get_component(self):
+        """
+        Return the IoceComponent for the calling thread: its own one with
+        ``thread_local``, else the shared ``ioce_component``.
+        """
+        if not self.thread_local:
+            return self.ioce_component
+        component = getattr(self._local, "component", None)
+        if component is None:
+            component = self._local.component = self.ioce_component_class()
+        return component
+
+    def ioce_jar_paths(self) -> list[str]:
+        """Paths of the JAR the IOCE classes were loaded from."""
+        try:
+            location = (
+                self.ioce_component_class.class_.getProtectionDomain()
+                .getCodeSource()
+                .getLocation()
+            )
+            return [str(jpype.JClass("java.nio.file.Paths").get(location.toURI()))]
+        except Exception:
+            return [
+                path
+                for path in jpype.getClassPath().split(os.pathsep)
+                if "ioce" in os.path.basename(path).lower()
+            ]
+
     def format_date(self, date_input):
         """Convert date to YYYYMMDD format required by IOCE"""
         if date_input is None:
@@ -296,28 +390,54 @@ class IoceClient:
         return oce_claim
 
     @handle_java_exceptions
-    def process(self, claim, include_descriptions: bool = True):
-        """Process a claim through IOCE and return IoceOutput"""
+    def process(
+        self,
+        claim,
+        include_descriptions: Optional[bool] = None,
+        lazy_descriptions: Optional[bool] = None,
+        profile: Optional[IoceExtractionProfile | str] = None,
+    ):
+        """
+        Process a claim through IOCE and return IoceOutput.
+
+        ``lazy_descriptions`` (default: the client's setting) defers each
+        description until it is read or serialized.
+
+        ``profile`` (default: the client's ``extraction_profile``) limits how
+        much of the Java output is converted. Descriptions are appended for
+        the full profile unless ``include_descriptions`` says otherwise.
+        """
+        profile = IoceExtractionProfile(profile or self.extraction_profile)
+        if include_descriptions is None:
+            include_descriptions = profile is IoceExtractionProfile.FULL
         try:
-            # Create Java OceClaim from Python claim
-            oce_claim = self.create_oce_claim(claim)
+            with stage_timer("ioce", "input"):
+                # Create Java OceClaim from Python claim
+                oce_claim = self.create_oce_claim(claim)
 
-            # Create IoceClaim wrapper
-            ioce_claim = self.ioce_claim_class(oce_claim)
+                # Create IoceClaim wrapper
+                ioce_claim = self.ioce_claim_class(oce_claim)
 
             # Process the claim
-            self.ioce_component.process(ioce_claim)
+            with stage_timer("ioce", "java"):
+                self.get_component().process(ioce_claim)
 
             # Get the processed model back
             processed_model = ioce_claim.getModel()
 
             # Extract output
-            Ioce_output = IoceOutput()
-            Ioce_output.from_java(processed_model)
+            with stage_timer("ioce", "output"):
+                Ioce_output = IoceOutput()
+                Ioce_output.from_java(processed_model, profile)
 
             # Append descriptions
             if include_descriptions:
-                Ioce_output = self.append_descriptions(Ioce_output)
+                if lazy_descriptions is None:
+                    lazy_descriptions = self.lazy_descriptions
+                with stage_timer("ioce", "descriptions"):
+                    Ioce_output = self.append_descriptions(
+                        Ioce_output, lazy=lazy_descriptions
+                    )
 
             return Ioce_output
 
@@ -426,13 +546,159 @@ class IoceClient:
 
         return stats
 
+    def _init_description_cache(self, size: int):
+        if size < 0:
+            raise ValueError("description_cache_size must not be negative")
+        self.description_cache_size = size
+        self._descriptions: dict[tuple, str] = {}
+        self._description_counts = {"hit": 0, "store": 0, "miss": 0}
+        self._description_counts_lock = Lock()
+        self.description_store: Optional[IoceDescriptionStore] = None
+
+    def describe(
+        self,
+        kind: str,
+        code,
+        internal_version=None,
+        counts: Optional[dict] = None,
+        store_rows: Optional[list] = None,
+    ) -> str:
+        """
+        Return the IOCE description of ``code`` (see IOCE_DESCRIPTION_METHODS
+        for the kinds). Descriptions come from the memory cache, then the
+        ``description_store``, and only then from the Java component, once per
+        (internal_version, kind, code). ``disposition_value`` codes are
+        (disposition type, value) tuples. ``counts`` collects hits per tier.
+
+        Descriptions fetched from Java are written to the store, or collected
+        in ``store_rows`` to be written together by the caller.
+        """
+        key = (internal_version, kind, code)
+        description = self._descriptions.get(key)
+        if description is not None:
+            if counts is not None:
+                counts["hit"] += 1
+            return description
+
+        method, versioned = IOCE_DESCRIPTION_METHODS[kind]
+        if kind == "edit":
+            code = str(int(code))
+        store_version = internal_version if versioned else 0
+        if self.description_store is not None:
+            description = self.description_store.get(store_version, kind, code)
+        if description is not None:
+            if counts is not None:
+                counts["store"] += 1
+        else:
+            if counts is not None:
+                counts["miss"] += 1
+            description = self._java_description(kind, code, internal_version)
+            if self.description_store is not None and description:
+                row = (store_version, kind, code, description)
+                if store_rows is not None:
+                    store_rows.append(row)
+                else:
+                    self.description_store.put_many([row])
+
+        if self.description_cache_size > 0:
+            if len(self._descriptions) >= self.description_cache_size:
+                # Start over rather than track recency on every lookup
+                self._descriptions.clear()
+            self._descriptions[key] = description
+        return description
+
+    def _java_description(self, kind: str, code, internal_version=None) -> str:
+        method, versioned = IOCE_DESCRIPTION_METHODS[kind]
+        args = code if kind == "disposition_value" else (code,)
+        if versioned:
+            args = (*args, internal_version)
+        java_description = getattr(self.get_component(), method)(*args)
+        return str(java_description) if java_description else ""
+
+    def export_descriptions(
+        self,
+        internal_versions: Iterable[int],
+        hcpcs: Iterable[str] = (),
+        apcs: Iterable[str] = (),
+        diagnoses: Iterable[str] = (),
+    ) -> int:
+        """
+        Write the descriptions of ``internal_versions`` to the description
+        store and return the number of rows written.
+
+        The component cannot list any of its tables. The small ones (edits,
+        status indicators, flags, dispositions and return codes) are probed
+        with the candidate codes in IOCE_TABLE_CODES, and codes the IOCE does
+        not know, which raise or have an empty description, are skipped.
+        HCPCS, APC and diagnosis descriptions are exported for the given
+        codes, plus every description already in memory.
+        """
+        if self.description_store is None:
+            raise RuntimeError("IoceClient has no description_store to export to")
+        internal_versions = list(internal_versions)
+        codes = dict(IOCE_TABLE_CODES)
+        codes["hcpcs"] = tuple(hcpcs)
+        codes["apc"] = tuple(apcs)
+        codes["diagnosis"] = tuple(diagnoses)
+
+        rows = []
+        for kind, kind_codes in codes.items():
+            versioned = IOCE_DESCRIPTION_METHODS[kind][1]
+            for internal_version in internal_versions if versioned else [0]:
+                for code in kind_codes:
+                    try:
+                        description = self._java_description(
+                            kind, code, internal_version
+                        )
+                    except Exception:
+                        # Codes the IOCE does not know
+                        continue
+                    if description:
+                        rows.append((internal_version, kind, code, description))
+        for (internal_version, kind, code), description in list(
+            self._descriptions.items()
+        ):
+            if not description:
+                continue
+            if kind == "edit":
+                code = str(int(code))
+            versioned = IOCE_DESCRIPTION_METHODS[kind][1]
+            rows.append((internal_version if versioned else 0, kind, code, description))
+        return self.description_store.put_many(rows)
+
+    def description_cache_stats(self) -> dict:
+        """
+        Memory hits, description store hits, misses (Java calls), the share of
+        lookups served without Java and the size of the memory cache.
+        """
+        with self._description_counts_lock:
+            hits = self._description_counts["hit"]
+            store_hits = self._description_counts["store"]
+            misses = self._description_counts["miss"]
+        total = hits + store_hits + misses
+        return {
+            "hits": hits,
+            "store_hits": store_hits,
+            "misses": misses,
+            "hit_rate": (hits + store_hits) / total if total else 0.0,
+            "size": len(self._descriptions),
+        }
+
+    def clear_description_cache(self):
+        """Drop every cached description, e.g. after loading a new IOCE JAR."""
+        self._descriptions.clear()
+
+    def _describe_edits(self, edits, set_description):
+        for edit in edits or []:
+            set_description(edit, "description", "edit", edit.edit)
+
     def _enrich_disposition_and_edits(
         self,
         result,
         disposition_type_id: str,
         disposition_attr: str,
         edit_list_attr: str,
-        internal_version: int,
+        set_description,
     ):
         """
         Generic function to enrich disposition and edit descriptions.
@@ -442,64 +708,83 @@ class IoceClient:
             disposition_type_id: The disposition type ID (e.g., "1", "2", "3", etc.)
             disposition_attr: The disposition attribute name (e.g., "claim_disposition")
             edit_list_attr: The edit list attribute name (e.g., "claim_rejection_edit_list")
-            internal_version: The internal version for lookups
+            set_description: Sets (or defers) one description field
         """
         disposition_value = getattr(result, disposition_attr, None)
         if disposition_value:
-            # Get disposition description
-            disp_desc = self.ioce_component.getClaimDispositionDescription(
-                disposition_type_id, internal_version
-            )
-            setattr(
+            set_description(
                 result,
                 f"{disposition_attr}_description",
-                str(disp_desc) if disp_desc else "",
-            )
-
-            # Get disposition value description
-            disp_value_desc = self.ioce_component.getClaimDispositionValueDescription(
-                disposition_type_id, disposition_value, internal_version
+                "disposition",
+                disposition_type_id,
             )
-            setattr(
+            set_description(
                 result,
                 f"{disposition_attr}_value_description",
-                str(disp_value_desc) if disp_value_desc else "",
+                "disposition_value",
+                (disposition_type_id, disposition_value),
             )
+            self._describe_edits(getattr(result, edit_list_attr, []), set_description)
 
-            # Enrich edit descriptions
-            edit_list = getattr(result, edit_list_attr, [])
-            for edit in edit_list:
-                edit_desc = self.ioce_component.getEditDescription(
-                    str(int(edit.edit)), internal_version
-                )
-                edit.description = str(edit_desc) if edit_desc else ""
+    def _resolve_description(self, kind: str, code, internal_version) -> str:
+        """Resolver behind a lazy description field."""
+        counts = {"hit": 0, "store": 0, "miss": 0}
+        store_rows = []
+        try:
+            return self.describe(kind, code, internal_version, counts, store_rows)
+        except Exception as e:
+            print(f"Warning: Could not retrieve {kind} description for {code}: {e}")
+            return ""
+        finally:
+            self._record_description_counts(counts, store_rows)
 
     # TODO: More descriptions available in the IOCE component
-    def append_descriptions(self, result: IoceOutput) -> IoceOutput:
+    def append_descriptions(self, result: IoceOutput, lazy: bool = False) -> IoceOutput:
         """
         Get human-readable descriptions for codes and values in the result.
-        This uses the IOCE component's description methods.
+        This uses the IOCE component's description methods through the
+        ``describe`` cache.
+
+        With ``lazy`` the description fields are only bound to their codes;
+        each is looked up the first time it is read or the output is
+        serialized, so descriptions nobody uses cost nothing.
         """
+        counts = {"hit": 0, "store": 0, "miss": 0}
+        store_rows = []
+        internal_version = result.processing_information.internal_version
+        if lazy:
+
+            def set_description(model, field, kind, code):
+                model.defer_description(
+                    field,
+                    partial(self._resolve_description, kind, code, internal_version),
+                )
+        else:
 
-        try:
-            internal_version = result.processing_information.internal_version
+            def set_description(model, field, kind, code):
+                setattr(
+                    model,
+                    field,
+                    self.describe(kind, code, internal_version, counts, store_rows),
+                )
 
+        try:
             # Get return code description
             if result.processing_information.return_code.code is not None:
-                return_code_desc = self.ioce_component.getLatestErrorDescription(
-                    str(result.processing_information.return_code.code)
-                )
-                result.processing_information.return_code.description = (
-                    str(return_code_desc) if return_code_desc else ""
+                set_description(
+                    result.processing_information.return_code,
+                    "description",
+                    "return_code",
+                    str(result.processing_information.return_code.code),
                 )
 
             # Get claim processed flag description
             if result.claim_processed_flag:
-                claim_flag_desc = self.ioce_component.getClaimProcessedFlagDescription(
-                    result.claim_processed_flag, internal_version
-                )
-                result.claim_processed_flag_description = (
-                    str(claim_flag_desc) if claim_flag_desc else ""
+                set_description(
+                    result,
+                    "claim_processed_flag_description",
+                    "claim_processed_flag",
+                    result.claim_processed_flag,
                 )
 
             # Enrich disposition and edit descriptions
@@ -527,147 +812,96 @@ class IoceClient:
                     disposition_type_id,
                     disposition_attr,
                     edit_list_attr,
-                    internal_version,
+                    set_description,
                 )
 
             for item in result.reason_for_visit_diagnosis_code_list:
                 if item.diagnosis:
-                    diagnosis_desc = self.ioce_component.getDiagnosisDescription(
-                        item.diagnosis, internal_version
-                    )
-                    item.description = str(diagnosis_desc) if diagnosis_desc else ""
-
-                if item.edit_list:
-                    for edit in item.edit_list:
-                        edit_desc = self.ioce_component.getEditDescription(
-                            str(int(edit.edit)), internal_version
-                        )
-                        edit.description = str(edit_desc) if edit_desc else ""
+                    set_description(item, "description", "diagnosis", item.diagnosis)
+                self._describe_edits(item.edit_list, set_description)
 
             # Get line item descriptions
-            for i, line in enumerate(result.line_item_list):
+            for line in result.line_item_list:
                 if line.hcpcs:
-                    hcpcs_desc = self.ioce_component.getHcpcsDescription(
-                        line.hcpcs, internal_version
-                    )
-                    line.hcpcs_description = str(hcpcs_desc) if hcpcs_desc else ""
-
+                    set_description(line, "hcpcs_description", "hcpcs", line.hcpcs)
                 if line.hcpcs_apc:
-                    apc_desc = self.ioce_component.getApcDescription(
-                        line.hcpcs_apc, internal_version
+                    set_description(
+                        line, "hcpcs_apc_description", "apc", line.hcpcs_apc
                     )
-                    line.hcpcs_apc_description = str(apc_desc) if apc_desc else ""
-
                 if line.payment_apc:
-                    payment_apc_desc = self.ioce_component.getApcDescription(
-                        line.payment_apc, internal_version
-                    )
-                    line.payment_apc_description = (
-                        str(payment_apc_desc) if payment_apc_desc else ""
+                    set_description(
+                        line, "payment_apc_description", "apc", line.payment_apc
                     )
-
                 if line.status_indicator:
-                    status_desc = self.ioce_component.getStatusIndicatorDescription(
-                        line.status_indicator, internal_version
+                    set_description(
+                        line,
+                        "status_indicator_description",
+                        "status_indicator",
+                        line.status_indicator,
                     )
-                    line.status_indicator_description = (
-                        str(status_desc) if status_desc else ""
-                    )
-
-                if line.hcpcs_edit_list:
-                    for item in line.hcpcs_edit_list:
-                        edit_desc = self.ioce_component.getEditDescription(
-                            str(int(item.edit)), internal_version
-                        )
-                        item.description = str(edit_desc) if edit_desc else ""
-
-                if line.revenue_edit_list:
-                    for item in line.revenue_edit_list:
-                        edit_desc = self.ioce_component.getEditDescription(
-                            str(int(item.edit)), internal_version
-                        )
-                        item.description = str(edit_desc) if edit_desc else ""
 
-                if line.service_date_edit_list:
-                    for item in line.service_date_edit_list:
-                        edit_desc = self.ioce_component.getEditDescription(
-                            str(int(item.edit)), internal_version
-                        )
-                        item.description = str(edit_desc) if edit_desc else ""
-
-                if line.hcpcs_modifier_input_list:
-                    for item in line.hcpcs_modifier_input_list:
-                        if item.edit_list:
-                            for edit in item.edit_list:
-                                edit_desc = self.ioce_component.getEditDescription(
-                                    str(int(edit.edit)), internal_version
-                                )
-                                edit.description = str(edit_desc) if edit_desc else ""
-
-                if line.hcpcs_modifier_output_list:
-                    for item in line.hcpcs_modifier_output_list:
-                        if item.edit_list:
-                            for edit in item.edit_list:
-                                edit_desc = self.ioce_component.getEditDescription(
-                                    str(int(edit.edit)), internal_version
-                                )
-                                edit.description = str(edit_desc) if edit_desc else ""
+                self._describe_edits(line.hcpcs_edit_list, set_description)
+                self._describe_edits(line.revenue_edit_list, set_description)
+                self._describe_edits(line.service_date_edit_list, set_description)
+                for item in line.hcpcs_modifier_input_list or []:
+                    self._describe_edits(item.edit_list, set_description)
+                for item in line.hcpcs_modifier_output_list or []:
+                    self._describe_edits(item.edit_list, set_description)
 
                 if line.packaging_flag:
-                    flag_desc = self.ioce_component.getPackagingFlagDescription(
-                        line.packaging_flag.flag, internal_version
-                    )
-                    line.packaging_flag.description = (
-                        str(flag_desc) if flag_desc else ""
-                    )
-
-                if line.payment_adjustment_flag01:
-                    flag_desc = self.ioce_component.getPaymentAdjustmentFlagDescription(
-                        line.payment_adjustment_flag01.flag, internal_version
-                    )
-                    line.payment_adjustment_flag01.description = (
-                        str(flag_desc) if flag_desc else ""
-                    )
-
-                if line.payment_adjustment_flag02:
-                    flag_desc = self.ioce_component.getPaymentAdjustmentFlagDescription(
-                        line.payment_adjustment_flag02.flag, internal_version
-                    )
-                    line.payment_adjustment_flag02.description = (
-                        str(flag_desc) if flag_desc else ""
+                    set_description(
+                        line.packaging_flag,
+                        "description",
+                        "packaging_flag",
+                        line.packaging_flag.flag,
                     )
+                for flag in (
+                    line.payment_adjustment_flag01,
+                    line.payment_adjustment_flag02,
+                ):
+                    if flag:
+                        set_description(
+                            flag, "description", "payment_adjustment_flag", flag.flag
+                        )
 
             # Get diagnosis descriptions
             if result.principal_diagnosis_code.diagnosis:
-                principal_desc = self.ioce_component.getDiagnosisDescription(
-                    result.principal_diagnosis_code.diagnosis, internal_version
+                set_description(
+                    result.principal_diagnosis_code,
+                    "description",
+                    "diagnosis",
+                    result.principal_diagnosis_code.diagnosis,
                 )
-                result.principal_diagnosis_code.description = (
-                    str(principal_desc) if principal_desc else ""
+                self._describe_edits(
+                    result.principal_diagnosis_code.edit_list, set_description
                 )
 
-                for item in result.principal_diagnosis_code.edit_list:
-                    edit_desc = self.ioce_component.getEditDescription(
-                        str(int(item.edit)), internal_version
-                    )
-                    item.description = str(edit_desc) if edit_desc else ""
-
-            if result.secondary_diagnosis_code_list:
-                for item in result.secondary_diagnosis_code_list:
-                    if item.diagnosis:
-                        diagnosis_desc = self.ioce_component.getDiagnosisDescription(
-                            item.diagnosis, internal_version
-                        )
-                        item.description = str(diagnosis_desc) if diagnosis_desc else ""
-
-                    if item.edit_list:
-                        for edit in item.edit_list:
-                            edit_desc = self.ioce_component.getEditDescription(
-                                str(int(edit.edit)), internal_version
-                            )
-                            edit.description = str(edit_desc) if edit_desc else ""
+            for item in result.secondary_diagnosis_code_list or []:
+                if item.diagnosis:
+                    set_description(item, "description", "diagnosis", item.diagnosis)
+                self._describe_edits(item.edit_list, set_description)
 
         except Exception as e:
             print(f"Warning: Could not retrieve some descriptions: {e}")
+        finally:
+            self._record_description_counts(counts, store_rows)
 
         return result
+
+    def _record_description_counts(self, counts: dict, store_rows: list = ()):
+        """
+        Add one claim's description cache hits and misses to the totals and
+        write its Java lookups to the description store in one transaction.
+        """
+        if store_rows and self.description_store is not None:
+            try:
+                self.description_store.put_many(store_rows)
+            except Exception as e:
+                print(f"Warning: Could not store IOCE descriptions: {e}")
+        with self._description_counts_lock:
+            for result, count in counts.items():
+                self._description_counts[result] += count
+        registry = get_registry()
+        for result, count in counts.items():
+            if count:
+                registry.inc(IOCE_DESCRIPTION_CACHE, count, result=result)
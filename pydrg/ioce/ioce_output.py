@@ -1,24 +1,108 @@
-from typing import List, Optional
+from typing import Callable, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, SerializationInfo, model_serializer
 from datetime import datetime
-
-
-class ReturnCode(BaseModel):
+from enum import Enum
+
+
+class IoceExtractionProfile(Enum):
+    # Claim flags and the line fields the OPPS and FQHC pricers read
+    PRICING = "pricing"
+    # Everything, including dispositions, edit lists and diagnoses
+    FULL = "full"
+
+
+class LazyDescriptions(BaseModel):
+    """
+    Base for IOCE models with description fields that can be resolved lazily.
+
+    A deferred description is left out of the instance until it is first
+    read or the model is serialized, pickled or compared; then its resolver
+    runs once and the result is kept like any other field value. Serializing
+    with ``context={"defer_descriptions": True}`` leaves deferred
+    descriptions out instead of resolving them.
+    """
+
+    _pending_descriptions: Optional[dict] = PrivateAttr(default=None)
+
+    def defer_description(self, field: str, resolve: Callable[[], str]):
+        """Resolve ``field`` with ``resolve()`` the first time it is needed."""
+        # Copies share private attributes, so never change a pending dict in place
+        self._pending_descriptions = {
+            **(self._pending_descriptions or {}),
+            field: resolve,
+        }
+        self.__dict__.pop(field, None)
+
+    def resolve_descriptions(self):
+        """Resolve every deferred description of this model (not its children)."""
+        pending = self._pending_descriptions
+        if pending:
+            self._pending_descriptions = None
+            for field, resolve in pending.items():
+                # A value assigned since deferring wins
+                if field not in self.__dict__:
+                    self.__dict__[field] = resolve()
+            self._restore_field_order()
+
+    def _restore_field_order(self):
+        # Serialization follows the instance dict, so put resolved fields back
+        # in declaration order
+        values = self.__dict__
+        ordered = {
+            name: values[name] for name in type(self).model_fields if name in values
+        }
+        values.clear()
+        values.update(ordered)
+
+    def __getattr__(self, name):
+        private = object.__getattribute__(self, "__pydantic_private__")
+        pending = private.get("_pending_descriptions") if private else None
+        if pending and name in pending:
+            remaining = {field: r for field, r in pending.items() if field != name}
+            private["_pending_descriptions"] = remaining or None
+            value = pending[name]()
+            self.__dict__[name] = value
+            self._restore_field_order()
+            return value
+        return super().__getattr__(name)
+
+    def __repr_args__(self):
+        self.resolve_descriptions()
+        return super().__repr_args__()
+
+    @model_serializer(mode="wrap")
+    def _serialize_with_descriptions(self, handler, info: SerializationInfo):
+        if not (info.context or {}).get("defer_descriptions"):
+            self.resolve_descriptions()
+        return handler(self)
+
+    def __getstate__(self):
+        self.resolve_descriptions()
+        return super().__getstate__()
+
+    def __eq__(self, other):
+        self.resolve_descriptions()
+        if isinstance(other, LazyDescriptions):
+            other.resolve_descriptions()
+        return super().__eq__(other)
+
+
+class ReturnCode(LazyDescriptions):
     """Return code information"""
 
     code: int = 0
     description: str = ""
 
 
-class IoceOutputEdit(BaseModel):
+class IoceOutputEdit(LazyDescriptions):
     """Output for edits"""
 
     edit: str = ""
     description: str = ""
 
 
-class IoceOutputFlag(BaseModel):
+class IoceOutputFlag(LazyDescriptions):
     """Output for flags"""
 
     flag: str = ""
@@ -93,7 +177,7 @@ class IoceProcessingInformation(BaseModel):
         return self
 
 
-class IoceOutputDiagnosisCode(BaseModel):
+class IoceOutputDiagnosisCode(LazyDescriptions):
     """Output for diagnosis codes with associated edits"""
 
     diagnosis: str = ""
@@ -151,7 +235,7 @@ class IoceOutputValueCode(BaseModel):
         return self
 
 
-class IoceOutputLineItem(BaseModel):
+class IoceOutputLineItem(LazyDescriptions):
     """Output for line items with all OPPS processing results"""
 
     service_date: Optional[datetime] = None
@@ -190,7 +274,12 @@ class IoceOutputLineItem(BaseModel):
     revenue_edit_list: List[IoceOutputEdit] = Field(default_factory=list)
     service_date_edit_list: List[IoceOutputEdit] = Field(default_factory=list)
 
-    def from_java(self, java_obj):
+    def from_java(
+        self,
+        java_obj,
+        profile: IoceExtractionProfile | str = IoceExtractionProfile.FULL,
+    ):
+        profile = IoceExtractionProfile(profile)
         if java_obj is not None:
             self.service_date = (
                 datestr_to_datetime(str(java_obj.getServiceDate()))
@@ -207,11 +296,6 @@ class IoceOutputLineItem(BaseModel):
             self.charge = java_string_to_float(
                 str(java_obj.getCharge()) if java_obj.getCharge() else ""
             )
-            self.action_flag_input = (
-                str(java_obj.getActionFlagInput())
-                if java_obj.getActionFlagInput()
-                else ""
-            )
 
             self.action_flag_output = (
                 str(java_obj.getActionFlagOutput())
@@ -258,16 +342,6 @@ class IoceOutputLineItem(BaseModel):
                 else ""
             )
 
-            self.hcpcs_modifier_input_list = []  # Clear before populating
-            if (
-                hasattr(java_obj, "getHcpcsModifierInputList")
-                and java_obj.getHcpcsModifierInputList()
-            ):
-                for modifier in java_obj.getHcpcsModifierInputList():
-                    self.hcpcs_modifier_input_list.append(
-                        IoceOutputHcpcsModifier().from_java(modifier)
-                    )
-
             self.hcpcs_modifier_output_list = []  # Clear before populating
             if (
                 hasattr(java_obj, "getHcpcsModifierOutputList")
@@ -278,27 +352,6 @@ class IoceOutputLineItem(BaseModel):
                         IoceOutputHcpcsModifier().from_java(modifier)
                     )
 
-            self.hcpcs_edit_list = []  # Clear before populating
-            if hasattr(java_obj, "getHcpcsEditList") and java_obj.getHcpcsEditList():
-                for edit in java_obj.getHcpcsEditList():
-                    self.hcpcs_edit_list.append(IoceOutputEdit(edit=str(edit)))
-
-            self.revenue_edit_list = []  # Clear before populating
-            if (
-                hasattr(java_obj, "getRevenueEditList")
-                and java_obj.getRevenueEditList()
-            ):
-                for edit in java_obj.getRevenueEditList():
-                    self.revenue_edit_list.append(IoceOutputEdit(edit=str(edit)))
-
-            self.service_date_edit_list = []  # Clear before populating
-            if (
-                hasattr(java_obj, "getServiceDateEditList")
-                and java_obj.getServiceDateEditList()
-            ):
-                for edit in java_obj.getServiceDateEditList():
-                    self.service_date_edit_list.append(IoceOutputEdit(edit=str(edit)))
-
             if hasattr(java_obj, "getPackagingFlag") and java_obj.getPackagingFlag():
                 self.packaging_flag.flag = (
                     str(java_obj.getPackagingFlag())
@@ -326,10 +379,47 @@ class IoceOutputLineItem(BaseModel):
                     else ""
                 )
 
+            if profile is IoceExtractionProfile.FULL:
+                self._extract_report(java_obj)
+
         return self
 
+    def _extract_report(self, java_obj):
+        """Extract the input echoes and edit lists of the line"""
+        self.action_flag_input = (
+            str(java_obj.getActionFlagInput()) if java_obj.getActionFlagInput() else ""
+        )
+
+        self.hcpcs_modifier_input_list = []  # Clear before populating
+        if (
+            hasattr(java_obj, "getHcpcsModifierInputList")
+            and java_obj.getHcpcsModifierInputList()
+        ):
+            for modifier in java_obj.getHcpcsModifierInputList():
+                self.hcpcs_modifier_input_list.append(
+                    IoceOutputHcpcsModifier().from_java(modifier)
+                )
+
+        self.hcpcs_edit_list = []  # Clear before populating
+        if hasattr(java_obj, "getHcpcsEditList") and java_obj.getHcpcsEditList():
+            for edit in java_obj.getHcpcsEditList():
+                self.hcpcs_edit_list.append(IoceOutputEdit(edit=str(edit)))
+
+        self.revenue_edit_list = []  # Clear before populating
+        if hasattr(java_obj, "getRevenueEditList") and java_obj.getRevenueEditList():
+            for edit in java_obj.getRevenueEditList():
+                self.revenue_edit_list.append(IoceOutputEdit(edit=str(edit)))
 
-class IoceOutput(BaseModel):
+        self.service_date_edit_list = []  # Clear before populating
+        if (
+            hasattr(java_obj, "getServiceDateEditList")
+            and java_obj.getServiceDateEditList()
+        ):
+            for edit in java_obj.getServiceDateEditList():
+                self.service_date_edit_list.append(IoceOutputEdit(edit=str(edit)))
+
+
+class IoceOutput(LazyDescriptions):
     """Main OPPS output class containing all processing results"""
 
     processing_information: IoceProcessingInformation = Field(
@@ -392,10 +482,20 @@ class IoceOutput(BaseModel):
 
     line_item_list: List[IoceOutputLineItem] = Field(default_factory=list)
 
-    def from_java(self, java_claim):
-        """Extract all output data from the processed Java OceClaim object"""
+    def from_java(
+        self,
+        java_claim,
+        profile: IoceExtractionProfile | str = IoceExtractionProfile.FULL,
+    ):
+        """
+        Extract output data from the processed Java OceClaim object.
+
+        ``profile`` (see ``IoceExtractionProfile``) limits which parts are
+        read; fields that are not extracted keep their defaults.
+        """
         if java_claim is None:
             return self
+        profile = IoceExtractionProfile(profile)
 
         try:
             if (
@@ -425,152 +525,155 @@ class IoceOutput(BaseModel):
                 else ""
             )
 
-            self.claim_disposition = (
-                str(java_claim.getClaimDisposition())
-                if java_claim.getClaimDisposition()
-                else ""
-            )
-            self.claim_rejection_disposition = (
-                str(java_claim.getClaimRejectionDisposition())
-                if java_claim.getClaimRejectionDisposition()
-                else ""
-            )
-            self.claim_denial_disposition = (
-                str(java_claim.getClaimDenialDisposition())
-                if java_claim.getClaimDenialDisposition()
-                else ""
-            )
-            self.claim_return_to_provider_disposition = (
-                str(java_claim.getClaimReturnToProviderDisposition())
-                if java_claim.getClaimReturnToProviderDisposition()
-                else ""
-            )
-            self.claim_suspension_disposition = (
-                str(java_claim.getClaimSuspensionDisposition())
-                if java_claim.getClaimSuspensionDisposition()
-                else ""
-            )
-            self.line_rejection_disposition = (
-                str(java_claim.getLineRejectionDisposition())
-                if java_claim.getLineRejectionDisposition()
-                else ""
-            )
-            self.line_denial_disposition = (
-                str(java_claim.getLineDenialDisposition())
-                if java_claim.getLineDenialDisposition()
-                else ""
-            )
-
-            self.claim_rejection_edit_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getClaimRejectionEditList")
-                and java_claim.getClaimRejectionEditList()
-            ):
-                for edit in java_claim.getClaimRejectionEditList():
-                    self.claim_rejection_edit_list.append(
-                        IoceOutputEdit(edit=str(edit))
-                    )
-
-            self.claim_denial_edit_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getClaimDenialEditList")
-                and java_claim.getClaimDenialEditList()
-            ):
-                for edit in java_claim.getClaimDenialEditList():
-                    self.claim_denial_edit_list.append(IoceOutputEdit(edit=str(edit)))
-
-            self.claim_return_to_provider_edit_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getClaimReturnToProviderEditList")
-                and java_claim.getClaimReturnToProviderEditList()
-            ):
-                for edit in java_claim.getClaimReturnToProviderEditList():
-                    self.claim_return_to_provider_edit_list.append(
-                        IoceOutputEdit(edit=str(edit))
-                    )
-
-            self.claim_suspension_edit_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getClaimSuspensionEditList")
-                and java_claim.getClaimSuspensionEditList()
-            ):
-                for edit in java_claim.getClaimSuspensionEditList():
-                    self.claim_suspension_edit_list.append(
-                        IoceOutputEdit(edit=str(edit))
-                    )
-
-            self.line_rejection_edit_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getLineRejectionEditList")
-                and java_claim.getLineRejectionEditList()
-            ):
-                for edit in java_claim.getLineRejectionEditList():
-                    self.line_rejection_edit_list.append(IoceOutputEdit(edit=str(edit)))
-
-            self.line_denial_edit_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getLineDenialEditList")
-                and java_claim.getLineDenialEditList()
-            ):
-                for edit in java_claim.getLineDenialEditList():
-                    self.line_denial_edit_list.append(IoceOutputEdit(edit=str(edit)))
-
-            self.condition_code_output_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getConditionCodeOutputList")
-                and java_claim.getConditionCodeOutputList()
-            ):
-                for code in java_claim.getConditionCodeOutputList():
-                    self.condition_code_output_list.append(str(code))
-
-            self.value_code_output_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getValueCodeOutputList")
-                and java_claim.getValueCodeOutputList()
-            ):
-                for value_code in java_claim.getValueCodeOutputList():
-                    val_code = IoceOutputValueCode().from_java(value_code)
-                    if val_code.code != "" or val_code.value != "":
-                        self.value_code_output_list.append(val_code)
-
-            if (
-                hasattr(java_claim, "getPrincipalDiagnosisCode")
-                and java_claim.getPrincipalDiagnosisCode()
-            ):
-                self.principal_diagnosis_code.from_java(
-                    java_claim.getPrincipalDiagnosisCode()
-                )
-
-            self.reason_for_visit_diagnosis_code_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getReasonForVisitDiagnosisCodeList")
-                and java_claim.getReasonForVisitDiagnosisCodeList()
-            ):
-                for dx in java_claim.getReasonForVisitDiagnosisCodeList():
-                    self.reason_for_visit_diagnosis_code_list.append(
-                        IoceOutputDiagnosisCode().from_java(dx)
-                    )
-
-            self.secondary_diagnosis_code_list = []  # Clear before populating
-            if (
-                hasattr(java_claim, "getSecondaryDiagnosisCodeList")
-                and java_claim.getSecondaryDiagnosisCodeList()
-            ):
-                for dx in java_claim.getSecondaryDiagnosisCodeList():
-                    self.secondary_diagnosis_code_list.append(
-                        IoceOutputDiagnosisCode().from_java(dx)
-                    )
+            if profile is IoceExtractionProfile.FULL:
+                self._extract_report(java_claim)
 
             self.line_item_list = []  # Clear before populating
             if hasattr(java_claim, "getLineItemList") and java_claim.getLineItemList():
                 for line in java_claim.getLineItemList():
-                    self.line_item_list.append(IoceOutputLineItem().from_java(line))
+                    self.line_item_list.append(
+                        IoceOutputLineItem().from_java(line, profile)
+                    )
 
         except Exception as e:
             print(f"Warning: Could not extract some OPPS output fields: {e}")
 
         return self
 
+    def _extract_report(self, java_claim):
+        """Extract the claim level edit report: dispositions, edits and diagnoses"""
+        self.claim_disposition = (
+            str(java_claim.getClaimDisposition())
+            if java_claim.getClaimDisposition()
+            else ""
+        )
+        self.claim_rejection_disposition = (
+            str(java_claim.getClaimRejectionDisposition())
+            if java_claim.getClaimRejectionDisposition()
+            else ""
+        )
+        self.claim_denial_disposition = (
+            str(java_claim.getClaimDenialDisposition())
+            if java_claim.getClaimDenialDisposition()
+            else ""
+        )
+        self.claim_return_to_provider_disposition = (
+            str(java_claim.getClaimReturnToProviderDisposition())
+            if java_claim.getClaimReturnToProviderDisposition()
+            else ""
+        )
+        self.claim_suspension_disposition = (
+            str(java_claim.getClaimSuspensionDisposition())
+            if java_claim.getClaimSuspensionDisposition()
+            else ""
+        )
+        self.line_rejection_disposition = (
+            str(java_claim.getLineRejectionDisposition())
+            if java_claim.getLineRejectionDisposition()
+            else ""
+        )
+        self.line_denial_disposition = (
+            str(java_claim.getLineDenialDisposition())
+            if java_claim.getLineDenialDisposition()
+            else ""
+        )
+
+        self.claim_rejection_edit_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getClaimRejectionEditList")
+            and java_claim.getClaimRejectionEditList()
+        ):
+            for edit in java_claim.getClaimRejectionEditList():
+                self.claim_rejection_edit_list.append(IoceOutputEdit(edit=str(edit)))
+
+        self.claim_denial_edit_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getClaimDenialEditList")
+            and java_claim.getClaimDenialEditList()
+        ):
+            for edit in java_claim.getClaimDenialEditList():
+                self.claim_denial_edit_list.append(IoceOutputEdit(edit=str(edit)))
+
+        self.claim_return_to_provider_edit_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getClaimReturnToProviderEditList")
+            and java_claim.getClaimReturnToProviderEditList()
+        ):
+            for edit in java_claim.getClaimReturnToProviderEditList():
+                self.claim_return_to_provider_edit_list.append(
+                    IoceOutputEdit(edit=str(edit))
+                )
+
+        self.claim_suspension_edit_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getClaimSuspensionEditList")
+            and java_claim.getClaimSuspensionEditList()
+        ):
+            for edit in java_claim.getClaimSuspensionEditList():
+                self.claim_suspension_edit_list.append(IoceOutputEdit(edit=str(edit)))
+
+        self.line_rejection_edit_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getLineRejectionEditList")
+            and java_claim.getLineRejectionEditList()
+        ):
+            for edit in java_claim.getLineRejectionEditList():
+                self.line_rejection_edit_list.append(IoceOutputEdit(edit=str(edit)))
+
+        self.line_denial_edit_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getLineDenialEditList")
+            and java_claim.getLineDenialEditList()
+        ):
+            for edit in java_claim.getLineDenialEditList():
+                self.line_denial_edit_list.append(IoceOutputEdit(edit=str(edit)))
+
+        self.condition_code_output_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getConditionCodeOutputList")
+            and java_claim.getConditionCodeOutputList()
+        ):
+            for code in java_claim.getConditionCodeOutputList():
+                self.condition_code_output_list.append(str(code))
+
+        self.value_code_output_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getValueCodeOutputList")
+            and java_claim.getValueCodeOutputList()
+        ):
+            for value_code in java_claim.getValueCodeOutputList():
+                val_code = IoceOutputValueCode().from_java(value_code)
+                if val_code.code != "" or val_code.value != "":
+                    self.value_code_output_list.append(val_code)
+
+        if (
+            hasattr(java_claim, "getPrincipalDiagnosisCode")
+            and java_claim.getPrincipalDiagnosisCode()
+        ):
+            self.principal_diagnosis_code.from_java(
+                java_claim.getPrincipalDiagnosisCode()
+            )
+
+        self.reason_for_visit_diagnosis_code_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getReasonForVisitDiagnosisCodeList")
+            and java_claim.getReasonForVisitDiagnosisCodeList()
+        ):
+            for dx in java_claim.getReasonForVisitDiagnosisCodeList():
+                self.reason_for_visit_diagnosis_code_list.append(
+                    IoceOutputDiagnosisCode().from_java(dx)
+                )
+
+        self.secondary_diagnosis_code_list = []  # Clear before populating
+        if (
+            hasattr(java_claim, "getSecondaryDiagnosisCodeList")
+            and java_claim.getSecondaryDiagnosisCodeList()
+        ):
+            for dx in java_claim.getSecondaryDiagnosisCodeList():
+                self.secondary_diagnosis_code_list.append(
+                    IoceOutputDiagnosisCode().from_java(dx)
+                )
+
     def __str__(self):
         return f"IoceOutput(return_code={self.processing_information.return_code}, lines_processed={self.processing_information.lines_processed})"
 
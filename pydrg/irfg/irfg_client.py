@@ -11,6 +11,7 @@ from pydrg.helpers.utils import (
     handle_java_exceptions,
 )
 
+from pydrg.helpers.metrics import stage_timer
 from pydrg.plugins import apply_client_methods, run_client_load_classes
 
 ASSESSMENT_TAGS = {
@@ -134,17 +135,20 @@ class IrfgClient:
         """
         if claim is None:
             raise ValueError("Claim cannot be None")
-        claim_input = self.create_claim_input(claim)
+        with stage_timer("cmg", "input"):
+            claim_input = self.create_claim_input(claim)
         if claim_input is None:
             raise RuntimeError("Failed to create claim input for IRF Grouper")
         grouper = self.cmg_grouper_class()
         try:
-            grouper.process(claim_input)
+            with stage_timer("cmg", "java"):
+                grouper.process(claim_input)
         except jpype.JException as ex:
             raise RuntimeError(
                 f"Java exception during IRF Grouper processing: {str(ex)}"
             )
-        output = IrfgOutput()
-        output.claim_id = claim.claimid
-        output.from_java(claim_input)
+        with stage_timer("cmg", "output"):
+            output = IrfgOutput()
+            output.claim_id = claim.claimid
+            output.from_java(claim_input)
         return output
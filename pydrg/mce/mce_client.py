@@ -4,6 +4,7 @@ import jpype
 
 from pydrg.input.claim import Claim
 from pydrg.plugins import apply_client_methods, run_client_load_classes
+from pydrg.helpers.metrics import stage_timer
 from pydrg.helpers.utils import handle_java_exceptions
 
 from .mce_output import MceOutput
@@ -102,9 +103,12 @@ class MceClient:
 
     @handle_java_exceptions
     def process(self, claim: Claim):
-        mce_input = self.create_input(claim)
-        self.mce_component.process(mce_input)
-        java_output = mce_input.getMceOutput()
-        mce_output = MceOutput()
-        mce_output.from_java(java_output, mce_input)
+        with stage_timer("mce", "input"):
+            mce_input = self.create_input(claim)
+        with stage_timer("mce", "java"):
+            self.mce_component.process(mce_input)
+        with stage_timer("mce", "output"):
+            java_output = mce_input.getMceOutput()
+            mce_output = MceOutput()
+            mce_output.from_java(java_output, mce_input)
         return mce_output
@@ -1,6 +1,33 @@
 # This file marks the msdrg directory as a Python package.
 # You can import DrgClient and related classes directly from msdrg.
-from .drg_client import DrgClient
-from .msdrg_output import MsdrgOutput, MsdrgOutputDxCode, MsdrgOutputPrCode
+from .drg_client import (
+    DrgClient,
+    MarkingLogicTieBreaker,
+    MsdrgAffectDrgOptionFlag,
+    MsdrgExtractionLevel,
+    MsdrgHospitalStatusOptionFlag,
+)
+from .msdrg_output import (
+    MsdrgImpactAnalysis,
+    MsdrgImpactRow,
+    MsdrgOutput,
+    MsdrgOutputDxCode,
+    MsdrgOutputPrCode,
+    MsdrgVersionComparison,
+    MsdrgVersionResult,
+)
 
-__all__ = ["DrgClient", "MsdrgOutput", "MsdrgOutputDxCode", "MsdrgOutputPrCode"]
+__all__ = [
+    "DrgClient",
+    "MarkingLogicTieBreaker",
+    "MsdrgAffectDrgOptionFlag",
+    "MsdrgExtractionLevel",
+    "MsdrgHospitalStatusOptionFlag",
+    "MsdrgImpactAnalysis",
+    "MsdrgImpactRow",
+    "MsdrgOutput",
+    "MsdrgOutputDxCode",
+    "MsdrgOutputPrCode",
+    "MsdrgVersionComparison",
+    "MsdrgVersionResult",
+]
@@ -1,8 +1,21 @@
 import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
-from threading import RLock
+from logging import Logger, getLogger
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    TextIO,
+)
+from threading import Event, Lock, Thread, local
 import jpype
 import time
 
@@ -14,12 +27,25 @@ from pydrg.input.claim import (
     ProcedureCode,
     ICDConvertOption,
 )
-from pydrg.msdrg.msdrg_output import MsdrgOutput, MsdrgOutputDxCode, MsdrgOutputPrCode
+from pydrg.msdrg.msdrg_output import (
+    MsdrgImpactAnalysis,
+    MsdrgImpactRow,
+    MsdrgOutput,
+    MsdrgOutputDxCode,
+    MsdrgOutputPrCode,
+    MsdrgVersionComparison,
+    MsdrgVersionResult,
+)
 from pydrg.plugins import apply_client_methods, run_client_load_classes
 from pydrg.converter.icd_converter import ICDConverter, ICD10ConvertOutput
-from pydrg.helpers.utils import handle_java_exceptions
+from pydrg.helpers.metrics import LatencyHistogram, get_registry, stage_timer
+from pydrg.helpers.utils import attach_jvm_thread, handle_java_exceptions
 
 MSDRG_VSTART = "400"
+MSDRG_VERSION_LOAD_SECONDS = "pydrg_msdrg_version_load_seconds"
+MSDRG_VERSION_EVICTIONS = "pydrg_msdrg_version_evictions_total"
+# Write buffer for batch output files
+BATCH_WRITE_BUFFER = 1024 * 1024
 
 
 class MsdrgAffectDrgOptionFlag(Enum):
@@ -38,18 +64,131 @@ class MsdrgHospitalStatusOptionFlag(Enum):
     UNKNOWN = "UNKNOWN"
 
 
+class MsdrgExtractionLevel(Enum):
+    # Final DRG, MDC, severity and grouper return code
+    SUMMARY = "summary"
+    # Every claim level field, without the per-diagnosis and per-procedure outputs
+    STANDARD = "standard"
+    # Everything, including HAC details for every diagnosis and procedure
+    FULL = "full"
+
+
+# Extractor (DrgClient._extract_<name>) -> MsdrgOutput fields it fills, in extraction order
+MSDRG_EXTRACTORS = {
+    "grouper_flags": ("grouper_flags",),
+    "initial_grc": ("initial_grc",),
+    "final_grc": ("final_grc",),
+    "initial_mdc": ("initial_mdc_value", "initial_mdc_description"),
+    "initial_drg": ("initial_drg_value", "initial_drg_description"),
+    "initial_base_drg": ("initial_base_drg_value", "initial_base_drg_description"),
+    "initial_severity": ("initial_severity", "initial_drg_sdx_severity"),
+    "final_mdc": ("final_mdc_value", "final_mdc_description"),
+    "final_drg": ("final_drg_value", "final_drg_description"),
+    "final_base_drg": ("final_base_drg_value", "final_base_drg_description"),
+    "final_severity": ("final_severity", "final_drg_sdx_severity"),
+    "hac": ("hac_status", "num_hac_categories_satisfied"),
+    "principal_dx_output": ("principal_dx_output",),
+    "secondary_dx_outputs": ("secondary_dx_outputs",),
+    "procedure_outputs": ("procedure_outputs",),
+}
+
+MSDRG_OUTPUT_FIELDS = {
+    field: name for name, fields in MSDRG_EXTRACTORS.items() for field in fields
+}
+
+MSDRG_LEVEL_EXTRACTORS = {
+    MsdrgExtractionLevel.SUMMARY: (
+        "final_grc",
+        "final_mdc",
+        "final_drg",
+        "final_severity",
+    ),
+    MsdrgExtractionLevel.STANDARD: tuple(
+        name
+        for name in MSDRG_EXTRACTORS
+        if name
+        not in ("principal_dx_output", "secondary_dx_outputs", "procedure_outputs")
+    ),
+    MsdrgExtractionLevel.FULL: tuple(MSDRG_EXTRACTORS),
+}
+
+
+class DrgInputParts(NamedTuple):
+    """Java objects converted from one claim, see ``DrgClient.convert_claim``."""
+
+    age_years: Optional[int]
+    age_days_admit: Optional[int]
+    age_days_discharge: Optional[int]
+    sex: Any
+    discharge_status: Any
+    admit_dx: Any
+    principal_dx: Any
+    secondary_codes: list
+    secondary_poas: list
+    secondary_dxs: list
+    procedures: list
+
+
 class DrgClient:
-    def __init__(self):
+    def __init__(
+        self,
+        max_versions: Optional[int] = None,
+        preload: Optional[Iterable[str]] = None,
+        load_all: bool = False,
+        thread_local: bool = False,
+        extraction_level: MsdrgExtractionLevel | str = MsdrgExtractionLevel.FULL,
+        load_workers: int = 1,
+        background_load: bool = False,
+        logger: Optional[Logger] = None,
+        input_cache_size: int = 50_000,
+    ):
         """
         DrgClient class is responsible for interacting with the CMS Java based DRG system.
         The Client will load the necessary Java classes and convert from Python objects to Java objects.
+
+        MS-DRG versions are loaded the first time a claim needs them.
+
+        max_versions: maximum number of versions kept loaded. Loading another
+            version drops the least recently used one. None keeps every
+            version that has been loaded.
+        preload: versions to load up front, e.g. ["421", "430"]. Preloaded
+            versions are never evicted.
+        load_all: load every version from MSDRG_VSTART to the current one at
+            startup instead of on first use.
+        thread_local: give every thread that calls ``process`` its own
+            components instead of sharing one component per version and
+            options between threads. CMS does not document MsdrgComponent as
+            thread-safe, so use this when grouping from several threads.
+        extraction_level: default for how much of the Java output ``process``
+            converts (see ``MsdrgExtractionLevel``).
+        load_workers: threads used by ``load_all`` to build older versions.
+        background_load: with ``load_all``, return without waiting for the
+            versions to load. ``ready`` is set once the current version is
+            loaded and ``loaded`` once every version has been tried; claims
+            for a version that is still loading wait for it.
+        logger: logger for version load timings and failures.
+        input_cache_size: number of Java diagnosis and procedure code objects
+            kept for reuse by ``create_drg_input``. 0 disables the cache.
         """
         if not jpype.isJVMStarted():
             raise RuntimeError("JVM is not started")
+        if logger is not None:
+            self.logger = logger
+        else:
+            self.logger = getLogger("DrgClient")
+        self.extraction_level = MsdrgExtractionLevel(extraction_level)
+        self._init_version_cache(max_versions, preload, thread_local)
         self.load_enums()
         self.load_classes()
-        self.load_drg_groupers()
-        self._reconfig_lock = RLock()
+        self._init_input_cache(input_cache_size)
+        # Threads of impact_analysis and process_versions, see _map_threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers = 0
+        self._executor_lock = Lock()
+        for version in self.pinned_versions:
+            self.load_drg_version(version)
+        if load_all and not background_load:
+            self.load_drg_groupers(load_workers)
         try:
             run_client_load_classes(self)
         except Exception:
@@ -58,6 +197,17 @@ class DrgClient:
             apply_client_methods(self)
         except Exception:
             pass
+        if load_all and background_load:
+            Thread(
+                target=self._background_load,
+                args=(load_workers,),
+                name="msdrg-version-loader",
+                daemon=True,
+            ).start()
+        elif not load_all:
+            # Versions load on first use, so there is nothing to wait for
+            self.ready.set()
+            self.loaded.set()
 
     def load_enums(self):
         # Get enumeration values needed for DRG Runtime options
@@ -107,6 +257,7 @@ class DrgClient:
                 "gov.agency.msdrg.model.v2.transfer.input.MsdrgInputPrCode"
             )
             self.array_list_class = jpype.JClass("java.util.ArrayList")
+            self.arrays_class = jpype.JClass("java.util.Arrays")
             self.runtime_options_class = jpype.JClass(
                 "gov.agency.msdrg.model.v2.RuntimeOptions"
             )
@@ -130,17 +281,34 @@ class DrgClient:
             return str(int(version) + 1)
         return version
 
-    def create_drg_options(self, poa_exempt: bool):
+    def create_drg_options(
+        self,
+        poa_exempt: bool,
+        affect_drg: MsdrgAffectDrgOptionFlag = MsdrgAffectDrgOptionFlag.COMPUTE,
+        logic_tiebreaker: MarkingLogicTieBreaker = MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE,
+    ):
         try:
             runtime_options = jpype.JClass("gov.agency.msdrg.model.v2.RuntimeOptions")()
             drg_options = jpype.JClass("gov.agency.msdrg.model.v2.MsdrgRuntimeOption")()
             msdrg_option_flags = jpype.JClass("gov.agency.msdrg.model.v2.MsdrgOption")
         except Exception as e:
             raise RuntimeError(f"Failed to initialize RuntimeOptions: {e}")
-        runtime_options.setComputeAffectDrg(self.affect_drg_option.COMPUTE)
-        runtime_options.setMarkingLogicTieBreaker(
-            self.logic_tiebreaker.CLINICAL_SIGNIFICANCE
-        )
+        match affect_drg:
+            case MsdrgAffectDrgOptionFlag.COMPUTE:
+                runtime_options.setComputeAffectDrg(self.affect_drg_option.COMPUTE)
+            case MsdrgAffectDrgOptionFlag.DO_NOT_COMPUTE:
+                runtime_options.setComputeAffectDrg(
+                    self.affect_drg_option.DO_NOT_COMPUTE
+                )
+        match logic_tiebreaker:
+            case MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE:
+                runtime_options.setMarkingLogicTieBreaker(
+                    self.logic_tiebreaker.CLINICAL_SIGNIFICANCE
+                )
+            case MarkingLogicTieBreaker.CODE_ORDER:
+                runtime_options.setMarkingLogicTieBreaker(
+                    self.logic_tiebreaker.CODE_ORDER
+                )
         if poa_exempt:
             runtime_options.setPoaReportingExempt(self.hospital_status.EXEMPT)
         else:
@@ -148,33 +316,248 @@ class DrgClient:
         drg_options.put(msdrg_option_flags.RUNTIME_OPTION_FLAGS, runtime_options)
         return drg_options
 
-    def load_drg_groupers(self):
-        end_version = self.determine_end_version()
-        curr_version = MSDRG_VSTART
-        # Initialize the DRG Runtime options Java object
-        exempt_drg_options = self.create_drg_options(poa_exempt=True)
-        non_exempt_drg_options = self.create_drg_options(poa_exempt=False)
-        self.drg_versions = {}
-        while True:
+    def _init_version_cache(
+        self,
+        max_versions: Optional[int],
+        preload: Optional[Iterable[str]],
+        thread_local: bool = False,
+    ):
+        if max_versions is not None and max_versions < 1:
+            raise ValueError("max_versions must be at least 1")
+        self.max_versions = max_versions
+        self.thread_local = thread_local
+        self.pinned_versions = list(dict.fromkeys(preload or []))
+        # version -> {(poa_exempt, affect_drg, logic_tiebreaker): component},
+        # least recently used version first
+        self.drg_versions: OrderedDict[str, dict] = OrderedDict()
+        self.version_load_times: dict[str, float] = {}
+        # (version, poa_exempt) -> (affect_drg, logic_tiebreaker) set by reconfigure
+        self.default_options: dict[tuple, tuple] = {}
+        self._drg_options: dict[tuple, object] = {}
+        self._component_classes: dict[str, object] = {}
+        self._versions_lock = Lock()
+        self._version_load_locks: dict[str, Lock] = {}
+        self._unavailable_versions: set[str] = set()
+        # version -> threading.local holding each thread's components of the
+        # version with thread_local. Dropped with the version, which frees the
+        # components of every thread, including threads that never return.
+        self._thread_components: dict[str, local] = {}
+        # Set when the current version is loaded / startup loading finished
+        self.ready = Event()
+        self.loaded = Event()
+
+    def _runtime_options(self, options: tuple):
+        drg_options = self._drg_options.get(options)
+        if drg_options is None:
+            drg_options = self._drg_options[options] = self.create_drg_options(*options)
+        return drg_options
+
+    def load_drg_version(self, version: str) -> dict:
+        """
+        Return the component pool of ``version``, loading the version if
+        needed. Loading builds the POA exempt and non-exempt components with
+        the default options, except with ``thread_local`` where the pool is
+        never used and each thread builds its own. Concurrent callers load
+        each version once.
+        """
+        with self._versions_lock:
+            components = self.drg_versions.get(version)
+            if components is not None:
+                self.drg_versions.move_to_end(version)
+                return components
+            if version in self._unavailable_versions:
+                raise ValueError(f"DRG version {version} is not available")
+            load_lock = self._version_load_locks.setdefault(version, Lock())
+
+        with load_lock:
+            with self._versions_lock:
+                components = self.drg_versions.get(version)
+            if components is not None:
+                return components
+            start = time.perf_counter()
             try:
-                drg_component = jpype.JClass(
-                    f"gov.agency.msdrg.v{curr_version}.MsdrgComponent"
-                )
-                self.drg_versions[curr_version] = {}
-                self.drg_versions[curr_version]["exempt"] = drg_component(
-                    exempt_drg_options
-                )
-                self.drg_versions[curr_version]["non_exempt"] = drg_component(
-                    non_exempt_drg_options
-                )
-                print(f"Loaded DRG version: {curr_version}")
+                drg_component = self._component_classes.get(version)
+                if drg_component is None:
+                    drg_component = jpype.JClass(
+                        f"gov.agency.msdrg.v{version}.MsdrgComponent"
+                    )
+                components = {}
+                if not self.thread_local:
+                    for poa_exempt in (True, False):
+                        options = (
+                            poa_exempt,
+                            MsdrgAffectDrgOptionFlag.COMPUTE,
+                            MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE,
+                        )
+                        components[options] = drg_component(
+                            self._runtime_options(options)
+                        )
             except Exception as e:
-                print(f"Failed to load DRG version {curr_version}: {e}")
-                if curr_version > end_version:
-                    break
-                curr_version = self.increment_version(curr_version)
-                continue
-            curr_version = self.increment_version(curr_version)
+                with self._versions_lock:
+                    self._unavailable_versions.add(version)
+                raise ValueError(f"DRG version {version} is not available: {e}")
+            elapsed = time.perf_counter() - start
+            get_registry().observe(MSDRG_VERSION_LOAD_SECONDS, elapsed, version=version)
+            with self._versions_lock:
+                self._component_classes[version] = drg_component
+                if self.thread_local:
+                    self._thread_components[version] = local()
+                self.version_load_times[version] = elapsed
+                self.drg_versions[version] = components
+                self._evict_versions()
+            return components
+
+    def get_drg_component(
+        self,
+        version: str,
+        poa_exempt: bool = False,
+        affect_drg: Optional[MsdrgAffectDrgOptionFlag] = None,
+        logic_tiebreaker: Optional[MarkingLogicTieBreaker] = None,
+    ):
+        """
+        Return the component of ``version`` configured with the given options.
+
+        Every combination of options gets its own component, built the first
+        time it is requested and reused afterwards, so claims with different
+        options never reconfigure a shared component. Options left as None
+        use the defaults set by ``reconfigure`` (COMPUTE and
+        CLINICAL_SIGNIFICANCE unless changed). With ``thread_local`` the
+        component belongs to the calling thread.
+        """
+        default_affect_drg, default_tiebreaker = self.default_options.get(
+            (version, poa_exempt),
+            (
+                MsdrgAffectDrgOptionFlag.COMPUTE,
+                MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE,
+            ),
+        )
+        affect_drg = affect_drg or default_affect_drg
+        logic_tiebreaker = logic_tiebreaker or default_tiebreaker
+        if not isinstance(affect_drg, MsdrgAffectDrgOptionFlag):
+            raise ValueError("Invalid affect DRG option")
+        if not isinstance(logic_tiebreaker, MarkingLogicTieBreaker):
+            raise ValueError("Invalid logic tie breaker option")
+
+        options = (bool(poa_exempt), affect_drg, logic_tiebreaker)
+        components = self.load_drg_version(version)
+        if self.thread_local:
+            return self._thread_component(version, options)
+        drg_component = components.get(options)
+        if drg_component is None:
+            with self._version_load_locks[version]:
+                drg_component = components.get(options)
+                if drg_component is None:
+                    drg_component = self._component_classes[version](
+                        self._runtime_options(options)
+                    )
+                    components[options] = drg_component
+        return drg_component
+
+    def _thread_component(self, version: str, options: tuple):
+        """Return the calling thread's component for ``version`` and ``options``."""
+        thread_components = self._thread_components.get(version)
+        if thread_components is None:
+            # Evicted since get_drg_component loaded it, build one for this call
+            thread_components = local()
+        components = getattr(thread_components, "components", None)
+        if components is None:
+            components = thread_components.components = {}
+        drg_component = components.get(options)
+        if drg_component is None:
+            drg_component = self._component_classes[version](
+                self._runtime_options(options)
+            )
+            components[options] = drg_component
+        return drg_component
+
+    def _evict_versions(self):
+        """Drop least recently used, non-preloaded versions above max_versions."""
+        if self.max_versions is None:
+            return
+        while len(self.drg_versions) > self.max_versions:
+            victim = next(
+                (v for v in self.drg_versions if v not in self.pinned_versions), None
+            )
+            if victim is None:
+                break
+            del self.drg_versions[victim]
+            self._thread_components.pop(victim, None)
+            get_registry().inc(MSDRG_VERSION_EVICTIONS, version=victim)
+
+    def load_drg_groupers(self, workers: int = 1) -> list[str]:
+        """
+        Load every version from MSDRG_VSTART up to the current one, plus any
+        newer version that is already available, and return the versions
+        loaded.
+
+        The current version is loaded first and sets ``ready``. Older versions
+        then load newest first on ``workers`` threads. ``loaded`` is set once
+        every version has been tried. Timings and failures are logged.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        end_version = self.determine_end_version()
+        loaded = []
+        try:
+            if self._load_logged(end_version):
+                loaded.append(end_version)
+        finally:
+            self.ready.set()
+        try:
+            older = []
+            version = MSDRG_VSTART
+            while version < end_version:
+                older.append(version)
+                version = self.increment_version(version)
+            older.reverse()
+            if workers > 1 and len(older) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=workers, initializer=attach_jvm_thread
+                ) as executor:
+                    results = list(executor.map(self._load_logged, older))
+            else:
+                results = [self._load_logged(version) for version in older]
+            loaded.extend(v for v, ok in zip(older, results) if ok)
+            # Groupers published ahead of their fiscal year
+            version = self.increment_version(end_version)
+            while self._load_logged(version, missing_ok=True):
+                loaded.append(version)
+                version = self.increment_version(version)
+        finally:
+            self.loaded.set()
+        return loaded
+
+    def _load_logged(self, version: str, missing_ok: bool = False) -> bool:
+        """Load ``version`` and log the outcome; return whether it loaded."""
+        try:
+            self.load_drg_version(version)
+        except Exception as e:
+            if missing_ok:
+                self.logger.debug(f"DRG version {version} is not available: {e}")
+            else:
+                self.logger.warning(f"Failed to load DRG version {version}: {e}")
+            return False
+        self.logger.info(
+            f"Loaded DRG version {version} in {self.version_load_times.get(version, 0.0):.2f}s"
+        )
+        return True
+
+    def _background_load(self, workers: int):
+        attach_jvm_thread()
+        try:
+            self.load_drg_groupers(workers)
+        except Exception as e:
+            self.logger.error(f"Loading DRG versions failed: {e}")
+
+    def wait_until_ready(
+        self, timeout: Optional[float] = None, all_versions: bool = False
+    ) -> bool:
+        """
+        Block until the current version (or, with ``all_versions``, every
+        version started by ``load_all``) is loaded. Returns False on timeout.
+        """
+        event = self.loaded if all_versions else self.ready
+        return event.wait(timeout)
 
     def reconfigure(
         self,
@@ -184,46 +567,22 @@ class DrgClient:
         logic_tiebreaker: MarkingLogicTieBreaker,
     ) -> None:
         """
-        Reconfigure the DRG client with new options.
-        """
-        with self._reconfig_lock:
-            if not isinstance(hospital_status, MsdrgHospitalStatusOptionFlag):
-                raise ValueError("Invalid hospital status option")
-            if not isinstance(affect_drg, MsdrgAffectDrgOptionFlag):
-                raise ValueError("Invalid affect DRG option")
-            if not isinstance(logic_tiebreaker, MarkingLogicTieBreaker):
-                raise ValueError("Invalid logic tie breaker option")
-
-            runtime_options = self.runtime_options_class()
-            match affect_drg:
-                case MsdrgAffectDrgOptionFlag.COMPUTE:
-                    runtime_options.setComputeAffectDrg(self.affect_drg_option.COMPUTE)
-                case MsdrgAffectDrgOptionFlag.DO_NOT_COMPUTE:
-                    runtime_options.setComputeAffectDrg(
-                        self.affect_drg_option.DO_NOT_COMPUTE
-                    )
-            match logic_tiebreaker:
-                case MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE:
-                    runtime_options.setMarkingLogicTieBreaker(
-                        self.logic_tiebreaker.CLINICAL_SIGNIFICANCE
-                    )
-                case MarkingLogicTieBreaker.CODE_ORDER:
-                    runtime_options.setMarkingLogicTieBreaker(
-                        self.logic_tiebreaker.CODE_ORDER
-                    )
-            if drg_version not in self.drg_versions:
-                raise ValueError(f"DRG version {drg_version} is not loaded")
-            if hospital_status == MsdrgHospitalStatusOptionFlag.EXEMPT:
-                drg_component = self.drg_versions[drg_version]["exempt"]
-                runtime_options.setPoaReportingExempt(self.hospital_status.EXEMPT)
-            else:
-                drg_component = self.drg_versions[drg_version]["non_exempt"]
-                runtime_options.setPoaReportingExempt(self.hospital_status.NON_EXEMPT)
-            msdrg_runtime_option = self.drg_options_class()
-            msdrg_runtime_option.put(
-                self.msdrg_option_flags_class.RUNTIME_OPTION_FLAGS, runtime_options
-            )
-            drg_component.reconfigure(msdrg_runtime_option)
+        Change the default options used for ``drg_version`` and hospital status
+        by calls to ``process`` that do not pass options of their own.
+
+        Components are never modified in place; the new defaults select (and
+        if needed build) another component from the pool.
+        """
+        if not isinstance(hospital_status, MsdrgHospitalStatusOptionFlag):
+            raise ValueError("Invalid hospital status option")
+        if not isinstance(affect_drg, MsdrgAffectDrgOptionFlag):
+            raise ValueError("Invalid affect DRG option")
+        if not isinstance(logic_tiebreaker, MarkingLogicTieBreaker):
+            raise ValueError("Invalid logic tie breaker option")
+        poa_exempt = hospital_status == MsdrgHospitalStatusOptionFlag.EXEMPT
+        # Build the component now so a missing version fails here
+        self.get_drg_component(drg_version, poa_exempt, affect_drg, logic_tiebreaker)
+        self.default_options[(drg_version, poa_exempt)] = (affect_drg, logic_tiebreaker)
 
     def determine_end_version(self):
         """
@@ -324,198 +683,340 @@ class DrgClient:
             0
         ]  # <---- We always return the first conversion choice
 
+    def _init_input_cache(self, size: int):
+        if size < 0:
+            raise ValueError("input_cache_size must not be negative")
+        self.input_cache_size = size
+        # (code, PoaType) -> (grouper code, Java POA, MsdrgInputDxCode) and
+        # code -> MsdrgInputPrCode, least recently used first. Input codes are
+        # never modified by the grouper, so claims and threads share them.
+        self._dx_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._px_cache: OrderedDict[str, object] = OrderedDict()
+        self._input_cache_lock = Lock()
+        self._poa_lookup = {
+            PoaType.Y: self.poa_values.Y,
+            PoaType.N: self.poa_values.N,
+            PoaType.U: self.poa_values.U,
+            PoaType.W: self.poa_values.W,
+        }
+
+    def _cached_code(self, cache: OrderedDict, key):
+        """Return the cached Java object of ``key`` (None if missing) and mark it used."""
+        with self._input_cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_code(self, cache: OrderedDict, key, value):
+        if self.input_cache_size == 0:
+            return
+        with self._input_cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > self.input_cache_size:
+                cache.popitem(last=False)
+
+    def _java_dx(
+        self, code: str, poa: PoaType, mappings: Optional[ICD10ConvertOutput] = None
+    ) -> tuple:
+        """
+        Return ``(grouper code, Java POA, MsdrgInputDxCode)`` for a claim
+        diagnosis, reusing the Java objects of codes seen before.
+        """
+        if mappings is not None:
+            code = self.mapped_dx_or_self(code.replace(".", ""), mappings)
+        key = (code, poa)
+        entry = self._cached_code(self._dx_cache, key)
+        if entry is None:
+            grouper_code = code.replace(".", "")
+            poa_value = self._poa_lookup.get(poa, self.poa_values.U)
+            entry = (
+                grouper_code,
+                poa_value,
+                self.drg_dx_class(grouper_code, poa_value),
+            )
+            self._cache_code(self._dx_cache, key, entry)
+        return entry
+
+    def _java_px(self, code: str, mappings: Optional[ICD10ConvertOutput] = None):
+        """Return the MsdrgInputPrCode of a claim procedure, reusing seen codes."""
+        if mappings is not None:
+            code = self.mapped_op_or_self(code.replace(".", ""), mappings)
+        java_px = self._cached_code(self._px_cache, code)
+        if java_px is None:
+            java_px = self.drg_px_class(code.replace(".", ""))
+            self._cache_code(self._px_cache, code, java_px)
+        return java_px
+
+    def _java_list(self, items: list):
+        """
+        Copy ``items`` into a new java.util.ArrayList with one array
+        conversion instead of a JNI ``add`` call per item.
+
+        The list is not reused between claims: MsdrgInput keeps a reference
+        to it, and ``process_versions`` and ``impact_analysis`` hold several
+        inputs at once.
+        """
+        return self.array_list_class(
+            self.arrays_class.asList(jpype.JArray(jpype.JObject)(items))
+        )
+
     def create_drg_input(
         self, claim: Claim, mappings: Optional[ICD10ConvertOutput] = None
     ):
         """
         Creates the DRG input object from the claim and mappings.
         """
-        input = self.drg_input_class.builder()
+        return self.build_drg_input(self.convert_claim(claim, mappings))
+
+    def convert_claim(
+        self, claim: Claim, mappings: Optional[ICD10ConvertOutput] = None
+    ) -> DrgInputParts:
+        """
+        Convert the claim fields the grouper reads into Java objects once, so
+        several inputs (diagnosis variants, grouper versions) can be built from
+        them without converting the claim again.
+        """
+        age_years = age_days_admit = age_days_discharge = None
         # Set Patient Age
         if claim.patient is not None:
             if claim.patient.age > 0:
-                input.withAgeInYears(claim.patient.age)
+                age_years = claim.patient.age
             elif claim.patient.age == 0 and claim.patient.date_of_birth is not None:
-                input.withAgeInYears(0)
-                age_in_days = self.calculate_age_in_days(claim)
-                input.withAgeDaysAdmit(age_in_days)
-                input.withAgeDaysDischarge(age_in_days + claim.los)
+                age_years = 0
+                age_days_admit = self.calculate_age_in_days(claim)
+                age_days_discharge = age_days_admit + claim.los
             else:
                 raise ValueError("Patient age or date of birth must be provided")
         # Set Sex
+        sex = None
         if claim.patient.sex is not None:
             if str(claim.patient.sex).upper().startswith("M"):
-                input.withSex(self.sex.MALE)
+                sex = self.sex.MALE
             elif str(claim.patient.sex).upper().startswith("F"):
-                input.withSex(self.sex.FEMALE)
+                sex = self.sex.FEMALE
             else:
-                input.withSex(self.sex.UNKNOWN)
+                sex = self.sex.UNKNOWN
 
         # Set Discharge Status
         if claim.patient_status is not None:
             # try to convert to integer
             try:
-                discharge_status = int(claim.patient_status)
-                input.withDischargeStatus(
-                    self.drg_status.getEnumFromInt(discharge_status)
+                discharge_status = self.drg_status.getEnumFromInt(
+                    int(claim.patient_status)
                 )
             except ValueError:
                 raise ValueError(f"Invalid patient status: {claim.patient_status}")
         else:
-            input.withDischargeStatus(self.drg_status.HOME_SELFCARE_ROUTINE)
+            discharge_status = self.drg_status.HOME_SELFCARE_ROUTINE
 
+        admit_dx = None
         if claim.admit_dx:
-            input.withAdmissionDiagnosisCode(
-                self.drg_dx_class(
-                    self.mapped_dx_or_self(
-                        claim.admit_dx.code.replace(".", ""), mappings
-                    ),
-                    self.poa_values.Y,
-                )
-            )
+            admit_dx = self._java_dx(claim.admit_dx.code, PoaType.Y, mappings)[2]
 
         if claim.principal_dx:
-            input.withPrincipalDiagnosisCode(
-                self.drg_dx_class(
-                    self.mapped_dx_or_self(
-                        claim.principal_dx.code.replace(".", ""), mappings
-                    ),
-                    self.poa_values.Y,
-                )
-            )
+            principal_dx = self._java_dx(claim.principal_dx.code, PoaType.Y, mappings)[
+                2
+            ]
         else:
             raise ValueError("Principal diagnosis must be provided")
 
-        java_dxs = self.array_list_class()
+        secondary_codes, secondary_poas, secondary_dxs = [], [], []
         for dx in claim.secondary_dxs:
             if dx:
                 if isinstance(dx, DiagnosisCode):
-                    if dx.poa == PoaType.Y:
-                        poa_value = self.poa_values.Y
-                    elif dx.poa == PoaType.N:
-                        poa_value = self.poa_values.N
-                    elif dx.poa == PoaType.U:
-                        poa_value = self.poa_values.U
-                    elif dx.poa == PoaType.W:
-                        poa_value = self.poa_values.W
-                    else:
-                        poa_value = self.poa_values.U
-                    java_dxs.add(
-                        self.drg_dx_class(
-                            self.mapped_dx_or_self(dx.code.replace(".", ""), mappings),
-                            poa_value,
-                        )
-                    )
+                    code, poa_value, java_dx = self._java_dx(dx.code, dx.poa, mappings)
+                    secondary_codes.append(code)
+                    secondary_poas.append(poa_value)
+                    secondary_dxs.append(java_dx)
                 else:
                     raise ValueError(
                         "Secondary diagnosis must be a DiagnosisCode object"
                     )
-        if len(java_dxs) > 0:
-            input.withSecondaryDiagnosisCodes(java_dxs)
 
-        java_pxs = self.array_list_class()
+        procedures = []
         for px in claim.inpatient_pxs:
             if isinstance(px, ProcedureCode):
-                java_pxs.add(
-                    self.drg_px_class(
-                        self.mapped_op_or_self(px.code.replace(".", ""), mappings)
-                    )
-                )
+                procedures.append(self._java_px(px.code, mappings))
             else:
                 raise ValueError(
                     "Inpatient procedure codes must be ProcedureCode objects"
                 )
-        if len(java_pxs) > 0:
-            input.withProcedureCodes(java_pxs)
+        return DrgInputParts(
+            age_years=age_years,
+            age_days_admit=age_days_admit,
+            age_days_discharge=age_days_discharge,
+            sex=sex,
+            discharge_status=discharge_status,
+            admit_dx=admit_dx,
+            principal_dx=principal_dx,
+            secondary_codes=secondary_codes,
+            secondary_poas=secondary_poas,
+            secondary_dxs=secondary_dxs,
+            procedures=procedures,
+        )
+
+    def build_drg_input(
+        self, parts: DrgInputParts, secondary_dxs: Optional[list] = None
+    ):
+        """
+        Build a Java MsdrgInput from converted claim ``parts``. ``secondary_dxs``
+        (Java diagnosis objects) replaces the claim's secondary diagnoses.
+        """
+        input = self.drg_input_class.builder()
+        if parts.age_years is not None:
+            input.withAgeInYears(parts.age_years)
+        if parts.age_days_admit is not None:
+            input.withAgeDaysAdmit(parts.age_days_admit)
+            input.withAgeDaysDischarge(parts.age_days_discharge)
+        if parts.sex is not None:
+            input.withSex(parts.sex)
+        input.withDischargeStatus(parts.discharge_status)
+        if parts.admit_dx is not None:
+            input.withAdmissionDiagnosisCode(parts.admit_dx)
+        input.withPrincipalDiagnosisCode(parts.principal_dx)
+
+        if secondary_dxs is None:
+            secondary_dxs = parts.secondary_dxs
+        if len(secondary_dxs) > 0:
+            input.withSecondaryDiagnosisCodes(self._java_list(secondary_dxs))
+        if len(parts.procedures) > 0:
+            input.withProcedureCodes(self._java_list(parts.procedures))
         return input.build()
 
-    def extract_msdrg_output(self, java_drg_output) -> MsdrgOutput:
+    def extraction_plan(
+        self,
+        level: Optional[MsdrgExtractionLevel | str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> tuple:
         """
-        Extract all data from the Java MsdrgOutput object and populate a Python MsdrgOutput object.
+        Return the extractors (keys of ``MSDRG_EXTRACTORS``) needed for an
+        extraction ``level`` or an explicit projection of MsdrgOutput ``fields``.
+        """
+        if fields is not None:
+            fields = frozenset(fields)
+            unknown = fields - MSDRG_OUTPUT_FIELDS.keys() - {"claim_id", "drg_version"}
+            if unknown:
+                raise ValueError(f"Unknown MS-DRG output fields: {sorted(unknown)}")
+            return tuple(
+                name
+                for name, extractor_fields in MSDRG_EXTRACTORS.items()
+                if fields.intersection(extractor_fields)
+            )
+        level = MsdrgExtractionLevel(level or self.extraction_level)
+        return MSDRG_LEVEL_EXTRACTORS[level]
+
+    def extract_msdrg_output(
+        self, java_drg_output, extractors: Optional[tuple] = None
+    ) -> MsdrgOutput:
+        """
+        Extract data from the Java MsdrgOutput object and populate a Python MsdrgOutput object.
+
+        ``extractors`` (see ``extraction_plan``) limits which parts are read;
+        by default everything is extracted. Fields that are not extracted keep
+        their defaults.
         """
         output = MsdrgOutput()
+        if extractors is None:
+            extractors = MSDRG_LEVEL_EXTRACTORS[MsdrgExtractionLevel.FULL]
 
         try:
-            # Grouper Information
-            output.grouper_flags.from_java(java_drg_output.getGrouperFlags())
-            output.initial_grc = str(java_drg_output.getInitialGrc().name())
-            output.final_grc = str(java_drg_output.getFinalGrc().name())
-
-            # Initial Grouping Results
-            initial_mdc = java_drg_output.getInitialMdc()
-            if initial_mdc is not None:
-                output.initial_mdc_value = str(initial_mdc.getValue())
-                output.initial_mdc_description = str(initial_mdc.getDescription())
-
-            initial_drg = java_drg_output.getInitialDrg()
-            if initial_drg is not None:
-                output.initial_drg_value = str(initial_drg.getValue())
-                output.initial_drg_description = str(initial_drg.getDescription())
-
-            initial_base_drg = java_drg_output.getInitialBaseDrg()
-            if initial_base_drg is not None:
-                output.initial_base_drg_value = str(initial_base_drg.getValue())
-                output.initial_base_drg_description = str(
-                    initial_base_drg.getDescription()
-                )
-
-            # output.initial_med_surg_type = java_drg_output.getInitialMedSurgType()
-            output.initial_severity = str(java_drg_output.getInitialSeverity().name())
-            output.initial_drg_sdx_severity = str(
-                java_drg_output.getInitialDrgSdxSeverity().name()
-            )
+            for name in extractors:
+                getattr(self, f"_extract_{name}")(output, java_drg_output)
+        except Exception as e:
+            print(f"Warning: Could not extract some output fields: {e}")
 
-            # Final Grouping Results
-            final_mdc = java_drg_output.getFinalMdc()
-            if final_mdc is not None:
-                output.final_mdc_value = str(final_mdc.getValue())
-                output.final_mdc_description = str(final_mdc.getDescription())
-
-            final_drg = java_drg_output.getFinalDrg()
-            if final_drg is not None:
-                output.final_drg_value = str(final_drg.getValue())
-                output.final_drg_description = str(final_drg.getDescription())
-
-            final_base_drg = java_drg_output.getFinalBaseDrg()
-            if final_base_drg is not None:
-                output.final_base_drg_value = str(final_base_drg.getValue())
-                output.final_base_drg_description = str(final_base_drg.getDescription())
-
-            # output.final_med_surg_type = java_drg_output.getFinalMedSurgType()
-            output.final_severity = str(java_drg_output.getFinalSeverity().name())
-            output.final_drg_sdx_severity = str(
-                java_drg_output.getFinalDrgSdxSeverity().name()
-            )
+        return output
 
-            # HAC Information
-            output.hac_status = str(java_drg_output.getHacStatus().name())
-            output.num_hac_categories_satisfied = (
-                java_drg_output.getNumHacCategoriesSatisfied()
-            )
+    # Grouper Information
+    def _extract_grouper_flags(self, output: MsdrgOutput, java_drg_output):
+        output.grouper_flags.from_java(java_drg_output.getGrouperFlags())
+
+    def _extract_initial_grc(self, output: MsdrgOutput, java_drg_output):
+        output.initial_grc = str(java_drg_output.getInitialGrc().name())
+
+    def _extract_final_grc(self, output: MsdrgOutput, java_drg_output):
+        output.final_grc = str(java_drg_output.getFinalGrc().name())
+
+    # Initial Grouping Results
+    def _extract_initial_mdc(self, output: MsdrgOutput, java_drg_output):
+        initial_mdc = java_drg_output.getInitialMdc()
+        if initial_mdc is not None:
+            output.initial_mdc_value = str(initial_mdc.getValue())
+            output.initial_mdc_description = str(initial_mdc.getDescription())
+
+    def _extract_initial_drg(self, output: MsdrgOutput, java_drg_output):
+        initial_drg = java_drg_output.getInitialDrg()
+        if initial_drg is not None:
+            output.initial_drg_value = str(initial_drg.getValue())
+            output.initial_drg_description = str(initial_drg.getDescription())
+
+    def _extract_initial_base_drg(self, output: MsdrgOutput, java_drg_output):
+        initial_base_drg = java_drg_output.getInitialBaseDrg()
+        if initial_base_drg is not None:
+            output.initial_base_drg_value = str(initial_base_drg.getValue())
+            output.initial_base_drg_description = str(initial_base_drg.getDescription())
+
+    def _extract_initial_severity(self, output: MsdrgOutput, java_drg_output):
+        # output.initial_med_surg_type = java_drg_output.getInitialMedSurgType()
+        output.initial_severity = str(java_drg_output.getInitialSeverity().name())
+        output.initial_drg_sdx_severity = str(
+            java_drg_output.getInitialDrgSdxSeverity().name()
+        )
 
-            # Diagnosis and Procedure Output
-            output.principal_dx_output.from_java(java_drg_output.getPdxOutput())
+    # Final Grouping Results
+    def _extract_final_mdc(self, output: MsdrgOutput, java_drg_output):
+        final_mdc = java_drg_output.getFinalMdc()
+        if final_mdc is not None:
+            output.final_mdc_value = str(final_mdc.getValue())
+            output.final_mdc_description = str(final_mdc.getDescription())
+
+    def _extract_final_drg(self, output: MsdrgOutput, java_drg_output):
+        final_drg = java_drg_output.getFinalDrg()
+        if final_drg is not None:
+            output.final_drg_value = str(final_drg.getValue())
+            output.final_drg_description = str(final_drg.getDescription())
+
+    def _extract_final_base_drg(self, output: MsdrgOutput, java_drg_output):
+        final_base_drg = java_drg_output.getFinalBaseDrg()
+        if final_base_drg is not None:
+            output.final_base_drg_value = str(final_base_drg.getValue())
+            output.final_base_drg_description = str(final_base_drg.getDescription())
+
+    def _extract_final_severity(self, output: MsdrgOutput, java_drg_output):
+        # output.final_med_surg_type = java_drg_output.getFinalMedSurgType()
+        output.final_severity = str(java_drg_output.getFinalSeverity().name())
+        output.final_drg_sdx_severity = str(
+            java_drg_output.getFinalDrgSdxSeverity().name()
+        )
 
-            # Secondary diagnosis outputs
-            sdx_outputs = java_drg_output.getSdxOutput()
-            if sdx_outputs is not None:
-                for sdx_output in sdx_outputs:
-                    output.secondary_dx_outputs.append(
-                        MsdrgOutputDxCode().from_java(sdx_output)
-                    )
+    # HAC Information
+    def _extract_hac(self, output: MsdrgOutput, java_drg_output):
+        output.hac_status = str(java_drg_output.getHacStatus().name())
+        output.num_hac_categories_satisfied = (
+            java_drg_output.getNumHacCategoriesSatisfied()
+        )
 
-            # Procedure outputs
-            proc_outputs = java_drg_output.getProcOutput()
-            if proc_outputs is not None:
-                for proc_output in proc_outputs:
-                    output.procedure_outputs.append(
-                        MsdrgOutputPrCode().from_java(proc_output)
-                    )
+    # Diagnosis and Procedure Output
+    def _extract_principal_dx_output(self, output: MsdrgOutput, java_drg_output):
+        output.principal_dx_output.from_java(java_drg_output.getPdxOutput())
 
-        except Exception as e:
-            print(f"Warning: Could not extract some output fields: {e}")
+    def _extract_secondary_dx_outputs(self, output: MsdrgOutput, java_drg_output):
+        sdx_outputs = java_drg_output.getSdxOutput()
+        if sdx_outputs is not None:
+            for sdx_output in sdx_outputs:
+                output.secondary_dx_outputs.append(
+                    MsdrgOutputDxCode().from_java(sdx_output)
+                )
 
-        return output
+    def _extract_procedure_outputs(self, output: MsdrgOutput, java_drg_output):
+        proc_outputs = java_drg_output.getProcOutput()
+        if proc_outputs is not None:
+            for proc_output in proc_outputs:
+                output.procedure_outputs.append(
+                    MsdrgOutputPrCode().from_java(proc_output)
+                )
 
     @handle_java_exceptions
     def process(
@@ -524,39 +1025,30 @@ class DrgClient:
         drg_version=None,
         icd_converter: Optional[ICDConverter] = None,
         poa_exempt: bool = False,
+        affect_drg: Optional[MsdrgAffectDrgOptionFlag] = None,
+        logic_tiebreaker: Optional[MarkingLogicTieBreaker] = None,
+        level: Optional[MsdrgExtractionLevel | str] = None,
+        fields: Optional[Iterable[str]] = None,
     ):
         """
         Processes the claim through the DRG system.
+
+        ``poa_exempt``, ``affect_drg`` and ``logic_tiebreaker`` select the
+        grouper options for this call only, so claims with different options
+        can be grouped concurrently.
+
+        ``level`` (default: the client's ``extraction_level``) or an explicit
+        projection of MsdrgOutput ``fields`` limits how much of the Java output
+        is converted. ``claim_id`` and ``drg_version`` are always set.
         """
-        retries = 10
-        while retries > 0:
-            if self._reconfig_lock.acquire(blocking=False):
-                self._reconfig_lock.release()
-                break
-            else:
-                retries -= 1
-                time.sleep(0.01)  # short sleep to avoid busy-wait
-        if retries == 0:
-            raise RuntimeError(
-                "DRG client is busy reconfiguring, please try again later"
-            )
+        extractors = self.extraction_plan(level, fields)
 
         if drg_version is None:
-            """Determine the DRG version based on the claim date"""
-            if type(claim.thru_date) is str:
-                claim_date = datetime.strptime(claim.thru_date, "%Y-%m-%d")
-            elif type(claim.thru_date) is datetime:
-                claim_date = claim.thru_date
-            else:
-                raise ValueError("Invalid date format for claim.thru_date")
-            drg_version = self.determine_drg_version(claim_date)
-        if drg_version not in self.drg_versions:
-            raise ValueError(f"DRG version {drg_version} is not loaded")
-        # Get the DRG component for the specified version
-        if poa_exempt:
-            drg_component = self.drg_versions[drg_version]["exempt"]
-        else:
-            drg_component = self.drg_versions[drg_version]["non_exempt"]
+            drg_version = self.claim_drg_version(claim)
+        # Get the DRG component for the version and options, loading it on first use
+        drg_component = self.get_drg_component(
+            drg_version, poa_exempt, affect_drg, logic_tiebreaker
+        )
 
         if claim.thru_date is None:
             raise ValueError("Claim thru_date must be provided")
@@ -564,26 +1056,335 @@ class DrgClient:
             raise ValueError("Claim principal_dx must be provided")
 
         # Determine if code conversions are requests
-        mappings = None
+        mappings = self._claim_mappings(claim, drg_version, icd_converter)
+
+        with stage_timer("msdrg", "input"):
+            drg_input = self.create_drg_input(claim, mappings)
+            drg_claim = self.drg_claim_class(drg_input)
+        output = self._group(drg_claim, drg_component, extractors)
+        output.claim_id = claim.claimid
+        output.drg_version = drg_version
+        if mappings is not None:
+            output.icd10_conversion_output = mappings
+        return output
+
+    def _claim_mappings(
+        self, claim: Claim, drg_version: str, icd_converter: Optional[ICDConverter]
+    ) -> Optional[ICD10ConvertOutput]:
+        """Generate ICD conversions when the claim asks for them."""
         if claim.icd_convert is not None and icd_converter is not None:
             if claim.icd_convert.option != ICDConvertOption.NONE:
-                # generate conversions
-                mappings = icd_converter.generate_claim_mappings(claim, drg_version)
+                return icd_converter.generate_claim_mappings(claim, drg_version)
+        return None
 
-        drg_input = self.create_drg_input(claim, mappings)
-        drg_claim = self.drg_claim_class(drg_input)
-        drg_component.process(drg_claim)
+    @handle_java_exceptions
+    def impact_analysis(
+        self,
+        claim: Claim,
+        drg_version=None,
+        icd_converter: Optional[ICDConverter] = None,
+        poa_exempt: bool = False,
+        affect_drg: Optional[MsdrgAffectDrgOptionFlag] = None,
+        logic_tiebreaker: Optional[MarkingLogicTieBreaker] = None,
+        replacements: Optional[Mapping[str, str]] = None,
+        weights: Optional[Mapping[str, float]] = None,
+        workers: int = 1,
+    ) -> MsdrgImpactAnalysis:
+        """
+        Re-group the claim once per secondary diagnosis variant to show which
+        codes drive its DRG and CC/MCC severity.
+
+        Every secondary diagnosis is dropped in turn. Codes in ``replacements``
+        (code -> replacement code) are also re-grouped with the replacement in
+        their place, keeping their POA indicator. The claim is converted to Java
+        once; each variant only builds a new input from the converted codes and
+        extracts the summary fields.
+
+        The grouper does not return relative weights. Pass ``weights`` (DRG ->
+        relative weight, e.g. from IPPS Table 5) to fill ``weight`` and
+        ``weight_change``.
+
+        By default the variants run one after another. ``workers`` greater
+        than 1 runs them on that many threads of the client (see
+        ``_map_threads``). Use it with ``thread_local``, since shared
+        components are not documented as thread-safe.
+        """
+        if drg_version is None:
+            drg_version = self.claim_drg_version(claim)
+        if claim.principal_dx is None:
+            raise ValueError("Claim principal_dx must be provided")
+        mappings = self._claim_mappings(claim, drg_version, icd_converter)
+        parts = self.convert_claim(claim, mappings)
+        extractors = MSDRG_LEVEL_EXTRACTORS[MsdrgExtractionLevel.SUMMARY]
+
+        def group(secondary_dxs=None) -> MsdrgOutput:
+            drg_component = self.get_drg_component(
+                drg_version, poa_exempt, affect_drg, logic_tiebreaker
+            )
+            drg_claim = self.drg_claim_class(self.build_drg_input(parts, secondary_dxs))
+            return self._group(drg_claim, drg_component, extractors)
+
+        base = group()
+        weights = weights or {}
+        result = MsdrgImpactAnalysis(
+            claim_id=claim.claimid,
+            drg_version=drg_version,
+            final_drg_value=base.final_drg_value,
+            final_mdc_value=base.final_mdc_value,
+            final_severity=base.final_severity,
+            weight=weights.get(base.final_drg_value),
+        )
+
+        replacements = {
+            code.replace(".", ""): new_code.replace(".", "")
+            for code, new_code in (replacements or {}).items()
+        }
+        variants = []
+        for index, code in enumerate(parts.secondary_codes):
+            poa = parts.secondary_poas[index]
+            others = parts.secondary_dxs[:index] + parts.secondary_dxs[index + 1 :]
+            variants.append((MsdrgImpactRow(code=code, poa=str(poa.name())), others))
+            if code in replacements:
+                replaced = list(parts.secondary_dxs)
+                replaced[index] = self.drg_dx_class(replacements[code], poa)
+                row = MsdrgImpactRow(
+                    code=code,
+                    poa=str(poa.name()),
+                    change="replace",
+                    replacement=replacements[code],
+                )
+                variants.append((row, replaced))
+
+        def run(variant) -> MsdrgImpactRow:
+            row, secondary_dxs = variant
+            try:
+                output = group(secondary_dxs)
+            except Exception as e:
+                row.error = str(e)
+                return row
+            row.final_drg_value = output.final_drg_value
+            row.final_mdc_value = output.final_mdc_value
+            row.final_severity = output.final_severity
+            row.drg_changed = output.final_drg_value != base.final_drg_value
+            row.severity_changed = output.final_severity != base.final_severity
+            row.weight = weights.get(output.final_drg_value)
+            if row.weight is not None and result.weight is not None:
+                row.weight_change = row.weight - result.weight
+            return row
+
+        result.rows = self._map_threads(run, variants, workers)
+        return result
+
+    def _map_threads(self, function: Callable, items: list, workers: int) -> list:
+        """
+        Return ``[function(item) for item in items]``, computed on up to
+        ``workers`` threads.
+
+        The threads belong to the client and are reused by later calls, so
+        with ``thread_local`` each thread builds its components once instead
+        of once per call.
+        """
+        workers = min(workers, len(items))
+        if workers <= 1:
+            return [function(item) for item in items]
+
+        def run(offset: int) -> list:
+            return [function(item) for item in items[offset::workers]]
+
+        with self._executor_lock:
+            if self._executor is None or self._executor_workers < workers:
+                if self._executor is not None:
+                    # Running calls finish on the old threads
+                    self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="msdrg",
+                    initializer=attach_jvm_thread,
+                )
+                self._executor_workers = workers
+            futures = [self._executor.submit(run, offset) for offset in range(workers)]
+        results: list = [None] * len(items)
+        for offset, future in enumerate(futures):
+            results[offset::workers] = future.result()
+        return results
+
+    def close(self):
+        """Stop the threads started by ``impact_analysis`` and ``process_versions``."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+            self._executor_workers = 0
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @handle_java_exceptions
+    def process_versions(
+        self,
+        claims: Claim | Iterable[Claim],
+        versions: Iterable[str],
+        icd_converter: Optional[ICDConverter] = None,
+        poa_exempt: bool = False,
+        affect_drg: Optional[MsdrgAffectDrgOptionFlag] = None,
+        logic_tiebreaker: Optional[MarkingLogicTieBreaker] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> MsdrgVersionComparison | list[MsdrgVersionComparison]:
+        """
+        Group claims under every grouper version in ``versions`` and compare
+        their final DRG, MDC and severity with the first version.
+
+        Each claim is converted to a Java input once and that input is grouped
+        by every version. Claims that request ICD-10 conversion are converted
+        per version, since their mappings depend on it. Claims are swept in
+        chunks of ``chunk_size``, so only one chunk of Java inputs is held at a
+        time.
+
+        Versions run concurrently on up to ``workers`` threads of the client
+        (default: one per version, see ``_map_threads``). Each version is
+        grouped by a single thread, so its component is never shared within a
+        sweep. The components are those of the calling thread, so with
+        ``thread_local`` a sweep builds no components on the pool threads.
+
+        A single claim returns one MsdrgVersionComparison and an iterable of
+        claims a list in input order. Claim errors are reported per claim and
+        version; an unknown version raises ValueError.
+        """
+        versions = list(dict.fromkeys(versions))
+        if not versions:
+            raise ValueError("At least one DRG version must be given")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        options = (poa_exempt, affect_drg, logic_tiebreaker)
+        single = isinstance(claims, Claim)
+        if single:
+            claims = [claims]
+
+        if workers is None:
+            workers = len(versions)
+        comparisons = []
+        chunk = []
+        for claim in claims:
+            chunk.append(claim)
+            if len(chunk) == chunk_size:
+                comparisons.extend(
+                    self._sweep_versions(
+                        chunk, versions, icd_converter, options, workers
+                    )
+                )
+                chunk = []
+        if chunk:
+            comparisons.extend(
+                self._sweep_versions(chunk, versions, icd_converter, options, workers)
+            )
+        return comparisons[0] if single else comparisons
+
+    def _sweep_versions(
+        self,
+        claims: list,
+        versions: list,
+        icd_converter: Optional[ICDConverter],
+        options: tuple,
+        workers: int,
+    ) -> list[MsdrgVersionComparison]:
+        """Group one chunk of claims under every version and compare the results."""
+        extractors = MSDRG_LEVEL_EXTRACTORS[MsdrgExtractionLevel.SUMMARY]
+        # A Java input per claim, None when ICD conversions make it per
+        # version, or the exception that stopped its conversion
+        inputs = []
+        for claim in claims:
+            try:
+                if (
+                    icd_converter is not None
+                    and claim.icd_convert is not None
+                    and claim.icd_convert.option != ICDConvertOption.NONE
+                ):
+                    inputs.append(None)
+                    continue
+                with stage_timer("msdrg", "input"):
+                    inputs.append(self.build_drg_input(self.convert_claim(claim)))
+            except Exception as e:
+                inputs.append(e)
+
+        # Looked up on the calling thread and lent to the pool: each version
+        # is grouped by one thread at a time, so with thread_local the pool
+        # threads need no components of their own
+        components = {
+            version: self.get_drg_component(version, *options) for version in versions
+        }
+
+        def run(version: str) -> list:
+            drg_component = components[version]
+            outputs = []
+            for claim, drg_input in zip(claims, inputs):
+                if isinstance(drg_input, Exception):
+                    outputs.append(drg_input)
+                    continue
+                try:
+                    if drg_input is None:
+                        mappings = self._claim_mappings(claim, version, icd_converter)
+                        with stage_timer("msdrg", "input"):
+                            drg_input = self.create_drg_input(claim, mappings)
+                    drg_claim = self.drg_claim_class(drg_input)
+                    outputs.append(self._group(drg_claim, drg_component, extractors))
+                except Exception as e:
+                    outputs.append(e)
+            return outputs
+
+        by_version = self._map_threads(run, versions, workers)
+
+        comparisons = []
+        for index, claim in enumerate(claims):
+            comparison = MsdrgVersionComparison(
+                claim_id=claim.claimid, baseline_version=versions[0]
+            )
+            if isinstance(inputs[index], Exception):
+                comparison.error = str(inputs[index])
+                comparisons.append(comparison)
+                continue
+            baseline = by_version[0][index]
+            for version, outputs in zip(versions, by_version):
+                output = outputs[index]
+                result = MsdrgVersionResult(version=version)
+                if isinstance(output, Exception):
+                    result.error = str(output)
+                else:
+                    result.final_drg_value = output.final_drg_value
+                    result.final_mdc_value = output.final_mdc_value
+                    result.final_severity = output.final_severity
+                    if not isinstance(baseline, Exception):
+                        result.drg_changed = (
+                            output.final_drg_value != baseline.final_drg_value
+                        )
+                        result.mdc_changed = (
+                            output.final_mdc_value != baseline.final_mdc_value
+                        )
+                        result.severity_changed = (
+                            output.final_severity != baseline.final_severity
+                        )
+                comparison.results.append(result)
+            comparisons.append(comparison)
+        return comparisons
+
+    def claim_drg_version(self, claim: Claim) -> str:
+        """Determine the DRG version based on the claim thru date."""
+        if type(claim.thru_date) is str:
+            claim_date = datetime.strptime(claim.thru_date, "%Y-%m-%d")
+        elif type(claim.thru_date) is datetime:
+            claim_date = claim.thru_date
+        else:
+            raise ValueError("Invalid date format for claim.thru_date")
+        return self.determine_drg_version(claim_date)
+
+    def _group(self, drg_claim, drg_component, extractors: tuple) -> MsdrgOutput:
+        """Run a Java MsdrgClaim through ``drg_component`` and extract the output."""
+        with stage_timer("msdrg", "java"):
+            drg_component.process(drg_claim)
         drg_output = drg_claim.getOutput()
         if drg_output.isPresent() == 0:
             raise RuntimeError("DRG output is not present")
         drg_result = drg_output.get()
 
-        output = self.extract_msdrg_output(drg_result)
-        output.claim_id = claim.claimid
-        output.drg_version = drg_version
-        if mappings is not None:
-            output.icd10_conversion_output = mappings
-        return output
+        with stage_timer("msdrg", "output"):
+            return self.extract_msdrg_output(drg_result, extractors)
 
     def batch_load_claims(self, file_path: str):
         list_of_claims = []
@@ -596,46 +1397,286 @@ class DrgClient:
                     print(f"Error loading claim: {e}")
         return list_of_claims
 
+    def iter_claims(self, file_path: str) -> Iterator[Claim]:
+        """
+        Yield claims from a JSONL file one at a time, so a batch never holds
+        the whole file in memory. Lines that are not valid claims are skipped.
+        """
+        with open(file_path, "r") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    yield Claim.model_validate_json(line)
+                except Exception as e:
+                    print(f"Error loading claim: {e}")
+
+    def _batch_results(
+        self,
+        claims: Iterable[Claim],
+        output: TextIO,
+        drg_version,
+        hospital_status: MsdrgHospitalStatusOptionFlag
+        | Callable[[Claim], MsdrgHospitalStatusOptionFlag],
+        affect_drg: MsdrgAffectDrgOptionFlag,
+        logic_tiebreaker: MarkingLogicTieBreaker,
+        level: Optional[MsdrgExtractionLevel | str],
+        flush_every: int,
+        bucket_window: Optional[int] = None,
+    ) -> Iterator[tuple]:
+        """
+        Process ``claims``, writing each result to ``output`` as one JSON line
+        and flushing every ``flush_every`` results. Yields
+        ``(claim, result, error, seconds)`` for every claim, in input order.
+        """
+        if bucket_window is None:
+            results = (
+                self._timed_process(
+                    claim,
+                    drg_version,
+                    hospital_status,
+                    affect_drg,
+                    logic_tiebreaker,
+                    level,
+                )
+                for claim in claims
+            )
+        else:
+            results = self._bucketed_results(
+                claims,
+                drg_version,
+                hospital_status,
+                affect_drg,
+                logic_tiebreaker,
+                level,
+                bucket_window,
+            )
+        written = 0
+        try:
+            for claim, result, error, claim_time in results:
+                if error is None:
+                    output.write(result.model_dump_json() + "\n")
+                    written += 1
+                    if written % flush_every == 0:
+                        output.flush()
+                yield claim, result, error, claim_time
+        finally:
+            output.flush()
+
+    def _poa_exempt(self, hospital_status, claim: Claim) -> bool:
+        """Resolve a hospital status flag, or a per-claim callable, to POA exemption."""
+        if callable(hospital_status):
+            hospital_status = hospital_status(claim)
+        return hospital_status == MsdrgHospitalStatusOptionFlag.EXEMPT
+
+    def _timed_process(
+        self,
+        claim: Claim,
+        drg_version,
+        hospital_status,
+        affect_drg: MsdrgAffectDrgOptionFlag,
+        logic_tiebreaker: MarkingLogicTieBreaker,
+        level: Optional[MsdrgExtractionLevel | str],
+    ) -> tuple:
+        """
+        Process one claim and return ``(claim, result, error, seconds)``.
+        Errors, including one raised by a ``hospital_status`` callable, are
+        returned as that claim's ``error``.
+        """
+        claim_start = time.perf_counter()
+        try:
+            result = self.process(
+                claim,
+                drg_version,
+                None,
+                poa_exempt=self._poa_exempt(hospital_status, claim),
+                affect_drg=affect_drg,
+                logic_tiebreaker=logic_tiebreaker,
+                level=level,
+            )
+        except Exception as e:
+            return claim, None, e, time.perf_counter() - claim_start
+        return claim, result, None, time.perf_counter() - claim_start
+
+    def _bucketed_results(
+        self,
+        claims: Iterable[Claim],
+        drg_version,
+        hospital_status,
+        affect_drg: MsdrgAffectDrgOptionFlag,
+        logic_tiebreaker: MarkingLogicTieBreaker,
+        level: Optional[MsdrgExtractionLevel | str],
+        bucket_window: int,
+    ) -> Iterator[tuple]:
+        """
+        Read ``bucket_window`` claims at a time, process them bucket by bucket
+        of (grouper version, POA exemption) and yield the results in input
+        order.
+        """
+        if bucket_window < 1:
+            raise ValueError("bucket_window must be at least 1")
+        window = []
+        for claim in claims:
+            window.append(claim)
+            if len(window) == bucket_window:
+                yield from self._process_window(
+                    window,
+                    drg_version,
+                    hospital_status,
+                    affect_drg,
+                    logic_tiebreaker,
+                    level,
+                )
+                window = []
+        if window:
+            yield from self._process_window(
+                window,
+                drg_version,
+                hospital_status,
+                affect_drg,
+                logic_tiebreaker,
+                level,
+            )
+
+    def _process_window(
+        self,
+        window: list,
+        drg_version,
+        hospital_status,
+        affect_drg: MsdrgAffectDrgOptionFlag,
+        logic_tiebreaker: MarkingLogicTieBreaker,
+        level: Optional[MsdrgExtractionLevel | str],
+    ) -> list:
+        """Process a window of claims sorted by bucket; results keep window order."""
+        keys = []
+        statuses = []
+        results = [None] * len(window)
+        for index, claim in enumerate(window):
+            version = drg_version
+            if version is None:
+                try:
+                    version = self.claim_drg_version(claim)
+                except Exception:
+                    # process() reports the bad thru_date for this claim
+                    version = ""
+            status = hospital_status
+            if callable(hospital_status):
+                status_start = time.perf_counter()
+                try:
+                    status = hospital_status(claim)
+                except Exception as e:
+                    results[index] = (
+                        claim,
+                        None,
+                        e,
+                        time.perf_counter() - status_start,
+                    )
+            statuses.append(status)
+            keys.append((version, status == MsdrgHospitalStatusOptionFlag.EXEMPT))
+
+        for index in sorted(range(len(window)), key=keys.__getitem__):
+            if results[index] is not None:
+                continue
+            results[index] = self._timed_process(
+                window[index],
+                keys[index][0] or None,
+                statuses[index],
+                affect_drg,
+                logic_tiebreaker,
+                level,
+            )
+        return results
+
+    @contextmanager
+    def _open_output(self, output_file_path: str | TextIO):
+        if isinstance(output_file_path, str):
+            with open(output_file_path, "w", buffering=BATCH_WRITE_BUFFER) as f:
+                yield f
+        else:
+            yield output_file_path
+
     def batch_process(
         self,
-        claims: List[Claim],
-        output_file_path: str,
+        claims: Iterable[Claim],
+        output_file_path: str | TextIO,
         drg_version=None,
-        hospital_status: MsdrgHospitalStatusOptionFlag = MsdrgHospitalStatusOptionFlag.NON_EXEMPT,
+        hospital_status: MsdrgHospitalStatusOptionFlag
+        | Callable[
+            [Claim], MsdrgHospitalStatusOptionFlag
+        ] = MsdrgHospitalStatusOptionFlag.NON_EXEMPT,
         affect_drg: MsdrgAffectDrgOptionFlag = MsdrgAffectDrgOptionFlag.COMPUTE,
         logic_tiebreaker: MarkingLogicTieBreaker = MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE,
-    ):
-        with open(output_file_path, "w") as f:
-            for claim in claims:
-                try:
-                    result = self.process(claim, drg_version, None)
-                    f.write(json.dumps(result.model_dump_json(indent=2)) + "\n")
-                except Exception as e:
-                    print(f"Error processing claim {claim.claimid}: {e}")
+        level: Optional[MsdrgExtractionLevel | str] = None,
+        flush_every: int = 1000,
+        bucket_window: Optional[int] = None,
+    ) -> int:
+        """
+        Stream claims from any iterable (e.g. ``iter_claims``) and write one
+        MsdrgOutput JSON object per line to ``output_file_path`` (a path or an
+        open text file). Returns the number of results written.
+
+        ``hospital_status`` is a flag for the whole batch or a callable
+        returning the flag for each claim. With ``bucket_window``, claims are
+        read that many at a time and grouped bucket by bucket of grouper
+        version and POA exemption, so one component stays warm at a time (and
+        lazily loaded versions are not evicted and reloaded); results are still
+        written in input order.
+        """
+        written = 0
+        with self._open_output(output_file_path) as f:
+            for claim, result, error, _ in self._batch_results(
+                claims,
+                f,
+                drg_version,
+                hospital_status,
+                affect_drg,
+                logic_tiebreaker,
+                level,
+                flush_every,
+                bucket_window,
+            ):
+                if error is not None:
+                    print(f"Error processing claim {claim.claimid}: {error}")
+                else:
+                    written += 1
+        return written
 
     def batch_process_with_stats(
         self,
-        claims: List[Claim],
-        output_file_path: str,
+        claims: Iterable[Claim],
+        output_file_path: str | TextIO,
         drg_version=None,
-        hospital_status: MsdrgHospitalStatusOptionFlag = MsdrgHospitalStatusOptionFlag.NON_EXEMPT,
+        hospital_status: MsdrgHospitalStatusOptionFlag
+        | Callable[
+            [Claim], MsdrgHospitalStatusOptionFlag
+        ] = MsdrgHospitalStatusOptionFlag.NON_EXEMPT,
         affect_drg: MsdrgAffectDrgOptionFlag = MsdrgAffectDrgOptionFlag.COMPUTE,
         logic_tiebreaker: MarkingLogicTieBreaker = MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE,
+        level: Optional[MsdrgExtractionLevel | str] = None,
+        flush_every: int = 1000,
+        max_errors: int = 100,
+        bucket_window: Optional[int] = None,
     ):
         """
-        Batch process a list of claims with progress bar and statistics.
-        Returns dictionary with processing statistics.
+        Batch process claims from any iterable and return processing statistics.
+
+        Memory does not grow with the number of claims: latencies go into a
+        fixed-size histogram (``latency`` holds its percentiles, min, max and
+        mean), only the first ``max_errors`` errors are kept as a sample and
+        ``error_types`` counts every error by exception type.
+
+        ``hospital_status`` and ``bucket_window`` work as in ``batch_process``.
         """
-        import time
         from collections import Counter
 
-        start_time = time.time()
+        start_time = time.perf_counter()
+        latency = LatencyHistogram()
         stats = {
-            "total_claims": len(claims),
+            "total_claims": 0,
             "successful_claims": 0,
             "failed_claims": 0,
-            "processing_times": [],
             "errors": [],
+            "error_types": Counter(),
             "drg_distribution": Counter(),
             "mdc_distribution": Counter(),
             "severity_distribution": Counter(),
@@ -646,56 +1687,49 @@ class DrgClient:
             "slowest_claim": {"time": 0, "id": None},
         }
 
-        with open(output_file_path, "w") as f:
-            for claim in claims:
-                claim_start = time.time()
-                try:
-                    result = self.process(claim, drg_version, None)
-                    claim_time = time.time() - claim_start
-
-                    f.write(result.model_dump_json(indent=2) + "\n")
-
-                    stats["successful_claims"] += 1
-                    stats["processing_times"].append(claim_time)
-
-                    if claim_time < stats["fastest_claim"]["time"]:
-                        stats["fastest_claim"] = {
-                            "time": claim_time,
-                            "id": claim.claimid,
-                        }
-                    if claim_time > stats["slowest_claim"]["time"]:
-                        stats["slowest_claim"] = {
-                            "time": claim_time,
-                            "id": claim.claimid,
-                        }
-
-                    if result.final_drg_value:
-                        stats["drg_distribution"][result.final_drg_value] += 1
-                    if result.final_mdc_value:
-                        stats["mdc_distribution"][result.final_mdc_value] += 1
-                    if result.final_severity:
-                        stats["severity_distribution"][result.final_severity] += 1
-                    if result.hac_status:
-                        stats["hac_status_distribution"][result.hac_status] += 1
-
-                except Exception as e:
-                    claim_time = time.time() - claim_start
+        with self._open_output(output_file_path) as f:
+            for claim, result, error, claim_time in self._batch_results(
+                claims,
+                f,
+                drg_version,
+                hospital_status,
+                affect_drg,
+                logic_tiebreaker,
+                level,
+                flush_every,
+                bucket_window,
+            ):
+                stats["total_claims"] += 1
+                latency.observe(claim_time)
+                if error is not None:
                     stats["failed_claims"] += 1
-                    stats["processing_times"].append(claim_time)
-                    stats["errors"].append(
-                        {
-                            "claim_id": claim.claimid,
-                            "error": str(e),
-                            "processing_time": claim_time,
-                        }
-                    )
-                    print(f"Error processing claim {claim.claimid}: {e}")
-
-        end_time = time.time()
-        stats["total_processing_time"] = end_time - start_time
-        if stats["processing_times"]:
-            stats["avg_processing_time"] = sum(stats["processing_times"]) / len(
-                stats["processing_times"]
-            )
-
+                    stats["error_types"][type(error).__name__] += 1
+                    if len(stats["errors"]) < max_errors:
+                        stats["errors"].append(
+                            {
+                                "claim_id": claim.claimid,
+                                "error": str(error),
+                                "processing_time": claim_time,
+                            }
+                        )
+                    continue
+
+                stats["successful_claims"] += 1
+                if claim_time < stats["fastest_claim"]["time"]:
+                    stats["fastest_claim"] = {"time": claim_time, "id": claim.claimid}
+                if claim_time > stats["slowest_claim"]["time"]:
+                    stats["slowest_claim"] = {"time": claim_time, "id": claim.claimid}
+
+                if result.final_drg_value:
+                    stats["drg_distribution"][result.final_drg_value] += 1
+                if result.final_mdc_value:
+                    stats["mdc_distribution"][result.final_mdc_value] += 1
+                if result.final_severity:
+                    stats["severity_distribution"][result.final_severity] += 1
+                if result.hac_status:
+                    stats["hac_status_distribution"][result.hac_status] += 1
+
+        stats["total_processing_time"] = time.perf_counter() - start_time
+        stats["avg_processing_time"] = latency.mean
+        stats["latency"] = latency.snapshot()
         return stats
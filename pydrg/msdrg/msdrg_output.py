@@ -113,3 +113,69 @@ class MsdrgOutput(BaseModel):
 
     def __repr__(self):
         return self.__str__()
+
+
+class MsdrgImpactRow(BaseModel):
+    """Grouping result of one secondary diagnosis variant of a claim."""
+
+    code: str
+    poa: str = ""
+    change: str = "drop"  # "drop" or "replace"
+    replacement: Optional[str] = None
+    final_drg_value: str = ""
+    final_mdc_value: str = ""
+    final_severity: str = ""
+    drg_changed: bool = False
+    severity_changed: bool = False
+    weight: Optional[float] = None
+    weight_change: Optional[float] = None
+    error: Optional[str] = None
+
+
+class MsdrgImpactAnalysis(BaseModel):
+    """Base grouping of a claim and the effect of each secondary diagnosis variant."""
+
+    claim_id: str = ""
+    drg_version: str = ""
+    final_drg_value: str = ""
+    final_mdc_value: str = ""
+    final_severity: str = ""
+    weight: Optional[float] = None
+    rows: List[MsdrgImpactRow] = Field(default_factory=list)
+
+    def drivers(self) -> List[MsdrgImpactRow]:
+        """Rows whose variant changed the final DRG or severity."""
+        return [row for row in self.rows if row.drg_changed or row.severity_changed]
+
+
+class MsdrgVersionResult(BaseModel):
+    """Grouping result of a claim under one grouper version of a sweep."""
+
+    version: str
+    final_drg_value: str = ""
+    final_mdc_value: str = ""
+    final_severity: str = ""
+    drg_changed: bool = False
+    mdc_changed: bool = False
+    severity_changed: bool = False
+    error: Optional[str] = None
+
+
+class MsdrgVersionComparison(BaseModel):
+    """Final DRG, MDC and severity of a claim under each version of a sweep.
+
+    Changes are relative to ``baseline_version``, the first version swept.
+    """
+
+    claim_id: str = ""
+    baseline_version: str = ""
+    results: List[MsdrgVersionResult] = Field(default_factory=list)
+    error: Optional[str] = None
+
+    def changes(self) -> List[MsdrgVersionResult]:
+        """Versions whose final DRG, MDC or severity differ from the baseline."""
+        return [
+            result
+            for result in self.results
+            if result.drg_changed or result.mdc_changed or result.severity_changed
+        ]
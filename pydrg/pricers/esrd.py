@@ -13,6 +13,7 @@ from pydrg.helpers.utils import (
     create_supported_years,
     handle_java_exceptions,
 )
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input.claim import Claim
 from pydrg.plugins import apply_client_methods, run_client_load_classes
 from pydrg.pricers.url_loader import UrlLoader
@@ -929,9 +930,12 @@ class EsrdClient:
         """
         if not isinstance(claim, Claim):
             raise ValueError("claim must be an instance of Claim")
-        pricing_request = self.create_input_claim(claim, **kwargs)
-        pricing_response = self.process_claim(claim, pricing_request)
-        esrd_output = EsrdOutput()
-        esrd_output.claim_id = claim.claimid
-        esrd_output.from_java(pricing_response)
+        with stage_timer("esrd", "input"):
+            pricing_request = self.create_input_claim(claim, **kwargs)
+        with stage_timer("esrd", "java"):
+            pricing_response = self.process_claim(claim, pricing_request)
+        with stage_timer("esrd", "output"):
+            esrd_output = EsrdOutput()
+            esrd_output.claim_id = claim.claimid
+            esrd_output.from_java(pricing_response)
         return esrd_output
@@ -15,6 +15,7 @@ from pydrg.helpers.utils import (
     handle_java_exceptions,
 )
 from pydrg.helpers import Zip9Data
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input.claim import Claim
 from pydrg.plugins import apply_client_methods, run_client_load_classes
 from pydrg.pricers.url_loader import UrlLoader
@@ -353,9 +354,12 @@ class FqhcClient:
 
     @handle_java_exceptions
     def process(self, claim: Claim, ioce_output: IoceOutput, **kwargs) -> FqhcOutput:
-        pricing_request = self.create_input_claim(claim, ioce_output, **kwargs)
-        pricing_response = self.dispatch_obj.process(pricing_request)
-        fqhc_output = FqhcOutput()
-        fqhc_output.claim_id = claim.claimid
-        fqhc_output.from_java(pricing_response)
+        with stage_timer("fqhc", "input"):
+            pricing_request = self.create_input_claim(claim, ioce_output, **kwargs)
+        with stage_timer("fqhc", "java"):
+            pricing_response = self.dispatch_obj.process(pricing_request)
+        with stage_timer("fqhc", "output"):
+            fqhc_output = FqhcOutput()
+            fqhc_output.claim_id = claim.claimid
+            fqhc_output.from_java(pricing_response)
         return fqhc_output
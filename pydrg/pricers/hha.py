@@ -1,5 +1,6 @@
 from typing import Optional
 from datetime import datetime
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input import Claim
 from sqlalchemy import Engine
 from logging import Logger, getLogger
@@ -392,10 +393,13 @@ class HhaClient:
         """
         if not isinstance(claim, Claim):
             raise ValueError("claim must be an instance of Claim")
-        pricing_request = self.create_input_claim(claim, hhag_output, **kwargs)
-        pricing_response = self.process_claim(claim, pricing_request)
-        hha_output = HhaOutput()
-        hha_output.claim_id = claim.claimid
-        hha_output.from_java(pricing_response)
-        hha_output.hhrg_code = str(pricing_request.getClaimData().getHhrgInputCode())
+        with stage_timer("hha", "input"):
+            pricing_request = self.create_input_claim(claim, hhag_output, **kwargs)
+        with stage_timer("hha", "java"):
+            pricing_response = self.process_claim(claim, pricing_request)
+        with stage_timer("hha", "output"):
+            hha_output = HhaOutput()
+            hha_output.claim_id = claim.claimid
+            hha_output.from_java(pricing_response)
+            hha_output.hhrg_code = str(pricing_request.getClaimData().getHhrgInputCode())
         return hha_output
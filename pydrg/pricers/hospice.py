@@ -14,6 +14,7 @@ from pydrg.helpers.utils import (
     create_supported_years,
     handle_java_exceptions,
 )
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input.claim import Claim
 from pydrg.plugins import apply_client_methods, run_client_load_classes
 from pydrg.pricers.url_loader import UrlLoader
@@ -409,9 +410,12 @@ class HospiceClient:
 
     @handle_java_exceptions
     def process(self, claim: Claim) -> HospiceOutput:
-        pricing_request = self.create_input_claim(claim)
-        pricing_response = self.dispatch_obj.process(pricing_request)
-        hospice_output = HospiceOutput()
-        hospice_output.claim_id = claim.claimid
-        hospice_output.from_java(pricing_response)
+        with stage_timer("hospice", "input"):
+            pricing_request = self.create_input_claim(claim)
+        with stage_timer("hospice", "java"):
+            pricing_response = self.dispatch_obj.process(pricing_request)
+        with stage_timer("hospice", "output"):
+            hospice_output = HospiceOutput()
+            hospice_output.claim_id = claim.claimid
+            hospice_output.from_java(pricing_response)
         return hospice_output
@@ -14,6 +14,7 @@ from pydrg.helpers.utils import (
     create_supported_years,
     handle_java_exceptions,
 )
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input.claim import Claim
 from pydrg.msdrg.msdrg_output import MsdrgOutput
 from pydrg.plugins import apply_client_methods, run_client_load_classes
@@ -403,9 +404,12 @@ class IpfClient:
         self.logger.debug(
             f"IpfClient processing claim on thread {current_thread().ident}"
         )
-        pricing_request = self.create_input_claim(claim, drg_output, **kwargs)
-        pricing_response = self.process_claim(claim, pricing_request, **kwargs)
-        ipf_output = IpfOutput()
-        ipf_output.claim_id = claim.claimid
-        ipf_output.from_java(pricing_response)
+        with stage_timer("psych", "input"):
+            pricing_request = self.create_input_claim(claim, drg_output, **kwargs)
+        with stage_timer("psych", "java"):
+            pricing_response = self.process_claim(claim, pricing_request, **kwargs)
+        with stage_timer("psych", "output"):
+            ipf_output = IpfOutput()
+            ipf_output.claim_id = claim.claimid
+            ipf_output.from_java(pricing_response)
         return ipf_output
@@ -14,6 +14,7 @@ from pydrg.helpers.utils import (
     create_supported_years,
     handle_java_exceptions,
 )
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input.claim import Claim
 from pydrg.msdrg.msdrg_output import MsdrgOutput
 from pydrg.plugins import apply_client_methods, run_client_load_classes
@@ -883,9 +884,12 @@ class IppsClient:
         self.logger.debug(
             f"IppsClient processing claim on thread {current_thread().ident}"
         )
-        pricing_request = self.create_input_claim(claim, drg_output, **kwargs)
-        pricing_response = self.process_claim(claim, pricing_request, **kwargs)
-        ipps_output = IppsOutput()
-        ipps_output.claim_id = claim.claimid
-        ipps_output.from_java(pricing_response)
+        with stage_timer("ipps", "input"):
+            pricing_request = self.create_input_claim(claim, drg_output, **kwargs)
+        with stage_timer("ipps", "java"):
+            pricing_response = self.process_claim(claim, pricing_request, **kwargs)
+        with stage_timer("ipps", "output"):
+            ipps_output = IppsOutput()
+            ipps_output.claim_id = claim.claimid
+            ipps_output.from_java(pricing_response)
         return ipps_output
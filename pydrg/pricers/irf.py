@@ -13,6 +13,7 @@ from pydrg.helpers.utils import (
     ReturnCode,
     handle_java_exceptions,
 )
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input.claim import Claim
 from pydrg.plugins import apply_client_methods, run_client_load_classes
 from pydrg.pricers.ipsf import IPSFProvider
@@ -332,9 +333,12 @@ class IrfClient:
         """
         if not isinstance(claim, Claim):
             raise ValueError("claim must be an instance of Claim")
-        pricing_request = self.create_input_claim(claim, irfg, **kwargs)
-        pricing_response = self.process_claim(claim, pricing_request)
-        irf_output = IrfOutput()
-        irf_output.claim_id = claim.claimid
-        irf_output.from_java(pricing_response)
+        with stage_timer("irf", "input"):
+            pricing_request = self.create_input_claim(claim, irfg, **kwargs)
+        with stage_timer("irf", "java"):
+            pricing_response = self.process_claim(claim, pricing_request)
+        with stage_timer("irf", "output"):
+            irf_output = IrfOutput()
+            irf_output.claim_id = claim.claimid
+            irf_output.from_java(pricing_response)
         return irf_output
@@ -14,6 +14,7 @@ from pydrg.helpers.utils import (
     create_supported_years,
     handle_java_exceptions,
 )
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input.claim import Claim
 from pydrg.msdrg.msdrg_output import MsdrgOutput
 from pydrg.plugins import apply_client_methods, run_client_load_classes
@@ -338,9 +339,12 @@ class LtchClient:
         self.logger.debug(
             f"LtchClient processing claim on thread {current_thread().ident}"
         )
-        pricing_request = self.create_input_claim(claim, drg_output, **kwargs)
-        pricing_response = self.process_claim(claim, pricing_request, **kwargs)
-        ltch_output = LtchOutput()
-        ltch_output.claim_id = claim.claimid
-        ltch_output.from_java(pricing_response)
+        with stage_timer("ltch", "input"):
+            pricing_request = self.create_input_claim(claim, drg_output, **kwargs)
+        with stage_timer("ltch", "java"):
+            pricing_response = self.process_claim(claim, pricing_request, **kwargs)
+        with stage_timer("ltch", "output"):
+            ltch_output = LtchOutput()
+            ltch_output.claim_id = claim.claimid
+            ltch_output.from_java(pricing_response)
         return ltch_output
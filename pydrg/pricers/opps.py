@@ -14,6 +14,7 @@ from pydrg.helpers.utils import (
     create_supported_years,
     handle_java_exceptions,
 )
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input.claim import Claim
 from pydrg.ioce.ioce_output import IoceOutput
 from pydrg.plugins import apply_client_methods, run_client_load_classes
@@ -294,35 +295,38 @@ class OppsClient:
         self.logger.debug(
             f"OppsClient processing claim on thread {current_thread().ident}"
         )
-        opps_claim_object = self.create_input_claim(claim, ioce_output, **kwargs)
-        pricing_request = self.opps_price_request_class()
-        pricing_request.setClaimData(opps_claim_object)
-        provider_data = self.outpatient_prov_data_class()
+        with stage_timer("opps", "input"):
+            opps_claim_object = self.create_input_claim(claim, ioce_output, **kwargs)
+            pricing_request = self.opps_price_request_class()
+            pricing_request.setClaimData(opps_claim_object)
+            provider_data = self.outpatient_prov_data_class()
 
-        if claim.billing_provider is not None:
-            if isinstance(claim.thru_date, datetime):
-                date_int = int(claim.thru_date.strftime("%Y%m%d"))
-            else:
-                date_int = int(str(claim.thru_date).replace("-", ""))
-            opsf_provider = OPSFProvider()
+            if claim.billing_provider is not None:
+                if isinstance(claim.thru_date, datetime):
+                    date_int = int(claim.thru_date.strftime("%Y%m%d"))
+                else:
+                    date_int = int(str(claim.thru_date).replace("-", ""))
+                opsf_provider = OPSFProvider()
 
-            opsf_provider.from_sqlite(self.db, claim.billing_provider, date_int, **kwargs)
-        elif claim.servicing_provider is not None:
-            if isinstance(claim.thru_date, datetime):
-                date_int = int(claim.thru_date.strftime("%Y%m%d"))
+                opsf_provider.from_sqlite(self.db, claim.billing_provider, date_int, **kwargs)
+            elif claim.servicing_provider is not None:
+                if isinstance(claim.thru_date, datetime):
+                    date_int = int(claim.thru_date.strftime("%Y%m%d"))
+                else:
+                    date_int = int(str(claim.thru_date).replace("-", ""))
+                opsf_provider = OPSFProvider()
+                opsf_provider.from_sqlite(self.db, claim.servicing_provider, date_int, **kwargs)
             else:
-                date_int = int(str(claim.thru_date).replace("-", ""))
-            opsf_provider = OPSFProvider()
-            opsf_provider.from_sqlite(self.db, claim.servicing_provider, date_int, **kwargs)
-        else:
-            raise ValueError(
-                "Either billing or servicing provider must be provided for IPPS pricing."
-            )
-        opsf_provider.set_java_values(provider_data, self)
+                raise ValueError(
+                    "Either billing or servicing provider must be provided for IPPS pricing."
+                )
+            opsf_provider.set_java_values(provider_data, self)
 
-        pricing_request.setProviderData(provider_data)
-        pricing_response = self.dispatch_obj.process(pricing_request)
-        opps_output = OppsOutput()
-        opps_output.claim_id = claim.claimid
-        opps_output.from_java(pricing_response)
+            pricing_request.setProviderData(provider_data)
+        with stage_timer("opps", "java"):
+            pricing_response = self.dispatch_obj.process(pricing_request)
+        with stage_timer("opps", "output"):
+            opps_output = OppsOutput()
+            opps_output.claim_id = claim.claimid
+            opps_output.from_java(pricing_response)
         return opps_output
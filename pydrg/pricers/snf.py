@@ -13,6 +13,7 @@ from pydrg.helpers.utils import (
     ReturnCode,
     handle_java_exceptions,
 )
+from pydrg.helpers.metrics import stage_timer
 from pydrg.input.claim import Claim
 from pydrg.plugins import apply_client_methods, run_client_load_classes
 from pydrg.pricers.ipsf import IPSFProvider
@@ -248,9 +249,12 @@ class SnfClient:
         """
         if not isinstance(claim, Claim):
             raise ValueError("claim must be an instance of Claim")
-        pricing_request = self.create_input_claim(claim, **kwargs)
-        pricing_response = self.process_claim(claim, pricing_request)
-        snf_output = SnfOutput()
-        snf_output.claim_id = claim.claimid
-        snf_output.from_java(pricing_response)
+        with stage_timer("snf", "input"):
+            pricing_request = self.create_input_claim(claim, **kwargs)
+        with stage_timer("snf", "java"):
+            pricing_response = self.process_claim(claim, pricing_request)
+        with stage_timer("snf", "output"):
+            snf_output = SnfOutput()
+            snf_output.claim_id = claim.claimid
+            snf_output.from_java(pricing_response)
         return snf_output
@@ -1,3 +1,6 @@
 from .pypps import Pypps
+from .async_pypps import AsyncPypps
+from .process_pool import PyppsProcessPool
+from .result_cache import ResultCache
 
-__all__ = ["Pypps"]
+__all__ = ["Pypps", "AsyncPypps", "PyppsProcessPool", "ResultCache"]
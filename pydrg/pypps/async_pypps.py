@@ -0,0 +1,138 @@
+import asyncio
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Optional, Union
+
+from pydrg.helpers.utils import attach_jvm_thread
+from pydrg.input.claim import Claim
+from pydrg.pypps.pypps import Pypps, PyppsOutput
+
+
+async def _aiter_claims(
+    claims: Union[AsyncIterable[Claim], Iterable[Claim]],
+) -> AsyncIterator[Claim]:
+    if hasattr(claims, "__aiter__"):
+        async for claim in claims:
+            yield claim
+    else:
+        for claim in claims:
+            yield claim
+
+
+class AsyncPypps:
+    """
+    asyncio front-end for a ``Pypps`` instance.
+
+    Claims are processed on a bounded pool of JVM-attached threads so the
+    JNI round trip never blocks the event loop. At most ``max_concurrency``
+    claims are admitted at a time; callers beyond that wait without
+    occupying a thread.
+
+    Cancelling a coroutine that is waiting for admission or for its result
+    releases its slot immediately. A Java call that is already running cannot
+    be interrupted; it finishes on its worker thread and the result is
+    discarded.
+
+    The MS-DRG and IOCE components are shared by all threads unless their
+    clients are thread-local, so only use ``max_workers`` > 1 with a
+    ``Pypps`` built with ``msdrg_options={"thread_local": True}`` and
+    ``ioce_options={"thread_local": True}``.
+
+    Usage:
+        async with AsyncPypps(pypps, max_workers=8) as apypps:
+            output = await apypps.process(claim)
+            async for output in apypps.process_stream(claim_source()):
+                ...
+    """
+
+    def __init__(
+        self,
+        pypps: Pypps,
+        max_workers: int = 1,
+        max_concurrency: Optional[int] = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.pypps = pypps
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers * 2
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pypps-async",
+            initializer=attach_jvm_thread,
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Shut down the worker threads, dropping claims not yet started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(
+        self, func: Callable[..., PyppsOutput], claim: Claim, **kwargs
+    ) -> PyppsOutput:
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, claim, **kwargs)
+            )
+
+    async def process(self, claim: Claim, **kwargs) -> PyppsOutput:
+        """Process one claim through ``Pypps.process`` without blocking the loop."""
+        return await self._run(self.pypps.process, claim, **kwargs)
+
+    async def process_stream(
+        self,
+        claims: Union[AsyncIterable[Claim], Iterable[Claim]],
+        ordered: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[PyppsOutput]:
+        """
+        Process claims from a sync or async source, yielding outputs.
+
+        Up to ``max_concurrency`` claims are in flight at once. A claim that
+        fails does not stop the stream; its output carries ``error``. Results
+        follow input order when ``ordered`` is True, otherwise completion order.
+        Closing the iterator early cancels the claims still in flight.
+        """
+        in_flight: deque[asyncio.Future[PyppsOutput]] = deque()
+        try:
+            async for claim in _aiter_claims(claims):
+                in_flight.append(
+                    asyncio.ensure_future(
+                        self._run(self.pypps._process_safe, claim, **kwargs)
+                    )
+                )
+                if len(in_flight) >= self.max_concurrency:
+                    if ordered:
+                        yield await in_flight.popleft()
+                    else:
+                        async for output in self._drain_completed(in_flight):
+                            yield output
+            while in_flight:
+                if ordered:
+                    yield await in_flight.popleft()
+                else:
+                    async for output in self._drain_completed(in_flight):
+                        yield output
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    @staticmethod
+    async def _drain_completed(in_flight: deque) -> AsyncIterator[PyppsOutput]:
+        done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            in_flight.remove(task)
+            yield task.result()
@@ -0,0 +1,264 @@
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from typing import Iterable, Iterator, Optional
+
+from pydrg.input.claim import Claim
+from pydrg.pypps.pypps import Pypps, PyppsOutput
+
+# Messages sent from worker processes back to the parent
+_WORKER_READY = "ready"
+_WORKER_FAILED = "failed"
+_CHUNK_DONE = "chunk"
+
+
+def _worker_main(worker_id, pypps_kwargs, warmup_claims, tasks, results):
+    """
+    Entry point of a pool worker process.
+
+    Builds one Pypps (JVM, DatabaseManager and clients) for the life of the
+    process, runs the warm-up claims, then processes chunks of serialized
+    claims until it receives the ``None`` sentinel.
+    """
+    try:
+        pypps = Pypps(**pypps_kwargs)
+        pypps.setup_clients()
+    except Exception as e:
+        results.put((_WORKER_FAILED, worker_id, str(e)))
+        return
+    try:
+        for payload in warmup_claims:
+            pypps._process_safe(Claim.model_validate_json(payload))
+        results.put((_WORKER_READY, worker_id, os.getpid()))
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            chunk_id, payloads, kwargs = task
+            outputs = []
+            for payload in payloads:
+                try:
+                    claim = Claim.model_validate_json(payload)
+                except Exception as e:
+                    outputs.append(
+                        PyppsOutput(
+                            claim_id=_payload_claim_id(payload),
+                            error=f"Invalid claim: {e}",
+                        ).model_dump_json()
+                    )
+                    continue
+                outputs.append(pypps._process_safe(claim, **kwargs).model_dump_json())
+            results.put((_CHUNK_DONE, chunk_id, outputs))
+    finally:
+        pypps.cleanup()
+
+
+def _payload_claim_id(payload: str) -> Optional[str]:
+    """Best-effort ``claimid`` of a serialized claim that failed validation."""
+    try:
+        claim_id = json.loads(payload).get("claimid")
+    except Exception:
+        return None
+    return claim_id if isinstance(claim_id, str) else None
+
+
+class PyppsProcessPool:
+    """
+    Process pool engine running one JVM per worker process.
+
+    JPype allows a single JVM per process and the Python side of claim
+    conversion is bound by the GIL, so throughput beyond a few threads needs
+    several processes. Each worker builds its own ``Pypps`` once from
+    ``pypps_kwargs``, claims travel to the workers in chunks of ``chunk_size``
+    as JSON and come back as serialized ``PyppsOutput``.
+
+    Usage:
+        with PyppsProcessPool(processes=4, chunk_size=64, jar_path="./jars") as pool:
+            for output in pool.process_many(claims):
+                ...
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        chunk_size: int = 64,
+        warmup_claims: Optional[Iterable[Claim]] = None,
+        max_chunks_in_flight: Optional[int] = None,
+        start_timeout: Optional[float] = None,
+        log_level: int = logging.INFO,
+        **pypps_kwargs,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.warmup_claims = [c.model_dump_json() for c in (warmup_claims or [])]
+        self.max_chunks_in_flight = max_chunks_in_flight or self.processes * 2
+        self.start_timeout = start_timeout
+        self.pypps_kwargs = dict(pypps_kwargs, log_level=log_level)
+        self.logger = logging.getLogger("PyppsProcessPool")
+        self.logger.setLevel(log_level)
+
+        # JVMs do not survive fork, always spawn fresh interpreters
+        self._context = multiprocessing.get_context("spawn")
+        self._tasks = None
+        self._results = None
+        self._workers = []
+        self._started = False
+        self._runs = itertools.count()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+        return False
+
+    def start(self):
+        """
+        Start the worker processes and block until every worker has built its
+        clients and processed the warm-up claims.
+        """
+        if self._started:
+            return
+        self._tasks = self._context.Queue()
+        self._results = self._context.Queue()
+        for worker_id in range(self.processes):
+            process = self._context.Process(
+                target=_worker_main,
+                args=(
+                    worker_id,
+                    self.pypps_kwargs,
+                    self.warmup_claims,
+                    self._tasks,
+                    self._results,
+                ),
+                name=f"pypps-worker-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            self._workers.append(process)
+        self._started = True
+
+        deadline = time.monotonic() + self.start_timeout if self.start_timeout else None
+        ready = 0
+        while ready < self.processes:
+            try:
+                kind, worker_id, detail = self._results.get(timeout=1.0)
+            except queue.Empty:
+                dead = [p.name for p in self._workers if not p.is_alive()]
+                if dead or (deadline is not None and time.monotonic() > deadline):
+                    self.shutdown()
+                    reason = f"exited: {dead}" if dead else "timed out"
+                    raise RuntimeError(f"Pypps workers failed to start ({reason})")
+                continue
+            if kind == _WORKER_FAILED:
+                self.shutdown()
+                raise RuntimeError(
+                    f"Pypps worker {worker_id} failed to start: {detail}"
+                )
+            if kind == _WORKER_READY:
+                ready += 1
+                self.logger.debug(f"Pypps worker {worker_id} ready (pid {detail})")
+        self.logger.info(f"Started {self.processes} Pypps worker processes")
+
+    def shutdown(self, timeout: float = 30.0):
+        """Stop the workers; each one runs ``Pypps.cleanup`` before exiting."""
+        if not self._started:
+            return
+        for _ in self._workers:
+            self._tasks.put(None)
+        deadline = time.monotonic() + timeout
+        for process in self._workers:
+            # Keep draining results, a worker cannot exit while its queue
+            # feeder still holds undelivered output
+            while process.is_alive() and time.monotonic() < deadline:
+                self._drain_results()
+                process.join(0.1)
+            if process.is_alive():
+                self.logger.warning(f"Terminating unresponsive worker {process.name}")
+                process.terminate()
+                process.join()
+        self._workers = []
+        self._tasks.close()
+        self._results.close()
+        self._started = False
+
+    def _drain_results(self):
+        try:
+            while True:
+                self._results.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _chunks(self, claims: Iterable[Claim]) -> Iterator[list[str]]:
+        chunk = []
+        for claim in claims:
+            chunk.append(claim.model_dump_json())
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _next_result(self):
+        while True:
+            try:
+                return self._results.get(timeout=1.0)
+            except queue.Empty:
+                dead = [p.name for p in self._workers if not p.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Pypps worker(s) exited unexpectedly: {dead}")
+
+    def process_many(
+        self, claims: Iterable[Claim], ordered: bool = True, **kwargs
+    ) -> Iterator[PyppsOutput]:
+        """
+        Process claims across the worker processes.
+
+        Claims are consumed lazily and at most ``max_chunks_in_flight`` chunks
+        are outstanding or waiting to be yielded at once. Results are yielded in input order when
+        ``ordered`` is True, otherwise chunk by chunk as they complete.
+        """
+        if not self._started:
+            self.start()
+        # Tag chunks with a run id so results left over from an abandoned
+        # earlier call are never mistaken for this call's chunks
+        run_id = next(self._runs)
+        completed = {}
+        in_flight = 0
+        next_to_yield = 0
+
+        def collect_one():
+            kind, chunk_id, outputs = self._next_result()
+            if kind != _CHUNK_DONE or chunk_id[0] != run_id:
+                return 0
+            done_seq = chunk_id[1]
+            completed[done_seq] = [PyppsOutput.model_validate_json(o) for o in outputs]
+            return 1
+
+        def ready_outputs():
+            nonlocal next_to_yield
+            if ordered:
+                while next_to_yield in completed:
+                    yield from completed.pop(next_to_yield)
+                    next_to_yield += 1
+            else:
+                for seq in list(completed):
+                    yield from completed.pop(seq)
+
+        for seq, chunk in enumerate(self._chunks(claims)):
+            self._tasks.put(((run_id, seq), chunk, kwargs))
+            in_flight += 1
+            # Chunks that finished ahead of the next one to yield count too
+            while in_flight + len(completed) >= self.max_chunks_in_flight:
+                in_flight -= collect_one()
+                yield from ready_outputs()
+        while in_flight > 0:
+            in_flight -= collect_one()
+            yield from ready_outputs()
@@ -1,17 +1,21 @@
+import contextvars
 import logging
 import os
-from typing import Optional, Literal
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Optional, Literal, get_args
 import jpype
-from contextlib import ExitStack
-from threading import RLock
+from contextlib import ExitStack, nullcontext
+from threading import Lock, RLock
 from pydantic import BaseModel
 
 from pydrg.database.manager import DatabaseManager
 from pydrg.helpers.cms_downloader import CMSDownloader
 from pydrg.ioce.ioce_client import IoceClient, IoceOutput
+from pydrg.ioce.ioce_output import IoceExtractionProfile
 from pydrg.hhag.hhag_client import HhagClient, HhagOutput
 from pydrg.mce.mce_client import MceClient, MceOutput
-from pydrg.msdrg.drg_client import DrgClient, MsdrgOutput
+from pydrg.msdrg.drg_client import DrgClient, MsdrgExtractionLevel, MsdrgOutput
 from pydrg.pricers.hospice import HospiceClient, HospiceOutput
 from pydrg.pricers.ipf import IpfClient, IpfOutput
 from pydrg.pricers.ipps import IppsClient, IppsOutput
@@ -24,7 +28,9 @@ from pydrg.pricers.fqhc import FqhcClient, FqhcOutput
 from pydrg.pricers.opps import OppsClient, OppsOutput
 from pydrg.irfg.irfg_client import IrfgClient, IrfgOutput
 from pydrg.input.claim import Modules, Claim
-from pydrg.helpers.utils import handle_java_exceptions
+from pydrg.helpers.metrics import CLAIMS_TOTAL, collect_timings, get_registry, stage_timer
+from pydrg.helpers.utils import attach_jvm_thread, handle_java_exceptions
+from pydrg.pypps.result_cache import ResultCache
 
 PRICERS = {
     "Esrd": "esrd-pricer",
@@ -39,7 +45,73 @@ PRICERS = {
     "Snf": "snf-pricer",
 }
 
+# Order in which modules run: Editors -> Groupers -> Pricers
+MODULE_ORDER = [
+    Modules.MCE,
+    Modules.IOCE,
+    Modules.MSDRG,
+    Modules.HHAG,
+    Modules.CMG,
+    Modules.IPPS,
+    Modules.OPPS,
+    Modules.PSYCH,
+    Modules.LTCH,
+    Modules.IRF,
+    Modules.HOSPICE,
+    Modules.SNF,
+    Modules.HHA,
+    Modules.ESRD,
+    Modules.FQHC,
+]
+
+# Upstream module whose output a pricer consumes
+MODULE_DEPENDENCIES = {
+    Modules.IPPS: Modules.MSDRG,
+    Modules.PSYCH: Modules.MSDRG,
+    Modules.LTCH: Modules.MSDRG,
+    Modules.OPPS: Modules.IOCE,
+    Modules.FQHC: Modules.IOCE,
+    Modules.IRF: Modules.CMG,
+    Modules.HHA: Modules.HHAG,
+}
+
+# Module -> (client attribute, PyppsOutput attribute, name used in errors)
+MODULE_CLIENTS = {
+    Modules.MCE: ("mce_client", "mce", "MCE"),
+    Modules.IOCE: ("ioce_client", "ioce", "IOCE"),
+    Modules.MSDRG: ("drg_client", "msdrg", "DRG"),
+    Modules.HHAG: ("hhag_client", "hhag", "HHAG"),
+    Modules.CMG: ("irfg_client", "cmg", "IRFG"),
+    Modules.IPPS: ("ipps_client", "ipps", "IPPS"),
+    Modules.OPPS: ("opps_client", "opps", "OPPS"),
+    Modules.PSYCH: ("ipf_client", "psych", "IPF"),
+    Modules.LTCH: ("ltch_client", "ltch", "LTCH"),
+    Modules.IRF: ("irf_client", "irf", "IRF"),
+    Modules.HOSPICE: ("hospice_client", "hospice", "Hospice"),
+    Modules.SNF: ("snf_client", "snf", "SNF"),
+    Modules.HHA: ("hha_client", "hha", "HHA"),
+    Modules.ESRD: ("esrd_client", "esrd", "ESRD"),
+    Modules.FQHC: ("fqhc_client", "fqhc", "FQHC"),
+}
+
+
+# Pricer modules -> key in PRICERS
+MODULE_PRICERS = {
+    Modules.IPPS: "Ipps",
+    Modules.OPPS: "Opps",
+    Modules.PSYCH: "Ipf",
+    Modules.LTCH: "Ltch",
+    Modules.IRF: "Irf",
+    Modules.HOSPICE: "Hospice",
+    Modules.SNF: "Snf",
+    Modules.HHA: "Hha",
+    Modules.ESRD: "Esrd",
+    Modules.FQHC: "Fqhc",
+}
+
+
 class PyppsOutput(BaseModel):
+    claim_id: Optional[str] = None
     #Editors
     ioce: Optional[IoceOutput] = None
     mce: Optional[MceOutput] = None
@@ -59,6 +131,8 @@ class PyppsOutput(BaseModel):
     esrd: Optional[EsrdOutput] = None
     fqhc: Optional[FqhcOutput] = None
     error: Optional[str] = None
+    # {module: {stage: seconds}}, only filled when Pypps(record_timings=True)
+    timings: Optional[dict[str, dict[str, float]]] = None
 
 
 class Pypps:
@@ -75,18 +149,59 @@ class Pypps:
         log_level: int = logging.INFO,
         extra_classpaths: list[str] = [],
         db_backend: Literal["sqlite", "postgresql"] = "sqlite",
+        module_workers: int = 1,
+        lazy_clients: bool = False,
+        modules: Optional[Iterable[Modules]] = None,
+        record_timings: bool = False,
+        result_cache: Optional[ResultCache] = None,
+        msdrg_options: Optional[dict] = None,
+        ioce_options: Optional[dict] = None,
     ):
+        """
+        module_workers: when greater than 1, independent modules of a single
+            claim (e.g. MSDRG->IPPS and IOCE->OPPS) run concurrently on a pool
+            of this many threads instead of one after another.
+        lazy_clients: build each client the first time a claim requests its
+            module instead of building every client in ``setup_clients``.
+        modules: allow-list of modules whose clients ``setup_clients`` builds
+            up front. Other clients are only built if ``lazy_clients`` is set.
+        record_timings: attach per-stage timings (input, java, output and
+            the total per module) to every ``PyppsOutput.timings``. Stage
+            latencies are always recorded in ``pydrg.helpers.metrics``.
+        result_cache: reuse module outputs for claims whose relevant fields
+            were already processed. The cache is invalidated when the JARs or
+            the database under ``jar_path``/``db_path`` change.
+        msdrg_options: keyword arguments for ``DrgClient``, e.g.
+            ``{"max_versions": 4, "preload": ["421", "430"],
+            "extraction_level": "summary"}``.
+        ioce_options: keyword arguments for ``IoceClient``, e.g.
+            ``{"description_store": "./data/ioce_descriptions.db"}``.
+        """
         # Store configuration
         self.extra_classpaths = extra_classpaths or []
         self.jar_path = jar_path
         self.db_path = db_path
         self.build_jar_dirs = build_jar_dirs
         self.build_db = build_db
+        self.lazy_clients = lazy_clients
+        self.modules = list(modules) if modules is not None else None
+        self.record_timings = record_timings
+        self.result_cache = result_cache
+        self.msdrg_options = dict(msdrg_options or {})
+        self.ioce_options = dict(ioce_options or {})
+        self.pricer_jars: Optional[list[str]] = None
+        self._client_locks = {module: Lock() for module in MODULE_CLIENTS}
+        self._unavailable_clients: set[Modules] = set()
 
         # Initialize resource management
         self._exit_stack = ExitStack()
         self._initialized = False
 
+        # Editor and Grouper Clients
+        self.drg_client: Optional[DrgClient] = None
+        self.mce_client: Optional[MceClient] = None
+        self.ioce_client: Optional[IoceClient] = None
+        self.hhag_client: Optional[HhagClient] = None
         # Pricer Clients @TODO: Add more pricer clients as needed
         self.ipps_client: Optional[IppsClient] = None
         self.opps_client: Optional[OppsClient] = None
@@ -123,6 +238,36 @@ class Pypps:
         # Setup JVM with thread safety
         self._setup_jvm()
 
+        if self.result_cache is not None:
+            self.result_cache.watch(
+                self.jar_path,
+                self.db_path,
+                settings={
+                    "msdrg_extraction_level": MsdrgExtractionLevel(
+                        self.msdrg_options.get("extraction_level", "full")
+                    ).value,
+                    "ioce_extraction_profile": IoceExtractionProfile(
+                        self.ioce_options.get("extraction_profile", "full")
+                    ).value,
+                    # Lazy outputs are cached without their descriptions
+                    "ioce_lazy_descriptions": bool(
+                        self.ioce_options.get("lazy_descriptions", False)
+                    ),
+                },
+            )
+
+        # Optional pool for running independent modules of a claim concurrently
+        self._module_executor: Optional[ThreadPoolExecutor] = None
+        if module_workers > 1:
+            self._module_executor = ThreadPoolExecutor(
+                max_workers=module_workers,
+                thread_name_prefix="pypps-module",
+                initializer=attach_jvm_thread,
+            )
+            self._exit_stack.callback(self._module_executor.shutdown, wait=True)
+        # Stop threads owned by the clients before the JVM shuts down
+        self._exit_stack.callback(self._close_clients)
+
     def __enter__(self):
         """Context manager entry"""
         if not self._initialized:
@@ -139,6 +284,10 @@ class Pypps:
         """Comprehensive cleanup of all resources"""
         self._exit_stack.close()
 
+    def _close_clients(self):
+        if self.drg_client is not None:
+            self.drg_client.close()
+
     def _ensure_directories(self):
         """Ensure required directories exist"""
         if not os.path.exists(self.jar_path):
@@ -177,148 +326,394 @@ class Pypps:
 
 
     def setup_clients(self):
-        """Initialize the CMS clients."""
-        self.drg_client = DrgClient()
-        self.mce_client = MceClient()
-        self.ioce_client = IoceClient()
-        self.hhag_client = HhagClient()
-        self.irfg_client = IrfgClient()
+        """
+        Initialize the CMS clients.
+
+        By default every client is built. With an allow-list of ``modules`` only
+        those clients are built, and with ``lazy_clients`` the remaining clients
+        are built the first time a claim asks for their module.
+        """
+        self._discover_pricer_jars()
+        if self.modules is None and not self.lazy_clients:
+            self.drg_client = DrgClient(**self.msdrg_options)
+            self.mce_client = MceClient()
+            self.ioce_client = IoceClient(**self.ioce_options)
+            self.hhag_client = HhagClient()
+            self.irfg_client = IrfgClient()
+            if self.pricer_jars:
+                self.setup_pricers()
+            return
+        for module in self.modules or []:
+            self.get_client(module, build=True)
+
+    def _discover_pricer_jars(self):
         # check for pricer sub directory
-        if os.path.exists(os.path.join(self.jar_path, "pricers")):
-            self.pricers_path = os.path.abspath(os.path.join(self.jar_path, "pricers"))
+        self.pricers_path = os.path.abspath(os.path.join(self.jar_path, "pricers"))
+        self.pricer_jars = []
+        if os.path.exists(self.pricers_path):
             self.pricer_jars = [
                 os.path.join(self.pricers_path, f)
                 for f in os.listdir(self.pricers_path)
                 if f.endswith(".jar")
             ]
-        if self.pricer_jars:
-            self.setup_pricers()
 
     def setup_pricers(self):
         # check if pricer jars exist by looking for value from PRICERS dictionary in file names of pricer_jars
-        for pricer, jar_name in PRICERS.items():
-            if any(jar_name in jar for jar in self.pricer_jars):
-                try:
-                    jar_path = os.path.abspath(
-                        next(jar for jar in self.pricer_jars if jar_name in jar)
-                    )
-                    setattr(
-                        self,
-                        f"{pricer.lower()}_client",
-                        globals()[f"{pricer}Client"](
-                            jar_path, self.db_manager.engine, self.logger
-                        ),
-                    )
-                except KeyError:
-                    self.logger.warning(
-                        f"Client for {pricer} not found. This is a warning only, a client for {pricer} may not be implemented yet."
-                    )
-            else:
+        for pricer in PRICERS:
+            self.setup_pricer(pricer)
+
+    def setup_pricer(self, pricer: str):
+        """Build the client for one pricer (a key of ``PRICERS``) if its JAR is present."""
+        jar_name = PRICERS[pricer]
+        if any(jar_name in jar for jar in self.pricer_jars):
+            try:
+                jar_path = os.path.abspath(
+                    next(jar for jar in self.pricer_jars if jar_name in jar)
+                )
+                setattr(
+                    self,
+                    f"{pricer.lower()}_client",
+                    globals()[f"{pricer}Client"](
+                        jar_path, self.db_manager.engine, self.logger
+                    ),
+                )
+            except KeyError:
                 self.logger.warning(
-                    f"{pricer} pricer JAR not found in {self.pricers_path}. Please ensure it is downloaded."
+                    f"Client for {pricer} not found. This is a warning only, a client for {pricer} may not be implemented yet."
                 )
-    
+        else:
+            self.logger.warning(
+                f"{pricer} pricer JAR not found in {self.pricers_path}. Please ensure it is downloaded."
+            )
+
+    def get_client(self, module: Modules, build: Optional[bool] = None):
+        """
+        Return the client for ``module``, or None if it is not available.
+
+        When ``build`` is True (default: ``lazy_clients``) a missing client is
+        constructed on first request. Construction is guarded per module so
+        concurrent claims build each client only once.
+        """
+        client_attr = MODULE_CLIENTS[module][0]
+        client = getattr(self, client_attr, None)
+        if build is None:
+            build = self.lazy_clients
+        if client is not None or not build:
+            return client
+        with self._client_locks[module]:
+            client = getattr(self, client_attr, None)
+            if client is None and module not in self._unavailable_clients:
+                self.logger.debug(f"Building client for {module.value}")
+                self._build_client(module)
+                client = getattr(self, client_attr, None)
+                if client is None:
+                    # e.g. pricer JAR missing, don't retry for every claim
+                    self._unavailable_clients.add(module)
+        return client
+
+    def _build_client(self, module: Modules):
+        match module:
+            case Modules.MCE:
+                self.mce_client = MceClient()
+            case Modules.IOCE:
+                self.ioce_client = IoceClient(**self.ioce_options)
+            case Modules.MSDRG:
+                self.drg_client = DrgClient(**self.msdrg_options)
+            case Modules.HHAG:
+                self.hhag_client = HhagClient()
+            case Modules.CMG:
+                self.irfg_client = IrfgClient()
+            case _:
+                if self.pricer_jars is None:
+                    self._discover_pricer_jars()
+                self.setup_pricer(MODULE_PRICERS[module])
+
     @handle_java_exceptions
-    def process(self, claim:Claim, **kwargs) ->PyppsOutput:
-        """Process a claim through the appropriate modules based on its configuration."""
+    def process(
+        self,
+        claim: Claim,
+        ioce_profile: Optional[IoceExtractionProfile | str] = None,
+        keep_ioce: bool = True,
+        **kwargs,
+    ) -> PyppsOutput:
+        """
+        Process a claim through the appropriate modules based on its configuration.
+
+        ``ioce_profile`` chooses how much of the IOCE output is extracted for
+        this claim (default: the IoceClient's ``extraction_profile``). With
+        ``keep_ioce=False`` the IOCE output only feeds the OPPS and FQHC
+        pricers and is left off the result, so the slim ``pricing`` profile
+        is used unless ``ioce_profile`` says otherwise.
+        """
 
         if not isinstance(claim, Claim):
             raise ValueError("Input must be an instance of Claim")
         #Validate the claim
         Claim.model_validate(claim)
 
-        results = PyppsOutput()
+        if ioce_profile is not None:
+            ioce_profile = IoceExtractionProfile(ioce_profile)
+        elif not keep_ioce:
+            ioce_profile = IoceExtractionProfile.PRICING
+
+        results = PyppsOutput(claim_id=claim.claimid)
         if len(claim.modules) == 0:
             results.error = "No modules specified in claim"
             return results
         #Claims Flow Editors -> Groupers -> Pricers
-        #Create unique list of modules preserving order
-        unique_modules = []
-        for module in claim.modules:
-            if module not in unique_modules:
-                unique_modules.append(module)
-        #Editors
-        if Modules.MCE in unique_modules:
-            if self.mce_client is None:
-                results.error = "MCE client not initialized"
-                return results
-            results.mce = self.mce_client.process(claim)
-        if Modules.IOCE in unique_modules:
-            if self.ioce_client is None:
-                results.error = "IOCE client not initialized"
-                return results
-            results.ioce = self.ioce_client.process(claim)
-        #Groupers
-        if Modules.MSDRG in unique_modules:
-            if self.drg_client is None:
-                results.error = "DRG client not initialized"
-                return results
-            results.msdrg = self.drg_client.process(claim, icd_converter=self.icd10_converter)
-        if Modules.HHAG in unique_modules:
-            if self.hhag_client is None:
-                results.error = "HHAG client not initialized"
-                return results
-            results.hhag = self.hhag_client.process(claim)
-        if Modules.CMG in unique_modules:
-            if self.irfg_client is None:
-                results.error = "IRFG client not initialized"
-                return results
-            results.cmg = self.irfg_client.process(claim)
-        #Pricers
-        if Modules.IPPS in unique_modules:
-            if self.ipps_client is None:
-                results.error = "IPPS client not initialized"
-                return results
-            else:
+        modules = [module for module in MODULE_ORDER if module in claim.modules]
+        #A module that cannot run ends the flow; the modules ahead of it still run
+        runnable = []
+        for module in modules:
+            error = self._module_unavailable(module, modules)
+            if error is not None:
+                results.error = error
+                break
+            runnable.append(module)
+
+        registry = get_registry()
+        with collect_timings() if self.record_timings else nullcontext() as timings:
+            try:
+                with stage_timer("pypps", "claim"):
+                    if self._module_executor is not None and len(runnable) > 1:
+                        self._run_module_graph(
+                            runnable, claim, results, ioce_profile, **kwargs
+                        )
+                    else:
+                        for module in runnable:
+                            self._run_module(
+                                module, claim, results, ioce_profile, **kwargs
+                            )
+            except Exception:
+                registry.inc(CLAIMS_TOTAL, status="error")
+                raise
+        results.timings = timings
+        if not keep_ioce:
+            results.ioce = None
+        registry.inc(CLAIMS_TOTAL, status="error" if results.error else "ok")
+        return results
+
+    def _module_unavailable(self, module: Modules, modules: list[Modules]) -> Optional[str]:
+        """Return the error that stops ``module`` from running, if any."""
+        label = MODULE_CLIENTS[module][2]
+        if self.get_client(module) is None:
+            return f"{label} client not initialized"
+        if module == Modules.FQHC and Modules.IOCE not in modules:
+            return "FQHC pricer requires IOCE module to be run"
+        return None
+
+    def _run_module(
+        self,
+        module: Modules,
+        claim: Claim,
+        results: PyppsOutput,
+        ioce_profile: Optional[IoceExtractionProfile] = None,
+        **kwargs,
+    ):
+        """Run a single module, storing its output on ``results``."""
+        with stage_timer(module.value.lower(), "total"):
+            if self.result_cache is None or not self.result_cache.caches(module):
+                self._dispatch_module(module, claim, results, ioce_profile, **kwargs)
+                return
+            result_attr = MODULE_CLIENTS[module][1]
+            upstream = MODULE_DEPENDENCIES.get(module)
+            options = kwargs
+            if module == Modules.IOCE and ioce_profile is not None:
+                options = dict(kwargs, ioce_profile=ioce_profile.value)
+            key = self.result_cache.key(
+                module,
+                claim,
+                getattr(results, MODULE_CLIENTS[upstream][1]) if upstream else None,
+                options,
+            )
+            output_class = PyppsOutput.model_fields[result_attr].annotation
+            cached = self.result_cache.get(module, key, get_args(output_class)[0])
+            if cached is not None:
+                if "claim_id" in type(cached).model_fields:
+                    setattr(cached, "claim_id", claim.claimid)
+                if isinstance(cached, IoceOutput):
+                    cached = self._defer_ioce_descriptions(cached, ioce_profile)
+                setattr(results, result_attr, cached)
+                return
+            self._dispatch_module(module, claim, results, ioce_profile, **kwargs)
+            output = getattr(results, result_attr)
+            if output is not None:
+                self.result_cache.put(module, key, output)
+
+    def _defer_ioce_descriptions(
+        self, output: IoceOutput, profile: Optional[IoceExtractionProfile]
+    ) -> IoceOutput:
+        """Bind the lazy descriptions a cached IOCE output was stored without."""
+        client = self.ioce_client
+        if client is None or not client.lazy_descriptions:
+            return output
+        if IoceExtractionProfile(profile or client.extraction_profile) is not IoceExtractionProfile.FULL:
+            return output
+        return client.append_descriptions(output, lazy=True)
+
+    def _dispatch_module(
+        self,
+        module: Modules,
+        claim: Claim,
+        results: PyppsOutput,
+        ioce_profile: Optional[IoceExtractionProfile] = None,
+        **kwargs,
+    ):
+        match module:
+            #Editors
+            case Modules.MCE:
+                results.mce = self.mce_client.process(claim)
+            case Modules.IOCE:
+                results.ioce = self.ioce_client.process(claim, profile=ioce_profile)
+            #Groupers
+            case Modules.MSDRG:
+                results.msdrg = self.drg_client.process(claim, icd_converter=self.icd10_converter)
+            case Modules.HHAG:
+                results.hhag = self.hhag_client.process(claim)
+            case Modules.CMG:
+                results.cmg = self.irfg_client.process(claim)
+            #Pricers
+            case Modules.IPPS:
                 results.ipps = self.ipps_client.process(claim, results.msdrg, **kwargs)
-        if Modules.OPPS in unique_modules:
-            if self.opps_client is None:
-                results.error = "OPPS client not initialized"
-                return results
-            results.opps = self.opps_client.process(claim, results.ioce, **kwargs)
-        if Modules.PSYCH in unique_modules:
-            if self.ipf_client is None:
-                results.error = "IPF client not initialized"
-                return results
-            results.psych = self.ipf_client.process(claim, results.msdrg, **kwargs)
-        if Modules.LTCH in unique_modules:
-            if self.ltch_client is None:
-                results.error = "LTCH client not initialized"
-                return results
-            results.ltch = self.ltch_client.process(claim, results.msdrg, **kwargs)
-        if Modules.IRF in unique_modules:
-            if self.irf_client is None:
-                results.error = "IRF client not initialized"
-                return results
-            results.irf = self.irf_client.process(claim, results.cmg, **kwargs)
-        if Modules.HOSPICE in unique_modules:
-            if self.hospice_client is None:
-                results.error = "Hospice client not initialized"
-                return results
-            results.hospice = self.hospice_client.process(claim)
-        if Modules.SNF in unique_modules:
-            if self.snf_client is None:
-                results.error = "SNF client not initialized"
-                return results
-            results.snf = self.snf_client.process(claim, **kwargs)
-        if Modules.HHA in unique_modules:
-            if self.hha_client is None:
-                results.error = "HHA client not initialized"
-                return results
-            results.hha = self.hha_client.process(claim, results.hhag, **kwargs)
-        if Modules.ESRD in unique_modules:
-            if self.esrd_client is None:
-                results.error = "ESRD client not initialized"
-                return results
-            results.esrd = self.esrd_client.process(claim, **kwargs)
-        if Modules.FQHC in unique_modules:
-            if self.fqhc_client is None:
-                results.error = "FQHC client not initialized"
-                return results
-            if results.ioce is None:
-                results.error = "FQHC pricer requires IOCE module to be run"
-                return results
-            else:
+            case Modules.OPPS:
+                results.opps = self.opps_client.process(claim, results.ioce, **kwargs)
+            case Modules.PSYCH:
+                results.psych = self.ipf_client.process(claim, results.msdrg, **kwargs)
+            case Modules.LTCH:
+                results.ltch = self.ltch_client.process(claim, results.msdrg, **kwargs)
+            case Modules.IRF:
+                results.irf = self.irf_client.process(claim, results.cmg, **kwargs)
+            case Modules.HOSPICE:
+                results.hospice = self.hospice_client.process(claim)
+            case Modules.SNF:
+                results.snf = self.snf_client.process(claim, **kwargs)
+            case Modules.HHA:
+                results.hha = self.hha_client.process(claim, results.hhag, **kwargs)
+            case Modules.ESRD:
+                results.esrd = self.esrd_client.process(claim, **kwargs)
+            case Modules.FQHC:
                 results.fqhc = self.fqhc_client.process(claim, results.ioce)
-        return results
 
+    def _run_module_graph(
+        self,
+        modules: list[Modules],
+        claim: Claim,
+        results: PyppsOutput,
+        ioce_profile: Optional[IoceExtractionProfile] = None,
+        **kwargs,
+    ):
+        """
+        Run the modules of one claim concurrently along the dependency graph.
+
+        Every module whose upstream is not part of this claim starts right away;
+        a pricer is submitted once its upstream module has finished. Tasks never
+        block waiting on each other, so the shared executor cannot deadlock when
+        many claims are processed at once. If several modules fail, the error of
+        the module that comes first in ``MODULE_ORDER`` is raised, matching the
+        sequential flow.
+        """
+        downstream = {module: [] for module in modules}
+        roots = []
+        for module in modules:
+            upstream = MODULE_DEPENDENCIES.get(module)
+            if upstream in downstream:
+                downstream[upstream].append(module)
+            else:
+                roots.append(module)
+
+        def run(module):
+            self._run_module(module, claim, results, ioce_profile, **kwargs)
+            return [(child, submit(child)) for child in downstream[module]]
+
+        def submit(module):
+            # Run in a copy of the caller's context so stage timings reach
+            # the claim that is collecting them
+            context = contextvars.copy_context()
+            return self._module_executor.submit(context.run, run, module)
+
+        errors = {}
+        pending = [(module, submit(module)) for module in roots]
+        while pending:
+            module, future = pending.pop()
+            try:
+                pending.extend(future.result())
+            except Exception as e:
+                errors[module] = e
+        if errors:
+            first = min(errors, key=MODULE_ORDER.index)
+            raise errors[first]
+
+    def _process_safe(self, claim: Claim, **kwargs) -> PyppsOutput:
+        """Process a claim, reporting any failure on the output instead of raising."""
+        try:
+            return self.process(claim, **kwargs)
+        except Exception as e:
+            claim_id = getattr(claim, "claimid", None)
+            self.logger.debug(f"Error processing claim {claim_id}: {e}")
+            return PyppsOutput(claim_id=claim_id, error=str(e))
+
+    def process_many(
+        self,
+        claims: Iterable[Claim],
+        workers: int = 1,
+        ordered: bool = True,
+        max_in_flight: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[PyppsOutput]:
+        """
+        Process many claims concurrently on a pool of JVM-attached threads.
+
+        Claims are pulled from ``claims`` lazily, with at most ``max_in_flight``
+        (default ``2 * workers``) submitted at a time, so arbitrarily large
+        iterables are processed in bounded memory. Results are yielded in input
+        order when ``ordered`` is True, otherwise as soon as each claim finishes.
+        A claim that fails does not stop the batch; its output carries the
+        failure in ``PyppsOutput.error`` and ``claim_id`` identifies the claim.
+
+        The MS-DRG and IOCE components are shared by all threads unless their
+        clients are thread-local, so only use ``workers`` > 1 with
+        ``msdrg_options={"thread_local": True}`` and
+        ``ioce_options={"thread_local": True}``.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if workers == 1:
+            for claim in claims:
+                yield self._process_safe(claim, **kwargs)
+            return
+        window = max_in_flight or workers * 2
+        if window < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="pypps",
+            initializer=attach_jvm_thread,
+        )
+        try:
+            claim_iter = iter(claims)
+            if ordered:
+                in_flight: deque[Future[PyppsOutput]] = deque()
+                for claim in claim_iter:
+                    in_flight.append(
+                        executor.submit(self._process_safe, claim, **kwargs)
+                    )
+                    if len(in_flight) >= window:
+                        yield in_flight.popleft().result()
+                while in_flight:
+                    yield in_flight.popleft().result()
+            else:
+                pending = set()
+                for claim in claim_iter:
+                    pending.add(executor.submit(self._process_safe, claim, **kwargs))
+                    if len(pending) >= window:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+        finally:
+            # Drop queued work if the caller stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,339 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from pydrg.helpers.metrics import get_registry
+from pydrg.helpers.utils import fingerprint_paths
+from pydrg.input.claim import Claim, Modules
+
+CACHE_REQUESTS = "pydrg_cache_requests_total"
+
+# Claim fields each module reads when building its Java input. Fields not
+# listed here (charges, claim id, other modules' data) never affect the key.
+MODULE_CACHE_FIELDS: Dict[Modules, Tuple[str, ...]] = {
+    Modules.MSDRG: (
+        "principal_dx",
+        "admit_dx",
+        "secondary_dxs",
+        "inpatient_pxs",
+        "patient.age",
+        "patient.sex",
+        "patient.date_of_birth",
+        "patient_status",
+        "los",
+        "from_date",
+        "thru_date",
+        "icd_convert",
+    ),
+    Modules.MCE: (
+        "principal_dx",
+        "admit_dx",
+        "secondary_dxs",
+        "inpatient_pxs",
+        "patient.age",
+        "patient.sex",
+        "patient_status",
+        "los",
+        "from_date",
+        "thru_date",
+    ),
+    Modules.IOCE: (
+        "bill_type",
+        "billing_provider.npi",
+        "billing_provider.other_id",
+        "cond_codes",
+        "value_codes",
+        "occurrence_codes",
+        "from_date",
+        "thru_date",
+        "receipt_date",
+        "lines",
+        "opps_flag",
+        "patient.age",
+        "patient.sex",
+        "patient_status",
+        "principal_dx",
+        "secondary_dxs",
+    ),
+    Modules.HHAG: (
+        "admit_date",
+        "from_date",
+        "thru_date",
+        "oasis_assessment",
+        "occurrence_codes",
+        "principal_dx",
+        "secondary_dxs",
+    ),
+    Modules.CMG: (
+        "admit_date",
+        "thru_date",
+        "irf_pai",
+        "patient.date_of_birth",
+        "principal_dx",
+        "secondary_dxs",
+    ),
+}
+
+
+def _field_value(claim: Claim, path: str) -> Any:
+    value: Any = claim
+    for part in path.split("."):
+        if value is None:
+            return None
+        value = getattr(value, part)
+    return value
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+class ResultCache:
+    """
+    Cache of module outputs keyed by the claim fields each module reads.
+
+    Resubmissions and adjustments that only change fields a module does not
+    read (charges, claim id, ...) reuse the cached output instead of calling
+    Java again. Results live in a bounded in-memory LRU and, when
+    ``sqlite_path`` is given, in an on-disk SQLite tier that survives
+    restarts. Every key includes a fingerprint of the JARs and database in use,
+    so upgrading either invalidates the cache.
+
+    Only editors and groupers are cached by default; pass ``fields`` to cache
+    other modules (a pricer's key also covers its upstream module's output).
+
+    Usage:
+        cache = ResultCache(max_entries=100_000, sqlite_path="./data/cache.db")
+        pypps = Pypps(result_cache=cache)
+        ...
+        print(cache.stats())
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        sqlite_path: Optional[str] = None,
+        modules: Optional[Iterable[Modules]] = None,
+        fields: Optional[Dict[Modules, Tuple[str, ...]]] = None,
+        data_version: str = "",
+    ):
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        self.max_entries = max_entries
+        self.sqlite_path = sqlite_path
+        self.fields = dict(MODULE_CACHE_FIELDS)
+        if fields:
+            self.fields.update(fields)
+        self.modules = set(modules) if modules is not None else set(self.fields)
+        unknown = self.modules - set(self.fields)
+        if unknown:
+            names = sorted(m.value for m in unknown)
+            raise ValueError(f"No cache key fields defined for modules: {names}")
+        self.data_version = data_version
+        self.fingerprint = data_version
+        self.logger = logging.getLogger("ResultCache")
+
+        self._entries: "OrderedDict[Tuple[Modules, str], str]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = {module: 0 for module in self.modules}
+        self._misses = {module: 0 for module in self.modules}
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = Lock()
+        if sqlite_path is not None:
+            self._open_db(sqlite_path)
+
+    def __getstate__(self):
+        # Worker processes (PyppsProcessPool) get an empty memory tier and
+        # their own connection to the shared SQLite tier
+        return {
+            "max_entries": self.max_entries,
+            "sqlite_path": self.sqlite_path,
+            "modules": self.modules,
+            "fields": self.fields,
+            "data_version": self.data_version,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _open_db(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "module TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (module, key))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._db.commit()
+
+    def watch(self, *paths: str, settings: Optional[Dict[str, Any]] = None):
+        """
+        Fingerprint the JAR directories and database files a Pypps instance
+        uses, plus any ``settings`` that change module outputs (such as the
+        MS-DRG extraction level). If they changed since the cache was last
+        used, every cached result is dropped.
+        """
+        fingerprint = fingerprint_paths(paths) + self.data_version
+        if settings:
+            fingerprint += json.dumps(settings, sort_keys=True, default=str)
+        with self._lock:
+            changed = fingerprint != self.fingerprint
+            self.fingerprint = fingerprint
+            if changed:
+                self._entries.clear()
+        if self._db is not None:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT value FROM meta WHERE name = 'fingerprint'"
+                ).fetchone()
+                if row is None or row[0] != fingerprint:
+                    if row is not None:
+                        self.logger.info("JARs or data changed, clearing result cache")
+                    self._db.execute("DELETE FROM results")
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO meta (name, value) VALUES ('fingerprint', ?)",
+                        (fingerprint,),
+                    )
+                    self._db.commit()
+
+    def caches(self, module: Modules) -> bool:
+        return module in self.modules
+
+    def key(
+        self,
+        module: Modules,
+        claim: Claim,
+        upstream: Optional[BaseModel] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Stable hash of the claim fields ``module`` reads, the upstream module's
+        output (for pricers) and any per-call options.
+        """
+        selected = {
+            path: _jsonable(_field_value(claim, path)) for path in self.fields[module]
+        }
+        if upstream is not None:
+            selected["__upstream__"] = upstream.model_dump(mode="json")
+        if options:
+            selected["__options__"] = {k: _jsonable(v) for k, v in options.items()}
+        payload = json.dumps(
+            selected, sort_keys=True, default=str, separators=(",", ":")
+        )
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(self.fingerprint.encode())
+        digest.update(payload.encode())
+        return digest.hexdigest()
+
+    def get(
+        self, module: Modules, key: str, output_class: Type[BaseModel]
+    ) -> Optional[BaseModel]:
+        """Return the cached output for ``key`` or None, counting the hit or miss."""
+        with self._lock:
+            value = self._entries.get((module, key))
+            if value is not None:
+                self._entries.move_to_end((module, key))
+        if value is None and self._db is not None:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT value FROM results WHERE module = ? AND key = ?",
+                    (module.value, key),
+                ).fetchone()
+            if row is not None:
+                value = row[0]
+                self._remember(module, key, value)
+        with self._lock:
+            if value is None:
+                self._misses[module] += 1
+            else:
+                self._hits[module] += 1
+        get_registry().inc(
+            CACHE_REQUESTS,
+            module=module.value.lower(),
+            result="miss" if value is None else "hit",
+        )
+        if value is None:
+            return None
+        return output_class.model_validate_json(value)
+
+    def put(self, module: Modules, key: str, output: BaseModel):
+        """
+        Store ``output`` under ``key``. Lazy IOCE descriptions are left out
+        rather than looked up; ``Pypps`` defers them again on a hit.
+        """
+        value = output.model_dump_json(context={"defer_descriptions": True})
+        self._remember(module, key, value)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (module, key, value) VALUES (?, ?, ?)",
+                    (module.value, key, value),
+                )
+                self._db.commit()
+
+    def _remember(self, module: Modules, key: str, value: str):
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[(module, key)] = value
+            self._entries.move_to_end((module, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, module: Optional[Modules] = None):
+        """Drop cached results for ``module``, or for every module."""
+        with self._lock:
+            if module is None:
+                self._entries.clear()
+            else:
+                for entry in [k for k in self._entries if k[0] == module]:
+                    del self._entries[entry]
+        if self._db is not None:
+            with self._db_lock:
+                if module is None:
+                    self._db.execute("DELETE FROM results")
+                else:
+                    self._db.execute(
+                        "DELETE FROM results WHERE module = ?", (module.value,)
+                    )
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hits, misses and hit rate per module."""
+        with self._lock:
+            stats = {}
+            for module in sorted(self.modules, key=lambda m: m.value):
+                hits, misses = self._hits[module], self._misses[module]
+                total = hits + misses
+                stats[module.value] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": hits / total if total else 0.0,
+                }
+            stats["entries"] = {"memory": len(self._entries)}
+        return stats
+
+    def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
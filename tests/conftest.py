@@ -0,0 +1,121 @@
+import os
+from unittest.mock import MagicMock
+
+import jpype
+import pytest
+
+from pydrg.ioce.ioce_client import IoceClient
+from pydrg.msdrg.drg_client import DrgClient
+from pydrg.pypps import Pypps
+
+
+def project_root_dir():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def jars_dir():
+    return os.path.join(project_root_dir(), "jars")
+
+
+def pricers_dir():
+    return os.path.join(jars_dir(), "pricers")
+
+
+def _file_exists(dir_path, name_substring):
+    if not os.path.exists(dir_path):
+        return False
+    try:
+        for f in os.listdir(dir_path):
+            if f.endswith(".jar") and name_substring in f:
+                return True
+    except Exception:
+        return False
+    return False
+
+
+def base_jars_present():
+    d = jars_dir()
+    # Require core runtime deps and at least one of the main components
+    required_substrings = [
+        "gfc-base-api",
+        "protobuf-java",
+        "slf4j-",
+    ]
+    return all(_file_exists(d, s) for s in required_substrings)
+
+
+def pricer_available(name_substring):
+    return _file_exists(pricers_dir(), name_substring)
+
+
+# Session scoped: JPype cannot restart the JVM once a Pypps instance shuts it down
+@pytest.fixture(scope="session")
+def pypps_or_skip():
+    if not base_jars_present():
+        pytest.skip(
+            "Required runtime JARs not found in ./jars. Populate real CMS jars to run integration tests."
+        )
+
+    jar_path = jars_dir()
+    db_path = os.path.join(project_root_dir(), "data", "pypps.db")
+
+    pypps = Pypps(
+        build_jar_dirs=False, jar_path=jar_path, db_path=db_path, build_db=False
+    )
+    pypps.setup_clients()
+    try:
+        yield pypps
+    finally:
+        pypps.cleanup()
+
+
+class FakeJvm:
+    """
+    Stand-in for the JVM, so clients can be built by their own ``__init__``
+    without CMS JARs.
+
+    ``jpype.JClass(name)`` returns ``classes[name]``. Classes a test does not
+    register are made by ``missing(name)``, a MagicMock unless the test
+    replaces it.
+    """
+
+    def __init__(self):
+        self.classes = {}
+
+    def jclass(self, name):
+        java_class = self.classes.get(name)
+        if java_class is None:
+            java_class = self.classes[name] = self.missing(name)
+        return java_class
+
+    def missing(self, name):
+        return MagicMock(name=name)
+
+
+@pytest.fixture
+def fake_jvm(monkeypatch):
+    jvm = FakeJvm()
+    monkeypatch.setattr(jpype, "isJVMStarted", lambda: True)
+    monkeypatch.setattr(jpype, "JClass", jvm.jclass)
+    return jvm
+
+
+@pytest.fixture
+def make_drg_client(fake_jvm):
+    """Factory for DrgClients built against ``fake_jvm``."""
+    return DrgClient
+
+
+@pytest.fixture
+def make_ioce_client(fake_jvm):
+    """
+    Factory for IoceClients built against ``fake_jvm``; ``component_class``
+    stands in for IoceComponent.
+    """
+
+    def make(component_class=None, **kwargs):
+        if component_class is not None:
+            fake_jvm.classes["gov.cms.oce.IoceComponent"] = component_class
+        return IoceClient(**kwargs)
+
+    return make
@@ -0,0 +1,163 @@
+"""
+Tests for the asyncio front-end.
+
+A stand-in Pypps sleeps per claim and records how many claims run at once, so
+admission, ordering, backpressure and error handling are tested without a JVM.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from pydrg.input.claim import Claim
+from pydrg.pypps.async_pypps import AsyncPypps
+from pydrg.pypps.pypps import Pypps, PyppsOutput
+
+
+class FakePypps:
+    """Sleeps ``delays[claimid]`` seconds and raises for claims in ``fail``."""
+
+    _process_safe = Pypps._process_safe
+
+    def __init__(self, delays=None, fail=()):
+        self.delays = delays or {}
+        self.fail = set(fail)
+        self.logger = logging.getLogger("FakePypps")
+        self.started = 0
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def process(self, claim, **kwargs):
+        with self._lock:
+            self.started += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.delays.get(claim.claimid, 0.01))
+            if claim.claimid in self.fail:
+                raise RuntimeError(f"bad claim {claim.claimid}")
+            return PyppsOutput(claim_id=claim.claimid)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def claims(count):
+    return [Claim(claimid=str(i)) for i in range(count)]
+
+
+async def collect(stream):
+    return [output async for output in stream]
+
+
+class TestProcess:
+    """Test single-claim processing and the admission cap."""
+
+    def test_concurrency_is_capped(self):
+        pypps = FakePypps(delays={str(i): 0.05 for i in range(10)})
+
+        async def main():
+            async with AsyncPypps(pypps, max_workers=8, max_concurrency=2) as apypps:
+                return await asyncio.gather(*(apypps.process(c) for c in claims(10)))
+
+        outputs = asyncio.run(main())
+        assert [output.claim_id for output in outputs] == [str(i) for i in range(10)]
+        assert pypps.peak == 2
+
+    def test_failure_is_raised_for_that_claim_only(self):
+        pypps = FakePypps(fail={"1"})
+
+        async def main():
+            async with AsyncPypps(pypps, max_workers=2) as apypps:
+                return await asyncio.gather(
+                    *(apypps.process(c) for c in claims(3)), return_exceptions=True
+                )
+
+        first, failed, last = asyncio.run(main())
+        assert isinstance(failed, RuntimeError)
+        assert (first.claim_id, last.claim_id) == ("0", "2")
+
+    def test_invalid_sizes(self):
+        with pytest.raises(ValueError):
+            AsyncPypps(FakePypps(), max_workers=0)
+
+
+class TestProcessStream:
+    """Test ordering, backpressure and per-claim errors of process_stream."""
+
+    def test_ordered_follows_input(self):
+        pypps = FakePypps(delays={"0": 0.2, "1": 0.1})
+
+        async def main():
+            async with AsyncPypps(pypps, max_workers=4) as apypps:
+                return await collect(apypps.process_stream(claims(8)))
+
+        assert [output.claim_id for output in asyncio.run(main())] == [
+            str(i) for i in range(8)
+        ]
+
+    def test_unordered_follows_completion(self):
+        pypps = FakePypps(delays={"0": 0.3})
+
+        async def main():
+            async with AsyncPypps(pypps, max_workers=4) as apypps:
+                return await collect(apypps.process_stream(claims(8), ordered=False))
+
+        ids = [output.claim_id for output in asyncio.run(main())]
+        assert sorted(ids) == sorted(str(i) for i in range(8))
+        assert ids[0] != "0"
+
+    def test_source_is_pulled_no_faster_than_admitted(self):
+        pypps = FakePypps()
+        pulled = []
+
+        async def source():
+            for claim in claims(20):
+                pulled.append(claim.claimid)
+                yield claim
+
+        async def main():
+            async with AsyncPypps(pypps, max_workers=2, max_concurrency=3) as apypps:
+                stream = apypps.process_stream(source())
+                first = await stream.__anext__()
+                seen = len(pulled)
+                rest = await collect(stream)
+                return first, seen, rest
+
+        first, seen, rest = asyncio.run(main())
+        assert first.claim_id == "0"
+        assert seen == 3
+        assert len(rest) == 19
+        assert pypps.peak <= 2
+
+    def test_failed_claim_does_not_stop_the_stream(self):
+        pypps = FakePypps(fail={"2", "5"})
+
+        async def main():
+            async with AsyncPypps(pypps, max_workers=2) as apypps:
+                return await asyncio.wait_for(
+                    collect(apypps.process_stream(claims(8))), timeout=10
+                )
+
+        outputs = asyncio.run(main())
+        assert [output.claim_id for output in outputs] == [str(i) for i in range(8)]
+        assert [output.claim_id for output in outputs if output.error] == ["2", "5"]
+        assert outputs[2].error == "bad claim 2"
+
+    def test_closing_early_cancels_in_flight_claims(self):
+        pypps = FakePypps(delays={str(i): 0.05 for i in range(20)})
+
+        async def main():
+            async with AsyncPypps(pypps, max_workers=1, max_concurrency=4) as apypps:
+                stream = apypps.process_stream(claims(20))
+                await stream.__anext__()
+                await stream.aclose()
+            await asyncio.sleep(0.2)
+
+        asyncio.run(main())
+        assert pypps.running == 0
+        assert pypps.started < 20
@@ -0,0 +1,615 @@
+"""
+Performance benchmarks for claim processing.
+
+Each benchmark times one stage on its own (claim parsing, the MS-DRG and IOCE
+clients, provider lookups, every pricer and the full ``Pypps.process``) and
+reports claims/sec, p50/p95/p99 latency and peak RSS. Benchmarks that need the
+real CMS JARs are skipped when they are not present, the same way the
+integration tests in ``test_pypps.py`` are.
+
+The suite is opt-in: it only runs with ``PYDRG_BENCH`` set, e.g.
+``PYDRG_BENCH=1 pytest tests/test_benchmarks.py -s``. Results are printed
+(``-s`` shows them) and written as JSON to ``PYDRG_BENCH_OUTPUT`` (default ``bench_results.json``
+in the project root). ``PYDRG_BENCH_REPEAT`` sets how many times the example
+claims are repeated and ``PYDRG_BENCH_ITERATIONS`` how many times single-claim
+benchmarks run.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+from pydrg.helpers.claim_examples import claim_example, opps_claim_example
+from pydrg.input import (
+    Claim,
+    DiagnosisCode,
+    IrfPai,
+    LineItem,
+    Modules,
+    OasisAssessment,
+    PoaType,
+    ValueCode,
+)
+from pydrg.pricers.ipsf import IPSFProvider
+from pydrg.pricers.opsf import OPSFProvider
+from pydrg.pypps.pypps import MODULE_CLIENTS, PRICERS, MODULE_PRICERS
+
+from .conftest import pricer_available, project_root_dir
+
+BENCH_REPEAT = int(os.getenv("PYDRG_BENCH_REPEAT", "10"))
+BENCH_ITERATIONS = int(os.getenv("PYDRG_BENCH_ITERATIONS", "200"))
+BENCH_OUTPUT = os.getenv(
+    "PYDRG_BENCH_OUTPUT", os.path.join(project_root_dir(), "bench_results.json")
+)
+WARMUP = 20
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("PYDRG_BENCH"), reason="benchmarks only run with PYDRG_BENCH set"
+)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+@pytest.fixture(scope="module")
+def bench_report():
+    """Collects benchmark results and writes them as JSON when the module ends."""
+    results = {}
+    yield results
+    if not results:
+        return
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": BENCH_REPEAT,
+        "iterations": BENCH_ITERATIONS,
+        "peak_rss_mb": peak_rss_mb(),
+        "benchmarks": results,
+    }
+    with open(BENCH_OUTPUT, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nBenchmark results written to {BENCH_OUTPUT}")
+
+
+def run_benchmark(report, name, func, items):
+    """Time ``func(item)`` for every item after a short warm-up and record the stats."""
+    for item in items[:WARMUP]:
+        func(item)
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    result = {
+        "claims": len(items),
+        "seconds": elapsed,
+        "claims_per_sec": len(items) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    report[name] = result
+    print(
+        f"\n{name}: {result['claims_per_sec']:.1f} claims/sec, "
+        f"p50={result['p50_ms']:.3f}ms p95={result['p95_ms']:.3f}ms "
+        f"p99={result['p99_ms']:.3f}ms"
+    )
+    return result
+
+
+def example_claim_lines():
+    path = os.path.join(project_root_dir(), "example_data", "claims.jsonl")
+    with open(path, "r") as f:
+        return [line for line in f if line.strip()]
+
+
+def load_example_claims(modules):
+    claims = []
+    for line in example_claim_lines():
+        claim = Claim.model_validate_json(line)
+        claim.modules = list(modules)
+        claims.append(claim)
+    return claims
+
+
+def repeated(claim, count=BENCH_ITERATIONS):
+    return [claim] * count
+
+
+def date_int(value):
+    return int(value.strftime("%Y%m%d"))
+
+
+def hospice_claim():
+    claim = claim_example()
+    claim.bill_type = "812"
+    claim.patient_status = "40"
+    claim.value_codes.append(ValueCode(code="61", amount=35300.00))
+    claim.value_codes.append(ValueCode(code="G8", amount=35300.00))
+    claim.thru_date = datetime(2025, 7, 10)
+    claim.los = 10
+    claim.lines.append(
+        LineItem(
+            hcpcs="Q5001",
+            revenue_code="0651",
+            service_date=datetime(2025, 7, 1),
+            units=9,
+            charges=10_000.00,
+        )
+    )
+    claim.lines.append(
+        LineItem(
+            hcpcs="G0299",
+            revenue_code="0551",
+            service_date=datetime(2025, 7, 1),
+            units=3,
+            charges=10_000.00,
+        )
+    )
+    return claim
+
+
+def snf_claim():
+    claim = claim_example()
+    claim.admit_date = datetime(2025, 1, 1)
+    claim.from_date = datetime(2025, 1, 1)
+    claim.thru_date = datetime(2025, 1, 20)
+    claim.los = 20
+    claim.bill_type = "327"
+    claim.principal_dx.code = "B20"
+    claim.secondary_dxs[0].code = "C50911"
+    claim.lines = [
+        LineItem(
+            revenue_code="0022",
+            hcpcs="ABAC1",
+            service_date=datetime(2025, 1, 1),
+            units=20,
+        )
+    ]
+    return claim
+
+
+def irf_claim():
+    claim = claim_example()
+    claim.billing_provider.other_id = "013025"
+    claim.los = 20
+    claim.non_covered_days = 0
+    claim.principal_dx.code = "D61.03"
+    claim.admit_date = datetime(2025, 1, 1)
+    claim.thru_date = datetime(2025, 1, 30)
+    claim.patient.date_of_birth = datetime(1970, 1, 1)
+    claim.secondary_dxs.clear()
+    claim.irf_pai = IrfPai(
+        assessment_system="IRF-PAI",
+        transaction_type=1,
+        impairment_admit_group_code="0012.9   ",
+    )
+    for field in (
+        "eating_self_admsn_cd",
+        "oral_hygne_admsn_cd",
+        "toileting_hygne_admsn_cd",
+        "bathing_hygne_admsn_cd",
+        "footwear_dressing_cd",
+        "chair_bed_transfer_cd",
+        "toilet_transfer_cd",
+        "walk_10_feet_cd",
+        "walk_50_feet_cd",
+        "walk_150_feet_cd",
+        "step_1_cd",
+    ):
+        setattr(claim.irf_pai, field, "06")
+    claim.irf_pai.urinary_continence_cd = "0"
+    claim.irf_pai.bowel_continence_cd = "0"
+    return claim
+
+
+def hha_claim():
+    claim = claim_example()
+    claim.patient.age = 65
+    claim.from_date = datetime(2025, 1, 1)
+    claim.thru_date = datetime(2025, 1, 31)
+    claim.los = 30
+    claim.principal_dx.code = "I10"
+    claim.principal_dx.poa = PoaType.Y
+    claim.secondary_dxs.append(DiagnosisCode(code="C50911", poa=PoaType.Y))
+    for revenue_code in ("0420", "0430", "0440", "0550"):
+        claim.lines.append(
+            LineItem(
+                service_date=datetime(2025, 1, 1), revenue_code=revenue_code, units=20
+            )
+        )
+    claim.oasis_assessment = OasisAssessment(
+        fall_risk=True,
+        multiple_hospital_stays=True,
+        multiple_ed_visits=True,
+        compliance_risk=True,
+        five_or_more_meds=True,
+        grooming="1",
+        dress_upper="2",
+        dress_lower="2",
+        bathing="0",
+        toileting="1",
+        transferring="2",
+        ambulation="3",
+    )
+    return claim
+
+
+def ltch_claim():
+    claim = claim_example()
+    claim.billing_provider.other_id = "012006"
+    return claim
+
+
+# Pricer module -> (claim builder, upstream module whose output it prices)
+PRICER_CASES = {
+    Modules.IPPS: (claim_example, Modules.MSDRG),
+    Modules.OPPS: (opps_claim_example, Modules.IOCE),
+    Modules.PSYCH: (claim_example, Modules.MSDRG),
+    Modules.LTCH: (ltch_claim, Modules.MSDRG),
+    Modules.IRF: (irf_claim, Modules.CMG),
+    Modules.HHA: (hha_claim, Modules.HHAG),
+    Modules.HOSPICE: (hospice_claim, None),
+    Modules.SNF: (snf_claim, None),
+}
+
+
+def test_bench_claim_parsing(bench_report):
+    lines = example_claim_lines() * BENCH_REPEAT
+    run_benchmark(bench_report, "claim_parsing", Claim.model_validate_json, lines)
+
+
+@pytest.mark.parametrize("level", ["full", "standard", "summary"])
+def test_bench_drg_process(pypps_or_skip, bench_report, level):
+    client = pypps_or_skip.drg_client
+    claims = load_example_claims([Modules.MSDRG]) * BENCH_REPEAT
+    name = "drg_process" if level == "full" else f"drg_process_{level}"
+    run_benchmark(
+        bench_report, name, lambda claim: client.process(claim, level=level), claims
+    )
+
+
+class JavaCalls:
+    """
+    Counts calls from Python into Java (constructors and methods, one JNI
+    crossing each) made through wrapped Java classes.
+    """
+
+    def __init__(self):
+        self.counts = {}
+
+    def wrap(self, label, target, wrap_results=False):
+        """Count calls made through ``target``; ``wrap_results`` also counts calls on what it returns."""
+        return _CountedJava(self, label, target, wrap_results)
+
+    def total(self):
+        return sum(self.counts.values())
+
+
+class _CountedJava:
+    def __init__(self, calls, label, target, wrap_results):
+        self._calls = calls
+        self._label = label
+        self._target = target
+        self._wrap_results = wrap_results
+
+    def _call(self, function, args):
+        self._calls.counts[self._label] = self._calls.counts.get(self._label, 0) + 1
+        args = [arg._target if isinstance(arg, _CountedJava) else arg for arg in args]
+        result = function(*args)
+        if self._wrap_results:
+            return self._calls.wrap(self._label, result)
+        return result
+
+    def __call__(self, *args):
+        return self._call(self._target, args)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+        return lambda *args: self._call(attribute, args)
+
+
+def per_item_java_list(client):
+    """The original list building: an empty ArrayList and one ``add`` per item."""
+
+    def java_list(items):
+        java_list = client.array_list_class()
+        for item in items:
+            java_list.add(item)
+        return java_list
+
+    return java_list
+
+
+@pytest.mark.parametrize("variant", ["baseline", "uncached", "cached"])
+def test_bench_drg_input(pypps_or_skip, bench_report, monkeypatch, variant):
+    """
+    Time ``create_drg_input`` alone and count the calls it makes into Java.
+    ``baseline`` builds every code object and adds list items one call at a
+    time, as before the input cache; ``uncached`` only turns the code object
+    cache off. The calls are counted in a first pass, since the counting
+    wrappers would skew the timings. Set ``PYDRG_BENCH_REPEAT`` so the
+    repeated examples reach the cohort size of interest (e.g. 100k claims).
+    """
+    import jpype
+
+    from pydrg.msdrg import DrgClient
+
+    client = DrgClient(input_cache_size=50_000 if variant == "cached" else 0)
+    if variant == "baseline":
+        monkeypatch.setattr(client, "_java_list", per_item_java_list(client))
+    claims = load_example_claims([Modules.MSDRG]) * BENCH_REPEAT
+
+    calls = JavaCalls()
+    wrapped = {
+        "drg_dx_class": calls.wrap("codes", client.drg_dx_class),
+        "drg_px_class": calls.wrap("codes", client.drg_px_class),
+        "drg_status": calls.wrap("enums", client.drg_status),
+        "drg_input_class": calls.wrap(
+            "builder", client.drg_input_class, wrap_results=True
+        ),
+        "array_list_class": calls.wrap(
+            "lists", client.array_list_class, wrap_results=True
+        ),
+        "arrays_class": calls.wrap("lists", client.arrays_class),
+    }
+    with monkeypatch.context() as counting:
+        for name, java_class in wrapped.items():
+            counting.setattr(client, name, java_class)
+        array_class = jpype.JArray
+        counting.setattr(
+            jpype, "JArray", lambda kind: calls.wrap("lists", array_class(kind))
+        )
+        for claim in claims:
+            client.create_drg_input(claim)
+    client._dx_cache.clear()
+    client._px_cache.clear()
+
+    name = "drg_input" if variant == "cached" else f"drg_input_{variant}"
+    result = run_benchmark(bench_report, name, client.create_drg_input, claims)
+    result["java_calls"] = calls.counts
+    result["java_calls_per_claim"] = calls.total() / len(claims)
+    print(
+        f"  Java calls per claim: {result['java_calls_per_claim']:.1f} "
+        + " ".join(f"{label}={count}" for label, count in sorted(calls.counts.items()))
+    )
+
+
+@pytest.mark.parametrize("thread_local", [False, True], ids=["shared", "thread_local"])
+def test_bench_drg_thread_scaling(pypps_or_skip, bench_report, thread_local):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pydrg.msdrg import DrgClient
+
+    client = (
+        DrgClient(thread_local=thread_local)
+        if thread_local
+        else pypps_or_skip.drg_client
+    )
+    claims = load_example_claims([Modules.MSDRG]) * BENCH_REPEAT
+    mode = "thread_local" if thread_local else "shared"
+    rates = {}
+    for threads in (1, 2, 4, 8):
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Warm up, which also builds each thread's components
+            list(executor.map(client.process, claims[: WARMUP * threads]))
+            start = time.perf_counter()
+            list(executor.map(client.process, claims))
+            elapsed = time.perf_counter() - start
+        rates[threads] = len(claims) / elapsed
+        bench_report[f"drg_{mode}_threads_{threads}"] = {
+            "claims": len(claims),
+            "seconds": elapsed,
+            "claims_per_sec": rates[threads],
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    print(f"\nMS-DRG {mode} components, throughput by thread count (claims/sec):")
+    for threads, rate in rates.items():
+        print(f"  threads={threads:<2} {rate:10.1f}  x{rate / rates[1]:.2f}")
+
+
+# Common secondary diagnoses, so impact_analysis has ten variants to group
+IMPACT_DIAGNOSES = [
+    "E87.1",
+    "I10",
+    "E11.9",
+    "N18.30",
+    "Z79.01",
+    "J96.01",
+    "E78.5",
+    "I48.91",
+    "F17.210",
+    "K21.9",
+]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_bench_drg_impact_analysis(pypps_or_skip, bench_report, workers):
+    """
+    Time ``impact_analysis`` of a claim with ten secondary diagnoses on the
+    calling thread and on the client's threads. The warm-up builds each
+    thread's components, so the timed runs measure grouping only.
+    """
+    from pydrg.msdrg import DrgClient
+
+    client = DrgClient(thread_local=True)
+    claim = claim_example()
+    claim.secondary_dxs = [
+        DiagnosisCode(code=code, poa=PoaType.Y) for code in IMPACT_DIAGNOSES
+    ]
+    try:
+        run_benchmark(
+            bench_report,
+            f"drg_impact_analysis_workers_{workers}",
+            lambda claim: client.impact_analysis(claim, workers=workers),
+            repeated(claim),
+        )
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize("include_descriptions", [True, False])
+def test_bench_ioce_process(pypps_or_skip, bench_report, include_descriptions):
+    client = pypps_or_skip.ioce_client
+    name = "ioce_process" if include_descriptions else "ioce_process_no_descriptions"
+    run_benchmark(
+        bench_report,
+        name,
+        lambda claim: client.process(claim, include_descriptions=include_descriptions),
+        repeated(opps_claim_example()),
+    )
+
+
+def test_bench_ioce_thread_scaling(pypps_or_skip, bench_report):
+    """
+    Parallel IOCE throughput of a thread-local client against the shared
+    single-component client, which can only be used from one thread.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pydrg.ioce import IoceClient
+
+    claims = repeated(opps_claim_example(), BENCH_ITERATIONS * 4)
+    shared = pypps_or_skip.ioce_client
+    for claim in claims[:WARMUP]:
+        shared.process(claim)
+    start = time.perf_counter()
+    for claim in claims:
+        shared.process(claim)
+    baseline = len(claims) / (time.perf_counter() - start)
+    bench_report["ioce_shared_threads_1"] = {
+        "claims": len(claims),
+        "claims_per_sec": baseline,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    client = IoceClient(thread_local=True)
+    rates = {}
+    for threads in (1, 2, 4, 8):
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Warm up, which also builds each thread's component
+            list(executor.map(client.process, claims[: WARMUP * threads]))
+            start = time.perf_counter()
+            list(executor.map(client.process, claims))
+            elapsed = time.perf_counter() - start
+        rates[threads] = len(claims) / elapsed
+        bench_report[f"ioce_thread_local_threads_{threads}"] = {
+            "claims": len(claims),
+            "seconds": elapsed,
+            "claims_per_sec": rates[threads],
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    print(f"\nIOCE shared component, 1 thread: {baseline:10.1f} claims/sec")
+    print("IOCE thread-local components, throughput by thread count (claims/sec):")
+    for threads, rate in rates.items():
+        print(f"  threads={threads:<2} {rate:10.1f}  x{rate / baseline:.2f}")
+
+
+@pytest.mark.parametrize("provider_file", ["ipsf", "opsf"])
+def test_bench_provider_lookup(pypps_or_skip, bench_report, provider_file):
+    engine = pypps_or_skip.db_manager.engine
+    provider_class = IPSFProvider if provider_file == "ipsf" else OPSFProvider
+    claim = claim_example()
+    when = date_int(claim.thru_date)
+    try:
+        provider_class().from_sqlite(engine, claim.billing_provider, when)
+    except Exception as e:
+        pytest.skip(f"{provider_file.upper()} lookup unavailable: {e}")
+    run_benchmark(
+        bench_report,
+        f"{provider_file}_lookup",
+        lambda provider: provider_class().from_sqlite(engine, provider, when),
+        repeated(claim.billing_provider),
+    )
+
+
+@pytest.mark.parametrize("module", list(PRICER_CASES), ids=lambda m: m.value)
+def test_bench_pricer_process(pypps_or_skip, bench_report, module):
+    if not pricer_available(PRICERS[MODULE_PRICERS[module]]):
+        pytest.skip(f"{module.value} pricer jar not present in ./jars/pricers")
+    client = getattr(pypps_or_skip, MODULE_CLIENTS[module][0])
+    if client is None:
+        pytest.skip(f"{module.value} client not initialized")
+
+    build_claim, upstream = PRICER_CASES[module]
+    claim = build_claim()
+    if upstream is None:
+        process = client.process
+    else:
+        upstream_client = getattr(pypps_or_skip, MODULE_CLIENTS[upstream][0])
+        upstream_output = upstream_client.process(claim)
+        process = lambda c: client.process(c, upstream_output)  # noqa: E731
+    run_benchmark(
+        bench_report, f"{module.value.lower()}_process", process, repeated(claim)
+    )
+
+
+def test_bench_pypps_process(pypps_or_skip, bench_report):
+    claims = load_example_claims([Modules.MCE, Modules.MSDRG]) * BENCH_REPEAT
+    run_benchmark(bench_report, "pypps_process", pypps_or_skip.process, claims)
+
+
+def test_process_many_throughput(pypps_or_skip, bench_report, monkeypatch):
+    from pydrg.msdrg import DrgClient
+
+    # Shared MS-DRG components must not be used from several threads
+    drg_client = DrgClient(thread_local=True)
+    monkeypatch.setattr(pypps_or_skip, "drg_client", drg_client)
+    base_claims = load_example_claims([Modules.MCE, Modules.MSDRG])
+    claims = [
+        claim.model_copy(update={"claimid": f"{claim.claimid}-{i}"})
+        for i in range(BENCH_REPEAT)
+        for claim in base_claims
+    ]
+    # Warm up the JIT and grouper tables before timing
+    list(pypps_or_skip.process_many(base_claims, workers=1))
+
+    results = {}
+    for workers in (1, 2, 4, 8):
+        start = time.perf_counter()
+        outputs = list(pypps_or_skip.process_many(claims, workers=workers))
+        elapsed = time.perf_counter() - start
+        assert [o.claim_id for o in outputs] == [c.claimid for c in claims]
+        results[workers] = len(claims) / elapsed
+        bench_report[f"process_many_workers_{workers}"] = {
+            "claims": len(claims),
+            "seconds": elapsed,
+            "claims_per_sec": results[workers],
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    print("\nprocess_many throughput (claims/sec):")
+    for workers, rate in results.items():
+        print(f"  workers={workers:<2} {rate:10.1f}  x{rate / results[1]:.2f}")
+    drg_client.close()
@@ -0,0 +1,93 @@
+"""
+Tests for the synthetic claim generator.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from pydrg.helpers.claim_generator import (
+    FAMILY_MODULES,
+    ClaimGenerator,
+    ClaimGeneratorConfig,
+    load_provider_ccns,
+)
+from pydrg.input.claim import Claim, Modules
+from pydrg.pricers.ipsf import IPSF, Base as IPSFBase
+
+
+def dump(claims):
+    return [claim.model_dump_json() for claim in claims]
+
+
+class TestClaimGenerator:
+    """Test determinism and the shape of generated claims."""
+
+    def test_same_seed_same_claims(self):
+        assert dump(ClaimGenerator(seed=1).generate(50)) == dump(
+            ClaimGenerator(seed=1).generate(50)
+        )
+        assert dump(ClaimGenerator(seed=1).generate(50)) != dump(
+            ClaimGenerator(seed=2).generate(50)
+        )
+
+    def test_ranges_match_full_run(self):
+        full = dump(ClaimGenerator(seed=5).generate(30))
+        assert dump(ClaimGenerator(seed=5).generate(10, start=20)) == full[20:]
+
+    @pytest.mark.parametrize("family", list(FAMILY_MODULES))
+    def test_family_claims_are_valid(self, family):
+        generator = ClaimGenerator(seed=3, families={family: 1})
+        for claim in generator.generate(25):
+            # Round trip through JSON re-runs every Claim validator
+            Claim.model_validate_json(claim.model_dump_json(exclude_defaults=True))
+            assert claim.modules == FAMILY_MODULES[family]
+            assert claim.principal_dx is not None
+            assert claim.billing_provider.other_id
+            if family == "hha":
+                assert claim.oasis_assessment is not None
+            if family == "irf":
+                assert claim.irf_pai is not None
+            if family in ("opps", "esrd", "hospice"):
+                assert claim.lines
+
+    def test_opps_line_count_is_configurable(self):
+        generator = ClaimGenerator(seed=0, families={"opps": 1}, opps_lines=(50, 50))
+        assert all(len(c.lines) == 50 for c in generator.generate(5))
+
+    def test_write_jsonl(self, tmp_path):
+        path = tmp_path / "claims.jsonl"
+        assert ClaimGenerator(seed=9).write_jsonl(str(path), 20) == 20
+        lines = path.read_text().splitlines()
+        assert [Claim.model_validate_json(line).claimid for line in lines] == [
+            f"SYN9-{i:09d}" for i in range(20)
+        ]
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            ClaimGeneratorConfig(families={"dental": 1})
+        with pytest.raises(ValueError):
+            ClaimGeneratorConfig(families={"ipps": 1}, providers={"ipps": []})
+
+
+class TestDatabaseProviders:
+    """Test drawing providers from a local IPSF table."""
+
+    def test_providers_filtered_by_facility_type(self):
+        engine = create_engine("sqlite://")
+        IPSFBase.metadata.create_all(engine)
+        with Session(engine) as session:
+            for ccn in ("050100", "053030", "057100", "052300"):
+                session.add(IPSF(provider_ccn=ccn, effective_date=20240101))
+            session.commit()
+
+        assert load_provider_ccns(engine, "ipps") == ["050100"]
+        assert load_provider_ccns(engine, "irf") == ["053030"]
+        assert load_provider_ccns(engine, "hha") == ["057100"]
+        assert load_provider_ccns(engine, "hospice") == []
+
+        generator = ClaimGenerator(seed=0, families={"ipps": 1, "irf": 1})
+        generator.use_database_providers(engine)
+        for claim in generator.generate(20):
+            expected = "050100" if Modules.IPPS in claim.modules else "053030"
+            assert claim.billing_provider.other_id == expected
@@ -0,0 +1,61 @@
+"""
+Tests for the ``python -m pydrg run`` argument handling and claim reader.
+
+These tests do not start a JVM; claim processing itself is covered by the
+integration tests in test_pypps.py.
+"""
+
+import io
+
+import pytest
+
+from pydrg.cli import _ClaimReader, build_parser
+from pydrg.input.claim import Modules
+
+
+class TestRunArguments:
+    """Test parsing of the run subcommand options."""
+
+    def test_defaults(self):
+        args = build_parser().parse_args(["run"])
+        assert args.input == "-"
+        assert args.output == "-"
+        assert args.errors is None
+        assert args.modules is None
+        assert args.workers == 1
+        assert args.chunk_size == 64
+
+    def test_modules_are_case_insensitive(self):
+        args = build_parser().parse_args(
+            ["run", "claims.jsonl", "--modules", "msdrg, IPPS"]
+        )
+        assert args.modules == [Modules.MSDRG, Modules.IPPS]
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["run", "--modules", "NOT_A_MODULE"],
+            ["run", "--workers", "0"],
+            ["run", "--chunk-size", "0"],
+        ],
+    )
+    def test_invalid_arguments(self, argv):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(argv)
+
+
+class TestClaimReader:
+    """Test streaming claims from JSONL."""
+
+    def test_skips_blank_lines_and_reports_invalid_ones(self):
+        lines = io.StringIO('{"claimid": "A"}\n\nnot json\n{"claimid": "B"}\n')
+        errors = io.StringIO()
+        reader = _ClaimReader(lines, errors, [Modules.MSDRG])
+
+        claims = list(reader)
+
+        assert [c.claimid for c in claims] == ["A", "B"]
+        assert all(c.modules == [Modules.MSDRG] for c in claims)
+        assert reader.read == 3
+        assert reader.invalid == 1
+        assert '"line": 3' in errors.getvalue()
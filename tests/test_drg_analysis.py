@@ -0,0 +1,262 @@
+"""
+Tests for MS-DRG analysis APIs built on a single claim conversion.
+
+The Java input, claim and component are replaced by stand-ins that "group" a
+claim from its secondary diagnosis codes, so the tests run without a JVM.
+"""
+
+import time
+
+import pytest
+
+from pydrg.input.claim import Claim, DiagnosisCode
+from pydrg.msdrg.drg_client import DrgInputParts
+from pydrg.msdrg.msdrg_output import MsdrgOutput, MsdrgVersionComparison
+
+# Secondary diagnosis -> severity it adds
+SEVERITY = {"J9601": "MCC", "E871": "CC"}
+DRG = {"MCC": "291", "CC": "292", "NONE": "293"}
+# Severity changes made by other grouper versions
+VERSION_SEVERITY = {"420": {"J9601": "CC"}, "410": {"E871": "NONE"}}
+
+
+class FakePoa:
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+def fake_group(codes, version="421"):
+    if version == "bad":
+        raise RuntimeError("DRG output is not present")
+    severity_of = {**SEVERITY, **VERSION_SEVERITY.get(version, {})}
+    severities = {severity_of.get(code, "NONE") for code in codes}
+    severity = next(s for s in ("MCC", "CC", "NONE") if s in severities)
+    return MsdrgOutput(
+        final_drg_value=DRG[severity], final_mdc_value="05", final_severity=severity
+    )
+
+
+class SlowComponent:
+    """Slow to build, like a grouper component loading its tables."""
+
+    created = []
+
+    def __init__(self, options):
+        time.sleep(0.05)
+        SlowComponent.created.append(self)
+
+
+@pytest.fixture
+def make_client(make_drg_client, fake_jvm, monkeypatch):
+    fake_jvm.classes["gov.agency.msdrg.model.v2.transfer.MsdrgClaim"] = (
+        lambda drg_input: drg_input
+    )
+    fake_jvm.classes["gov.agency.msdrg.model.v2.transfer.input.MsdrgInputDxCode"] = (
+        lambda code, poa: (code, poa)
+    )
+    fake_jvm.classes["gov.agency.msdrg.v421.MsdrgComponent"] = SlowComponent
+    SlowComponent.created = []
+    clients = []
+
+    def make(**kwargs):
+        client = make_drg_client(**kwargs)
+        clients.append(client)
+        stub_grouping(client, monkeypatch)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def client(make_client, monkeypatch):
+    client = make_client()
+    monkeypatch.setattr(client, "get_drg_component", lambda version, *options: version)
+    monkeypatch.setattr(
+        client, "_group", lambda codes, version, extractors: fake_group(codes, version)
+    )
+    return client
+
+
+def stub_grouping(client, monkeypatch):
+    client.conversions = 0
+
+    def convert_claim(claim, mappings=None):
+        client.conversions += 1
+        codes = [dx.code.replace(".", "") for dx in claim.secondary_dxs]
+        return DrgInputParts(
+            age_years=65,
+            age_days_admit=None,
+            age_days_discharge=None,
+            sex=None,
+            discharge_status=None,
+            admit_dx=None,
+            principal_dx=claim.principal_dx.code,
+            secondary_codes=codes,
+            secondary_poas=[FakePoa("Y") for _ in codes],
+            secondary_dxs=[(code, "Y") for code in codes],
+            procedures=[],
+        )
+
+    def build_drg_input(parts, secondary_dxs=None):
+        if secondary_dxs is None:
+            secondary_dxs = parts.secondary_dxs
+        return [code for code, _ in secondary_dxs]
+
+    monkeypatch.setattr(client, "convert_claim", convert_claim)
+    monkeypatch.setattr(client, "build_drg_input", build_drg_input)
+
+
+def make_claim(*codes, claimid="1", principal_dx="I5020"):
+    return Claim(
+        claimid=claimid,
+        principal_dx=DiagnosisCode(code=principal_dx) if principal_dx else None,
+        secondary_dxs=[DiagnosisCode(code=code) for code in codes],
+    )
+
+
+class TestImpactAnalysis:
+    """Test secondary diagnosis impact analysis."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_rows_show_which_codes_drive_severity(self, client, workers):
+        claim = make_claim("J96.01", "E87.1", "Z79.01")
+        weights = {"291": 1.3, "292": 0.9, "293": 0.6}
+        analysis = client.impact_analysis(
+            claim,
+            drg_version="421",
+            replacements={"J96.01": "J96.00"},
+            weights=weights,
+            workers=workers,
+        )
+        assert client.conversions == 1
+        assert (analysis.final_drg_value, analysis.final_severity) == ("291", "MCC")
+        assert analysis.weight == 1.3
+
+        rows = {(row.code, row.change): row for row in analysis.rows}
+        assert [(row.code, row.change) for row in analysis.rows] == [
+            ("J9601", "drop"),
+            ("J9601", "replace"),
+            ("E871", "drop"),
+            ("Z7901", "drop"),
+        ]
+        dropped = rows[("J9601", "drop")]
+        assert (dropped.final_drg_value, dropped.final_severity) == ("292", "CC")
+        assert dropped.drg_changed and dropped.severity_changed
+        assert dropped.weight_change == pytest.approx(-0.4)
+        assert rows[("J9601", "replace")].replacement == "J9600"
+        assert rows[("J9601", "replace")].final_severity == "CC"
+        assert not rows[("E871", "drop")].drg_changed
+        assert [row.code for row in analysis.drivers()] == ["J9601", "J9601"]
+
+    def test_variant_errors_are_reported_per_row(self, client, monkeypatch):
+        def group(codes, version, extractors):
+            if "E871" not in codes:
+                raise RuntimeError("DRG output is not present")
+            return fake_group(codes, version)
+
+        monkeypatch.setattr(client, "_group", group)
+        analysis = client.impact_analysis(
+            make_claim("E87.1", "Z79.01"), drg_version="421"
+        )
+        assert analysis.rows[0].error == "DRG output is not present"
+        assert analysis.rows[1].error is None
+
+    def test_threads_and_their_components_are_reused(self, make_client, monkeypatch):
+        client = make_client(thread_local=True)
+
+        def group(codes, drg_component, extractors):
+            # The grouper runs in Java, without holding the GIL
+            time.sleep(0.02)
+            return fake_group(codes)
+
+        monkeypatch.setattr(client, "_group", group)
+        claim = make_claim(*(f"E87.{i}" for i in range(8)))
+        client.impact_analysis(claim, drg_version="421", workers=4)
+        # The calling thread's component plus one per pool thread
+        assert len(SlowComponent.created) <= 5
+        built = len(SlowComponent.created)
+        executor = client._executor
+
+        start = time.perf_counter()
+        sequential = client.impact_analysis(claim, drg_version="421")
+        sequential_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        parallel = client.impact_analysis(claim, drg_version="421", workers=4)
+        parallel_seconds = time.perf_counter() - start
+
+        assert parallel.rows == sequential.rows
+        assert len(SlowComponent.created) == built
+        assert client._executor is executor
+        assert parallel_seconds < sequential_seconds / 2
+
+
+class TestProcessVersions:
+    """Test grouping claims under several grouper versions."""
+
+    @pytest.mark.parametrize("workers", [1, None])
+    def test_claims_are_converted_once_and_compared(self, client, workers):
+        claims = [
+            make_claim("J96.01", claimid="1"),
+            make_claim("E87.1", claimid="2"),
+            make_claim("Z79.01", claimid="3"),
+        ]
+        comparisons = client.process_versions(
+            claims, ["421", "420", "410"], workers=workers, chunk_size=2
+        )
+        assert client.conversions == 3
+        assert [c.claim_id for c in comparisons] == ["1", "2", "3"]
+        assert all(c.baseline_version == "421" for c in comparisons)
+
+        first = {r.version: r for r in comparisons[0].results}
+        assert [r.version for r in comparisons[0].results] == ["421", "420", "410"]
+        assert (first["421"].final_drg_value, first["420"].final_drg_value) == (
+            "291",
+            "292",
+        )
+        assert first["420"].drg_changed and first["420"].severity_changed
+        assert not first["420"].mdc_changed
+        assert [r.version for r in comparisons[0].changes()] == ["420"]
+        assert [r.version for r in comparisons[1].changes()] == ["410"]
+        assert comparisons[2].changes() == []
+
+    def test_sweeps_reuse_threads_and_components(
+        self, make_client, fake_jvm, monkeypatch
+    ):
+        for version in ("420", "410"):
+            fake_jvm.classes[f"gov.agency.msdrg.v{version}.MsdrgComponent"] = (
+                SlowComponent
+            )
+        client = make_client(thread_local=True)
+        used = []
+
+        def group(codes, drg_component, extractors):
+            used.append(drg_component)
+            return fake_group(codes)
+
+        monkeypatch.setattr(client, "_group", group)
+        claims = [make_claim("J96.01", claimid="1"), make_claim("E87.1", claimid="2")]
+        client.process_versions(claims, ["421", "420", "410"])
+        executor = client._executor
+        client.process_versions(claims, ["421", "420", "410"])
+        # One component per version, built on the calling thread
+        assert len(SlowComponent.created) == 3
+        assert set(map(id, used)) == set(map(id, SlowComponent.created))
+        assert client._executor is executor
+
+    def test_single_claim_and_errors(self, client):
+        comparison = client.process_versions(make_claim("E87.1"), ["421", "bad"])
+        assert isinstance(comparison, MsdrgVersionComparison)
+        assert comparison.results[0].final_severity == "CC"
+        assert comparison.results[1].error == "DRG output is not present"
+        assert comparison.changes() == []
+
+        failed = client.process_versions([make_claim(principal_dx=None)], ["421"])
+        assert failed[0].error is not None
+        assert failed[0].results == []
+        with pytest.raises(ValueError):
+            client.process_versions(make_claim(), [])
@@ -0,0 +1,222 @@
+"""
+Tests for MS-DRG output extraction levels, field projections and streaming
+batches.
+
+A mock stands in for the Java MsdrgOutput so the tests can check which
+getters each level calls without a JVM.
+"""
+
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from pydrg.input.claim import Claim
+from pydrg.msdrg.msdrg_output import MsdrgOutput
+from pydrg.msdrg.drg_client import (
+    MSDRG_EXTRACTORS,
+    MarkingLogicTieBreaker,
+    MsdrgAffectDrgOptionFlag,
+    MsdrgExtractionLevel,
+    MsdrgHospitalStatusOptionFlag,
+)
+
+
+@pytest.fixture
+def client(make_drg_client):
+    return make_drg_client()
+
+
+def java_output():
+    java = MagicMock()
+    java.getFinalDrg.return_value.getValue.return_value = "291"
+    java.getFinalMdc.return_value.getValue.return_value = "05"
+    java.getFinalSeverity.return_value.name.return_value = "MCC"
+    java.getFinalGrc.return_value.name.return_value = "OK"
+    java.getSdxOutput.return_value = [MagicMock(), MagicMock()]
+    java.getProcOutput.return_value = [MagicMock()]
+    return java
+
+
+def called_getters(java):
+    return {name for name, _, _ in java.method_calls if name.startswith(("get", "is"))}
+
+
+class TestExtractionLevels:
+    """Test that each level only reads what it returns."""
+
+    def test_summary_skips_per_code_outputs(self, client):
+        java = java_output()
+        output = client.extract_msdrg_output(java, client.extraction_plan("summary"))
+        assert (output.final_drg_value, output.final_mdc_value) == ("291", "05")
+        assert (output.final_severity, output.final_grc) == ("MCC", "OK")
+        assert called_getters(java) == {
+            "getFinalGrc",
+            "getFinalMdc",
+            "getFinalDrg",
+            "getFinalSeverity",
+            "getFinalDrgSdxSeverity",
+        }
+        assert output.secondary_dx_outputs == []
+        assert output.initial_drg_value == ""
+
+    def test_standard_reads_claim_level_fields_only(self, client):
+        java = java_output()
+        output = client.extract_msdrg_output(java, client.extraction_plan("standard"))
+        getters = called_getters(java)
+        assert {"getInitialDrg", "getHacStatus", "getGrouperFlags"} <= getters
+        assert not getters & {"getPdxOutput", "getSdxOutput", "getProcOutput"}
+        assert output.procedure_outputs == []
+
+    def test_full_is_the_default(self, client, make_drg_client):
+        java = java_output()
+        output = client.extract_msdrg_output(java)
+        assert len(output.secondary_dx_outputs) == 2
+        assert len(output.procedure_outputs) == 1
+        assert client.extraction_plan() == tuple(MSDRG_EXTRACTORS)
+        summary = make_drg_client(extraction_level="summary")
+        assert summary.extraction_plan() == client.extraction_plan(
+            MsdrgExtractionLevel.SUMMARY
+        )
+
+
+class TestFieldProjection:
+    """Test explicit field projections."""
+
+    def test_projection_selects_extractors(self, client):
+        assert client.extraction_plan(fields=["final_drg_value", "hac_status"]) == (
+            "final_drg",
+            "hac",
+        )
+        java = java_output()
+        output = client.extract_msdrg_output(
+            java, client.extraction_plan(fields=["final_drg_value"])
+        )
+        assert output.final_drg_value == "291"
+        assert called_getters(java) == {"getFinalDrg"}
+
+    def test_unknown_field_or_level(self, client):
+        with pytest.raises(ValueError):
+            client.extraction_plan(fields=["final_drg"])
+        with pytest.raises(ValueError):
+            client.extraction_plan("minimal")
+
+
+class TestStreamingBatch:
+    """Test streaming batch processing with bounded statistics."""
+
+    @pytest.fixture
+    def batch_client(self, client, monkeypatch):
+        def process(claim, *args, **kwargs):
+            if claim.claimid.endswith("7"):
+                raise ValueError(f"bad claim {claim.claimid}")
+            return MsdrgOutput(claim_id=claim.claimid, final_drg_value="291")
+
+        monkeypatch.setattr(client, "process", process)
+        return client
+
+    def claims(self, count):
+        return (Claim(claimid=str(i)) for i in range(count))
+
+    def test_stats_are_bounded(self, batch_client, tmp_path):
+        path = tmp_path / "out.jsonl"
+        stats = batch_client.batch_process_with_stats(
+            self.claims(1000), str(path), flush_every=10, max_errors=5
+        )
+        assert stats["total_claims"] == 1000
+        assert stats["failed_claims"] == 100
+        assert len(stats["errors"]) == 5
+        assert stats["error_types"] == {"ValueError": 100}
+        assert stats["latency"]["count"] == 1000
+        assert stats["drg_distribution"] == {"291": 900}
+        lines = path.read_text().splitlines()
+        assert len(lines) == 900
+        assert json.loads(lines[0])["claim_id"] == "0"
+
+    def test_max_errors_keeps_its_position(self, batch_client):
+        stats = batch_client.batch_process_with_stats(
+            self.claims(30),
+            io.StringIO(),
+            None,
+            MsdrgHospitalStatusOptionFlag.NON_EXEMPT,
+            MsdrgAffectDrgOptionFlag.COMPUTE,
+            MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE,
+            None,
+            1000,
+            2,
+        )
+        assert stats["failed_claims"] == 3
+        assert len(stats["errors"]) == 2
+
+    def test_batch_process_writes_jsonl_to_open_file(self, batch_client):
+        output = io.StringIO()
+        assert batch_client.batch_process(self.claims(5), output) == 5
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [r["claim_id"] for r in records] == ["0", "1", "2", "3", "4"]
+
+    def test_bucketed_batch_groups_versions_and_keeps_order(self, client, monkeypatch):
+        calls = []
+
+        def process(claim, drg_version=None, *args, poa_exempt=False, **kwargs):
+            calls.append((drg_version, poa_exempt))
+            if claim.claimid == "bad":
+                raise ValueError("Invalid date format for claim.thru_date")
+            return MsdrgOutput(claim_id=claim.claimid, drg_version=drg_version)
+
+        monkeypatch.setattr(client, "process", process)
+        dates = ["2024-11-01", "2024-05-01", "2024-12-01", "2024-06-01", "2024-11-15"]
+        claims = [Claim(claimid=str(i), thru_date=d) for i, d in enumerate(dates)]
+        claims.insert(2, Claim(claimid="bad"))
+
+        def hospital_status(claim):
+            if claim.claimid == "4":
+                return MsdrgHospitalStatusOptionFlag.EXEMPT
+            return MsdrgHospitalStatusOptionFlag.NON_EXEMPT
+
+        output = io.StringIO()
+        written = client.batch_process(
+            claims, output, hospital_status=hospital_status, bucket_window=4
+        )
+        assert written == 5
+        # First window: 0, 1, bad, 2; second window: 3, 4
+        assert calls == [
+            (None, False),
+            ("411", False),
+            ("420", False),
+            ("420", False),
+            ("411", False),
+            ("420", True),
+        ]
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [r["claim_id"] for r in records] == ["0", "1", "2", "3", "4"]
+
+        calls.clear()
+        client.batch_process(claims[:1], io.StringIO(), hospital_status=hospital_status)
+        assert calls == [(None, False)]
+        with pytest.raises(ValueError):
+            client.batch_process(claims, io.StringIO(), bucket_window=0)
+
+    @pytest.mark.parametrize("bucket_window", [None, 3])
+    def test_failing_hospital_status_is_that_claims_error(
+        self, batch_client, bucket_window
+    ):
+
+        def hospital_status(claim):
+            if claim.claimid == "2":
+                raise KeyError("no provider for claim 2")
+            return MsdrgHospitalStatusOptionFlag.NON_EXEMPT
+
+        output = io.StringIO()
+        stats = batch_client.batch_process_with_stats(
+            self.claims(5),
+            output,
+            hospital_status=hospital_status,
+            bucket_window=bucket_window,
+        )
+        assert stats["total_claims"] == 5
+        assert stats["failed_claims"] == 1
+        assert stats["errors"][0]["claim_id"] == "2"
+        assert stats["error_types"] == {"KeyError": 1}
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [r["claim_id"] for r in records] == ["0", "1", "3", "4"]
@@ -0,0 +1,112 @@
+"""
+Tests for the MS-DRG input path and its cache of Java code objects.
+
+Python stand-ins replace the Java enums and code classes so the conversion can
+be tested without a JVM.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from pydrg.converter.icd_converter import ICD10ConvertOutput
+from pydrg.input.claim import Claim, DiagnosisCode, Patient, ProcedureCode
+
+
+class FakeCode:
+    created = 0
+
+    def __init__(self, *args):
+        FakeCode.created += 1
+        self.args = args
+
+
+@pytest.fixture
+def make_client(make_drg_client, fake_jvm):
+    fake_jvm.classes.update(
+        {
+            "com.mmm.his.cer.foundation.model.GfcPoa": SimpleNamespace(
+                Y="Y", N="N", U="U", W="W"
+            ),
+            "gov.agency.msdrg.model.v2.enumeration.MsdrgSex": SimpleNamespace(
+                MALE="M", FEMALE="F", UNKNOWN="U"
+            ),
+            "gov.agency.msdrg.model.v2.enumeration.MsdrgDischargeStatus": SimpleNamespace(
+                getEnumFromInt=lambda value: value
+            ),
+            "gov.agency.msdrg.model.v2.transfer.input.MsdrgInputDxCode": FakeCode,
+            "gov.agency.msdrg.model.v2.transfer.input.MsdrgInputPrCode": FakeCode,
+        }
+    )
+
+    def make(input_cache_size=50_000):
+        client = make_drg_client(input_cache_size=input_cache_size)
+        FakeCode.created = 0
+        return client
+
+    return make
+
+
+def make_claim():
+    return Claim(
+        claimid="1",
+        patient=Patient(age=70, sex="F"),
+        patient_status="01",
+        principal_dx=DiagnosisCode(code="I50.20"),
+        secondary_dxs=[
+            DiagnosisCode(code="E87.1", poa="N"),
+            DiagnosisCode(code="I50.20", poa="Y"),
+            DiagnosisCode(code="Z79.01", poa="1"),
+        ],
+        inpatient_pxs=[ProcedureCode(code="02HV33Z"), ProcedureCode(code="02HV33Z")],
+    )
+
+
+class TestInputCodeCache:
+    """Test that Java code objects are reused across claims."""
+
+    def test_codes_are_built_once(self, make_client):
+        client = make_client()
+        parts = client.convert_claim(make_claim())
+        assert parts.secondary_codes == ["E871", "I5020", "Z7901"]
+        # Exempt POA values fall back to U
+        assert parts.secondary_poas == ["N", "Y", "U"]
+        assert parts.secondary_dxs[0].args == ("E871", "N")
+        # The principal and the POA "Y" secondary diagnosis share one object
+        assert parts.principal_dx is parts.secondary_dxs[1]
+        assert parts.procedures[0] is parts.procedures[1]
+        assert FakeCode.created == 4
+
+        again = client.convert_claim(make_claim())
+        assert FakeCode.created == 4
+        assert again.secondary_dxs == parts.secondary_dxs
+
+    def test_mapped_codes(self, make_client):
+        client = make_client()
+        mappings = ICD10ConvertOutput.model_validate(
+            {"mappings": {"E871": {"conversion_choices": ["E8710"]}}}
+        )
+        parts = client.convert_claim(make_claim(), mappings)
+        assert parts.secondary_codes[0] == "E8710"
+        assert parts.secondary_dxs[0].args == ("E8710", "N")
+        assert client.convert_claim(make_claim()).secondary_codes[0] == "E871"
+
+    @pytest.mark.parametrize("size", [0, 2])
+    def test_cache_size(self, make_client, size):
+        client = make_client(size)
+        client.convert_claim(make_claim())
+        client.convert_claim(make_claim())
+        assert len(client._dx_cache) <= size
+        assert FakeCode.created > 4
+        with pytest.raises(ValueError):
+            make_client(-1)
+
+    def test_least_recently_used_code_is_evicted(self, make_client):
+        client = make_client(2)
+        first = client._java_px("0JH60DZ")
+        client._java_px("02HV33Z")
+        assert client._java_px("0JH60DZ") is first
+        client._java_px("5A1955Z")
+        assert list(client._px_cache) == ["0JH60DZ", "5A1955Z"]
+        assert client._java_px("0JH60DZ") is first
+        assert FakeCode.created == 3
@@ -0,0 +1,283 @@
+"""
+Tests for lazy MS-DRG version loading.
+
+The Java components are replaced by a stand-in class so the version cache can
+be tested without a JVM.
+"""
+
+import gc
+import logging
+import threading
+import time
+import weakref
+from unittest.mock import MagicMock
+
+import pytest
+
+from pydrg.helpers.metrics import get_registry
+from pydrg.msdrg.drg_client import (
+    MSDRG_VERSION_EVICTIONS,
+    MSDRG_VERSION_LOAD_SECONDS,
+    DrgClient,
+    MarkingLogicTieBreaker,
+    MsdrgAffectDrgOptionFlag,
+    MsdrgHospitalStatusOptionFlag,
+)
+
+DEFAULT = (
+    MsdrgAffectDrgOptionFlag.COMPUTE,
+    MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE,
+)
+
+AVAILABLE = {"400", "401", "410", "411", "420"}
+
+
+class FakeComponent:
+    created = []
+
+    def __init__(self, options):
+        time.sleep(0.01)
+        self.options = options
+        FakeComponent.created.append(self)
+
+
+def component_class(name):
+    """``FakeJvm.missing``: MS-DRG components exist for the ``AVAILABLE`` versions."""
+    if not name.endswith(".MsdrgComponent"):
+        return MagicMock(name=name)
+    version = name.split(".")[3][1:]
+    if version not in AVAILABLE:
+        raise TypeError(f"Class {name} is not found")
+    return FakeComponent
+
+
+@pytest.fixture
+def make_client(make_drg_client, fake_jvm, monkeypatch):
+    fake_jvm.missing = component_class
+    # Runtime options are represented by their key
+    monkeypatch.setattr(DrgClient, "create_drg_options", lambda self, *options: options)
+    FakeComponent.created = []
+
+    def make(**kwargs):
+        return make_drg_client(**kwargs)
+
+    return make
+
+
+class TestLazyVersions:
+    """Test on-demand loading, LRU eviction and preloading."""
+
+    def test_versions_load_on_first_use(self, make_client):
+        client = make_client()
+        assert not client.drg_versions
+        components = client.load_drg_version("410")
+        assert set(components) == {(True, *DEFAULT), (False, *DEFAULT)}
+        assert components[(True, *DEFAULT)].options == (True, *DEFAULT)
+        assert client.load_drg_version("410") is components
+        assert list(client.drg_versions) == ["410"]
+        assert client.version_load_times["410"] > 0
+        assert (
+            get_registry().histogram(MSDRG_VERSION_LOAD_SECONDS, version="410").count
+            >= 1
+        )
+
+    def test_lru_eviction_keeps_preloaded(self, make_client):
+        before = get_registry().counter_value(MSDRG_VERSION_EVICTIONS, version="401")
+        client = make_client(max_versions=2, preload=["400"])
+        client.load_drg_version("401")
+        client.load_drg_version("410")
+        assert list(client.drg_versions) == ["400", "410"]
+        client.load_drg_version("411")
+        assert list(client.drg_versions) == ["400", "411"]
+        assert (
+            get_registry().counter_value(MSDRG_VERSION_EVICTIONS, version="401")
+            == before + 1
+        )
+
+    def test_unknown_version(self, make_client):
+        client = make_client()
+        with pytest.raises(ValueError, match="not available"):
+            client.load_drg_version("999")
+        with pytest.raises(ValueError, match="not available"):
+            client.load_drg_version("999")
+        with pytest.raises(ValueError):
+            make_client(max_versions=0)
+
+    def test_concurrent_first_use_loads_once(self, make_client):
+        client = make_client()
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(client.load_drg_version("420"))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(FakeComponent.created) == 2
+        assert all(result is results[0] for result in results)
+
+
+class TestComponentPool:
+    """Test the pool of components keyed by grouper options."""
+
+    def test_each_option_combination_gets_its_own_component(self, make_client):
+        client = make_client()
+        default = client.get_drg_component("420")
+        assert default.options == (False, *DEFAULT)
+        code_order = client.get_drg_component(
+            "420", True, logic_tiebreaker=MarkingLogicTieBreaker.CODE_ORDER
+        )
+        assert code_order.options == (
+            True,
+            MsdrgAffectDrgOptionFlag.COMPUTE,
+            MarkingLogicTieBreaker.CODE_ORDER,
+        )
+        assert code_order is not default
+        assert (
+            client.get_drg_component(
+                "420", True, logic_tiebreaker=MarkingLogicTieBreaker.CODE_ORDER
+            )
+            is code_order
+        )
+        assert client.get_drg_component("420") is default
+        with pytest.raises(ValueError):
+            client.get_drg_component("420", affect_drg="COMPUTE")
+
+    def test_reconfigure_changes_defaults_without_touching_components(
+        self, make_client
+    ):
+        client = make_client()
+        default = client.get_drg_component("410")
+        client.reconfigure(
+            "410",
+            MsdrgHospitalStatusOptionFlag.NON_EXEMPT,
+            MsdrgAffectDrgOptionFlag.DO_NOT_COMPUTE,
+            MarkingLogicTieBreaker.CODE_ORDER,
+        )
+        reconfigured = client.get_drg_component("410")
+        assert reconfigured is not default
+        assert default.options == (False, *DEFAULT)
+        assert reconfigured.options == (
+            False,
+            MsdrgAffectDrgOptionFlag.DO_NOT_COMPUTE,
+            MarkingLogicTieBreaker.CODE_ORDER,
+        )
+        # Explicit per-call options still win, other versions are unaffected
+        assert (
+            client.get_drg_component(
+                "410",
+                affect_drg=MsdrgAffectDrgOptionFlag.COMPUTE,
+                logic_tiebreaker=MarkingLogicTieBreaker.CLINICAL_SIGNIFICANCE,
+            )
+            is default
+        )
+        assert client.get_drg_component("411").options == (False, *DEFAULT)
+
+
+class TestThreadLocalComponents:
+    """Test that thread-local mode gives every thread its own components."""
+
+    def test_threads_get_their_own_components(self, make_client):
+        client = make_client(thread_local=True)
+        mine = client.get_drg_component("420")
+        assert client.get_drg_component("420") is mine
+
+        others = []
+        thread = threading.Thread(
+            target=lambda: others.extend(
+                [client.get_drg_component("420"), client.get_drg_component("420")]
+            )
+        )
+        thread.start()
+        thread.join()
+        assert others[0] is others[1]
+        assert others[0] is not mine
+        assert others[0].options == mine.options == (False, *DEFAULT)
+
+    def test_no_shared_components_are_built(self, make_client):
+        client = make_client(thread_local=True)
+        assert client.load_drg_version("420") == {}
+        assert FakeComponent.created == []
+        client.get_drg_component("420")
+        assert len(FakeComponent.created) == 1
+
+    def test_evicted_version_is_rebuilt(self, make_client):
+        client = make_client(max_versions=1, thread_local=True)
+        first = client.get_drg_component("410")
+        client.get_drg_component("411")
+        assert "410" not in client.drg_versions
+        assert client.get_drg_component("410") is not first
+
+    def test_eviction_frees_components_of_idle_threads(self, make_client):
+        client = make_client(max_versions=1, thread_local=True)
+        built, release = threading.Event(), threading.Event()
+        refs = []
+
+        def work():
+            refs.append(weakref.ref(client.get_drg_component("410")))
+            built.set()
+            # Stays alive without touching the client again
+            release.wait(5)
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        assert built.wait(5)
+        client.get_drg_component("411")
+        FakeComponent.created.clear()
+        gc.collect()
+        try:
+            assert refs[0]() is None
+        finally:
+            release.set()
+            thread.join()
+
+
+class TestStartupLoading:
+    """Test loading every version at startup."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_current_version_loads_first(
+        self, make_client, fake_jvm, monkeypatch, caplog, workers
+    ):
+        requested = []
+        missing = fake_jvm.missing
+
+        def requested_class(name):
+            if name.endswith(".MsdrgComponent"):
+                requested.append(name.split(".")[3][1:])
+            return missing(name)
+
+        fake_jvm.missing = requested_class
+        monkeypatch.setattr(DrgClient, "determine_end_version", lambda self: "411")
+        with caplog.at_level(logging.INFO, logger="DrgClient"):
+            client = make_client(load_all=True, load_workers=workers)
+        loaded = list(client.drg_versions)
+        assert requested[0] == "411"
+        assert sorted(loaded) == ["400", "401", "410", "411", "420"]
+        # "421" is probed after "420" and is not available
+        assert requested[-1] == "421"
+        assert client.wait_until_ready(timeout=0)
+        assert client.wait_until_ready(timeout=0, all_versions=True)
+        assert "Loaded DRG version 411" in caplog.text
+        assert "WARNING" not in caplog.text
+
+    def test_ready_is_set_before_older_versions_load(self, make_client, monkeypatch):
+        monkeypatch.setattr(DrgClient, "determine_end_version", lambda self: "420")
+        release = threading.Event()
+        load = DrgClient.load_drg_version
+
+        def slow_load(self, version):
+            if version != "420":
+                release.wait(5)
+            return load(self, version)
+
+        monkeypatch.setattr(DrgClient, "load_drg_version", slow_load)
+        client = make_client(load_all=True, background_load=True, load_workers=2)
+        assert client.wait_until_ready(timeout=5)
+        assert not client.loaded.is_set()
+        assert list(client.drg_versions) == ["420"]
+        release.set()
+        assert client.wait_until_ready(timeout=5, all_versions=True)
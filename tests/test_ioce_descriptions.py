@@ -0,0 +1,279 @@
+"""
+Tests for IOCE description lookups.
+
+A stand-in component returns descriptions built from its arguments and counts
+its calls, so the tests run without a JVM.
+"""
+
+import threading
+from collections import Counter
+
+import pytest
+
+from pydrg.helpers.metrics import get_registry
+from pydrg.ioce.description_store import IOCE_TABLE_CODES, IoceDescriptionStore
+from pydrg.ioce.ioce_client import IOCE_DESCRIPTION_CACHE
+from pydrg.ioce.ioce_output import (
+    IoceOutput,
+    IoceOutputDiagnosisCode,
+    IoceOutputEdit,
+    IoceOutputFlag,
+    IoceOutputLineItem,
+)
+
+
+class FakeComponent:
+    def __init__(self):
+        self.calls = Counter()
+
+    def __getattr__(self, method):
+        def describe(*args):
+            self.calls[method] += 1
+            return f"{method}:{'/'.join(str(a) for a in args)}"
+
+        return describe
+
+
+class SparseComponent(FakeComponent):
+    """Knows edits 1-100 only, like an IOCE release with gaps in its table."""
+
+    def getEditDescription(self, edit, internal_version):
+        self.calls["getEditDescription"] += 1
+        return f"Edit {edit}" if int(edit) <= 100 else ""
+
+
+@pytest.fixture
+def make_client(make_ioce_client):
+    def make(
+        size=100_000, store=None, thread_local=False, component_class=FakeComponent
+    ):
+        return make_ioce_client(
+            component_class,
+            description_cache_size=size,
+            description_store=store,
+            thread_local=thread_local,
+        )
+
+    return make
+
+
+def make_output(lines=50):
+    output = IoceOutput(claim_processed_flag="0")
+    output.processing_information.internal_version = 261
+    output.principal_diagnosis_code = IoceOutputDiagnosisCode(
+        diagnosis="R079", edit_list=[IoceOutputEdit(edit="0001")]
+    )
+    output.line_item_list = [
+        IoceOutputLineItem(
+            hcpcs="99283",
+            payment_apc="5023",
+            status_indicator="J2",
+            packaging_flag=IoceOutputFlag(flag="0"),
+            payment_adjustment_flag01=IoceOutputFlag(flag="0"),
+            payment_adjustment_flag02=IoceOutputFlag(flag="0"),
+            hcpcs_edit_list=[IoceOutputEdit(edit="0046"), IoceOutputEdit(edit="0001")],
+        )
+        for _ in range(lines)
+    ]
+    return output
+
+
+class TestDescriptionCache:
+    """Test memoized description lookups."""
+
+    def test_repeated_codes_call_java_once(self, make_client):
+        client = make_client()
+        before = get_registry().counter_value(IOCE_DESCRIPTION_CACHE, result="hit")
+        output = client.append_descriptions(make_output())
+        calls = client.ioce_component.calls
+        assert calls["getHcpcsDescription"] == 1
+        assert calls["getEditDescription"] == 2
+        assert calls["getApcDescription"] == 1
+        line = output.line_item_list[-1]
+        assert line.hcpcs_description == "getHcpcsDescription:99283/261"
+        assert line.hcpcs_edit_list[0].description == "getEditDescription:46/261"
+        assert line.packaging_flag.description == "getPackagingFlagDescription:0/261"
+        assert output.principal_diagnosis_code.edit_list[0].description == (
+            "getEditDescription:1/261"
+        )
+
+        first_misses = client.description_cache_stats()["misses"]
+        client.append_descriptions(make_output())
+        stats = client.description_cache_stats()
+        assert stats["misses"] == first_misses
+        assert stats["hit_rate"] > 0.9
+        assert sum(calls.values()) == first_misses
+        after = get_registry().counter_value(IOCE_DESCRIPTION_CACHE, result="hit")
+        assert after - before == stats["hits"]
+
+    def test_internal_version_is_part_of_the_key(self, make_client):
+        client = make_client()
+        client.append_descriptions(make_output(1))
+        other = make_output(1)
+        other.processing_information.internal_version = 262
+        client.append_descriptions(other)
+        assert client.ioce_component.calls["getHcpcsDescription"] == 2
+        assert other.line_item_list[0].hcpcs_description.endswith("/262")
+
+    @pytest.mark.parametrize("size", [0, 3])
+    def test_cache_size(self, make_client, size):
+        client = make_client(size)
+        client.append_descriptions(make_output(2))
+        assert client.description_cache_stats()["size"] <= size
+        client.clear_description_cache()
+        assert client.description_cache_stats()["size"] == 0
+        with pytest.raises(ValueError):
+            make_client(-1)
+
+
+class TestDescriptionStore:
+    """Test the on-disk description dictionary."""
+
+    @pytest.fixture
+    def jar(self, tmp_path):
+        jar = tmp_path / "ioce-standalone.jar"
+        jar.write_bytes(b"v1")
+        return jar
+
+    def test_new_worker_reads_descriptions_without_java(
+        self, make_client, tmp_path, jar
+    ):
+        path = str(tmp_path / "descriptions.db")
+        warm = make_client(store=IoceDescriptionStore(path, [str(jar)]))
+        written = warm.export_descriptions(
+            [261], hcpcs=["99283"], apcs=["5023"], diagnoses=["R079"]
+        )
+        assert written > len(IOCE_TABLE_CODES["edit"])
+
+        cold = make_client(store=IoceDescriptionStore(path, [str(jar)]))
+        output = cold.append_descriptions(make_output())
+        assert sum(cold.ioce_component.calls.values()) == 0
+        assert (
+            output.line_item_list[0].hcpcs_description
+            == "getHcpcsDescription:99283/261"
+        )
+        assert output.line_item_list[0].hcpcs_edit_list[0].description == (
+            "getEditDescription:46/261"
+        )
+        stats = cold.description_cache_stats()
+        assert stats["misses"] == 0 and stats["store_hits"] > 0
+
+    def test_misses_are_written_through(self, make_client, tmp_path, jar):
+        path = str(tmp_path / "descriptions.db")
+        first = make_client(store=IoceDescriptionStore(path, [str(jar)]))
+        first.append_descriptions(make_output(1))
+        assert first.ioce_component.calls["getDiagnosisDescription"] == 1
+
+        second = make_client(store=IoceDescriptionStore(path, [str(jar)]))
+        second.append_descriptions(make_output(1))
+        assert sum(second.ioce_component.calls.values()) == 0
+        assert second.description_store.versions() == [0, 261]
+
+    def test_claim_misses_are_stored_in_one_write(self, make_client, tmp_path, jar):
+        store = IoceDescriptionStore(str(tmp_path / "descriptions.db"), [str(jar)])
+        writes = []
+        put_many = store.put_many
+        store.put_many = lambda rows: writes.append(list(rows)) or put_many(rows)
+        client = make_client(store=store)
+        client.append_descriptions(make_output(3))
+        assert len(writes) == 1
+        assert len(writes[0]) == client.description_cache_stats()["misses"] > 1
+        assert len(store) == len(writes[0])
+
+        client.append_descriptions(make_output(3))
+        assert len(writes) == 1
+
+    def test_store_is_rebuilt_when_the_jar_changes(self, make_client, tmp_path, jar):
+        path = str(tmp_path / "descriptions.db")
+        store = IoceDescriptionStore(path, [str(jar)])
+        store.put(261, "hcpcs", "99283", "Emergency dept visit")
+        store.close()
+        assert len(IoceDescriptionStore(path, [str(jar)])) == 1
+
+        jar.write_bytes(b"version 2")
+        store = IoceDescriptionStore(path, [str(jar)])
+        assert len(store) == 0
+        assert store.get(261, "hcpcs", "99283") is None
+
+    def test_unknown_codes_are_not_stored(self, make_client, tmp_path, jar):
+        store = IoceDescriptionStore(str(tmp_path / "descriptions.db"), [str(jar)])
+        client = make_client(store=store, component_class=SparseComponent)
+        client.export_descriptions([261])
+        assert store.get(261, "edit", "50") == "Edit 50"
+        assert store.get(261, "edit", "150") is None
+        unknown_edits = len(IOCE_TABLE_CODES["edit"]) - 100
+        assert len(store) == sum(map(len, IOCE_TABLE_CODES.values())) - unknown_edits
+
+        assert client.describe("edit", "0150", 261) == ""
+        assert store.get(261, "edit", "150") is None
+
+    def test_export_needs_a_store(self, make_client):
+        with pytest.raises(RuntimeError):
+            make_client().export_descriptions([261])
+
+
+class TestLazyDescriptions:
+    """Test descriptions resolved on read or serialization."""
+
+    def test_nothing_is_looked_up_until_read(self, make_client):
+        client = make_client()
+        output = client.append_descriptions(make_output(3), lazy=True)
+        calls = client.ioce_component.calls
+        assert sum(calls.values()) == 0
+
+        line = output.line_item_list[1]
+        assert line.hcpcs == "99283"
+        assert line.payment_apc == "5023"
+        assert sum(calls.values()) == 0
+        assert line.hcpcs_description == "getHcpcsDescription:99283/261"
+        assert dict(calls) == {"getHcpcsDescription": 1}
+        assert output.line_item_list[2].hcpcs_description == line.hcpcs_description
+        assert dict(calls) == {"getHcpcsDescription": 1}
+        assert client.description_cache_stats()["hits"] == 1
+
+    def test_serialization_matches_eager(self, make_client):
+        eager = make_client().append_descriptions(make_output(3))
+        lazy = make_client().append_descriptions(make_output(3), lazy=True)
+        assert lazy.model_dump_json() == eager.model_dump_json()
+        assert lazy == eager
+
+    def test_assigned_values_and_copies(self, make_client):
+        output = make_client().append_descriptions(make_output(1), lazy=True)
+        line = output.line_item_list[0]
+        line.hcpcs_description = "Set by caller"
+        copy = line.model_copy()
+        assert (
+            copy.status_indicator_description == "getStatusIndicatorDescription:J2/261"
+        )
+        assert line.status_indicator_description == copy.status_indicator_description
+        assert line.model_dump()["hcpcs_description"] == "Set by caller"
+
+
+class TestThreadLocalComponents:
+    """Test that thread-local mode gives every thread its own component."""
+
+    def test_threads_use_their_own_components(self, make_client):
+        client = make_client(size=0, thread_local=True)
+        mine = client.get_component()
+        assert client.get_component() is mine
+        # The component built by __init__ belongs to the constructing thread
+        assert mine is client.ioce_component
+
+        components = []
+
+        def work():
+            components.append(client.get_component())
+            client.append_descriptions(make_output(2))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(component) for component in components}) == 4
+        assert all(sum(c.calls.values()) > 0 for c in components)
+        assert sum(mine.calls.values()) == 0
+
+    def test_shared_component_by_default(self, make_client):
+        client = make_client()
+        assert client.get_component() is client.ioce_component
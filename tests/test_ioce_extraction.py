@@ -0,0 +1,148 @@
+"""
+Tests for IOCE output extraction profiles.
+
+Mocks stand in for the Java OceClaim and its line items so the tests can
+check which getters each profile calls without a JVM.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from pydrg.ioce.ioce_output import IoceExtractionProfile, IoceOutput
+
+# Line getters read by OppsClient.create_input_claim and FqhcClient.create_input_claim
+PRICING_LINE_GETTERS = {
+    "getActionFlagOutput",
+    "getPaymentMethodFlag",
+    "getStatusIndicator",
+    "getHcpcsApc",
+    "getPaymentApc",
+    "getPackagingFlag",
+    "getPaymentAdjustmentFlag01",
+    "getPaymentAdjustmentFlag02",
+    "getUnitsOutput",
+    "getDiscountingFormula",
+}
+REPORT_CLAIM_GETTERS = {
+    "getClaimRejectionEditList",
+    "getLineDenialEditList",
+    "getPrincipalDiagnosisCode",
+    "getSecondaryDiagnosisCodeList",
+    "getValueCodeOutputList",
+}
+REPORT_LINE_GETTERS = {
+    "getActionFlagInput",
+    "getHcpcsModifierInputList",
+    "getHcpcsEditList",
+    "getRevenueEditList",
+    "getServiceDateEditList",
+}
+
+
+def java_line():
+    line = MagicMock()
+    line.getServiceDate.return_value = "20250115"
+    line.getHcpcs.return_value = "99283"
+    line.getUnitsInput.return_value = "1"
+    line.getCharge.return_value = "350.00"
+    line.getUnitsOutput.return_value = "1"
+    line.getDiscountingFormula.return_value = "1"
+    line.getStatusIndicator.return_value = "J2"
+    line.getPaymentApc.return_value = "5023"
+    line.getPackagingFlag.return_value = "0"
+    line.getHcpcsEditList.return_value = ["46"]
+    return line
+
+
+def java_claim(lines=2):
+    java = MagicMock()
+    java.getProcessingInformation.return_value = None
+    java.getLineItemList.return_value = [java_line() for _ in range(lines)]
+    java.getClaimRejectionEditList.return_value = ["1", "2"]
+    java.getSecondaryDiagnosisCodeList.return_value = []
+    java.getReasonForVisitDiagnosisCodeList.return_value = []
+    java.getValueCodeOutputList.return_value = []
+    return java
+
+
+def called_getters(java):
+    return {name for name, _, _ in java.method_calls if name.startswith("get")}
+
+
+class TestExtractionProfiles:
+    """Test that the pricing profile only reads what the pricers use."""
+
+    def test_pricing_skips_the_edit_report(self):
+        java = java_claim()
+        output = IoceOutput().from_java(java, "pricing")
+        claim_getters = called_getters(java)
+        assert not claim_getters & REPORT_CLAIM_GETTERS
+        assert output.claim_rejection_edit_list == []
+
+        line = output.line_item_list[0]
+        assert (line.hcpcs, line.status_indicator, line.payment_apc) == (
+            "99283",
+            "J2",
+            "5023",
+        )
+        assert (line.units_output, line.discounting_formula) == (1, 1)
+        assert line.packaging_flag.flag == "0"
+        line_getters = called_getters(java.getLineItemList.return_value[0])
+        assert PRICING_LINE_GETTERS <= line_getters
+        assert not line_getters & REPORT_LINE_GETTERS
+        assert line.hcpcs_edit_list == []
+
+    def test_full_is_the_default(self):
+        java = java_claim()
+        output = IoceOutput().from_java(java)
+        assert REPORT_CLAIM_GETTERS - {"getValueCodeOutputList"} <= called_getters(java)
+        assert [edit.edit for edit in output.claim_rejection_edit_list] == ["1", "2"]
+        line_getters = called_getters(java.getLineItemList.return_value[0])
+        assert REPORT_LINE_GETTERS <= line_getters
+        assert output.line_item_list[0].hcpcs_edit_list[0].edit == "46"
+
+    def test_pricing_fields_match_full(self):
+        java = java_claim()
+        pricing = IoceOutput().from_java(java, IoceExtractionProfile.PRICING)
+        full = IoceOutput().from_java(java)
+        for field in (
+            "service_date",
+            "revenue_code",
+            "units_input",
+            "charge",
+            "action_flag_output",
+            "payment_method_flag",
+            "hcpcs_apc",
+            "payment_apc",
+            "payment_indicator",
+            "composite_adjustment_flag",
+            "hcpcs_modifier_output_list",
+            "packaging_flag",
+            "payment_adjustment_flag01",
+        ):
+            assert getattr(pricing.line_item_list[1], field) == getattr(
+                full.line_item_list[1], field
+            )
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            IoceOutput().from_java(java_claim(), "summary")
+
+
+class TestClientProfile:
+    """Test the per-call profile of IoceClient.process."""
+
+    def test_pricing_profile_skips_descriptions(self, make_ioce_client, fake_jvm):
+        ioce_claim_class = MagicMock()
+        ioce_claim_class.return_value.getModel.return_value = java_claim(1)
+        fake_jvm.classes["gov.cms.oce.IoceClaim"] = ioce_claim_class
+        client = make_ioce_client()
+        client.create_oce_claim = MagicMock()
+        client.append_descriptions = MagicMock(side_effect=lambda output, lazy: output)
+
+        output = client.process(MagicMock(), profile="pricing")
+        client.append_descriptions.assert_not_called()
+        assert output.line_item_list[0].hcpcs == "99283"
+        client.process(MagicMock())
+        client.append_descriptions.assert_called_once()
@@ -0,0 +1,99 @@
+"""
+Tests for the metrics registry and stage timers.
+
+These tests exercise the pure Python metrics helpers and do not need a JVM.
+"""
+
+import pytest
+
+from pydrg.helpers.metrics import (
+    STAGE_ERRORS,
+    STAGE_SECONDS,
+    LatencyHistogram,
+    MetricsRegistry,
+    collect_timings,
+    get_registry,
+    stage_timer,
+)
+
+
+class TestLatencyHistogram:
+    """Test bucketing and percentile estimation."""
+
+    def test_percentiles_within_observed_range(self):
+        histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+        for value in [0.005] * 90 + [0.5] * 10:
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100
+        assert snapshot["min"] == 0.005
+        assert snapshot["max"] == 0.5
+        assert snapshot["p50"] <= 0.01
+        assert 0.1 <= snapshot["p99"] <= 0.5
+        assert snapshot["buckets"] == {"0.01": 90, "0.1": 0, "1.0": 10, "+Inf": 0}
+
+    def test_empty_histogram(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        assert histogram.snapshot()["min"] == 0.0
+
+
+class TestMetricsRegistry:
+    """Test counters, histograms and the exported formats."""
+
+    def test_snapshot_and_prometheus(self):
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        registry.inc("claims_total", status="ok")
+        registry.inc("claims_total", 2, status="ok")
+        registry.observe("stage_seconds", 0.05, module="msdrg", stage="java")
+
+        snapshot = registry.snapshot()
+        assert snapshot["counters"]["claims_total"] == [
+            {"labels": {"status": "ok"}, "value": 3}
+        ]
+        [series] = snapshot["histograms"]["stage_seconds"]
+        assert series["labels"] == {"module": "msdrg", "stage": "java"}
+        assert series["count"] == 1
+
+        text = registry.to_prometheus()
+        assert "# TYPE claims_total counter" in text
+        assert 'claims_total{status="ok"} 3' in text
+        assert 'stage_seconds_bucket{module="msdrg",stage="java",le="0.1"} 1' in text
+        assert 'stage_seconds_bucket{module="msdrg",stage="java",le="+Inf"} 1' in text
+        assert 'stage_seconds_count{module="msdrg",stage="java"} 1' in text
+
+    def test_disabled_registry_records_nothing(self):
+        registry = MetricsRegistry()
+        registry.enabled = False
+        registry.inc("claims_total")
+        registry.observe("stage_seconds", 0.1)
+        assert registry.snapshot() == {"counters": {}, "histograms": {}}
+
+
+class TestStageTimer:
+    """Test the stage timer used by the clients."""
+
+    def setup_method(self):
+        get_registry().reset()
+
+    def test_collects_per_claim_timings(self):
+        with collect_timings() as timings:
+            with stage_timer("ipps", "input"):
+                pass
+            with stage_timer("ipps", "java"):
+                pass
+        assert set(timings["ipps"]) == {"input", "java"}
+
+        # Outside collect_timings only the registry is updated
+        with stage_timer("ipps", "java"):
+            pass
+        histogram = get_registry().histogram(STAGE_SECONDS, module="ipps", stage="java")
+        assert histogram.count == 2
+
+    def test_counts_errors(self):
+        with pytest.raises(ValueError):
+            with stage_timer("opps", "output"):
+                raise ValueError("boom")
+        registry = get_registry()
+        assert registry.counter_value(STAGE_ERRORS, module="opps", stage="output") == 1
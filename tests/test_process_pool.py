@@ -0,0 +1,192 @@
+"""
+Tests for the multi-process Pypps engine.
+
+The worker target is swapped for one that runs the real worker loop around a
+stand-in Pypps, so start-up, chunked IPC, ordering and worker failures are
+tested without a JVM. Only the round trip test needs the CMS JARs.
+"""
+
+import os
+import queue
+import time
+
+import pytest
+
+from pydrg.helpers.claim_examples import claim_example
+from pydrg.input.claim import Claim, Modules
+from pydrg.pypps import process_pool
+from pydrg.pypps.process_pool import PyppsProcessPool
+from pydrg.pypps.pypps import PyppsOutput
+
+from .conftest import jars_dir, project_root_dir
+
+
+class FakePypps:
+    """Stand-in for Pypps inside a worker; records what it does per process."""
+
+    def __init__(self, record_dir=None, fail=False, **kwargs):
+        if fail:
+            raise RuntimeError("no JARs")
+        self.record_dir = record_dir
+
+    def setup_clients(self):
+        pass
+
+    def _record(self, line):
+        if self.record_dir:
+            with open(os.path.join(self.record_dir, f"{os.getpid()}.log"), "a") as f:
+                f.write(f"{line}\n")
+
+    def _process_safe(self, claim, slow=None, **kwargs):
+        self._record(claim.claimid)
+        if claim.claimid == "die":
+            os._exit(1)
+        time.sleep((slow or {}).get(claim.claimid, 0))
+        return PyppsOutput(claim_id=claim.claimid)
+
+    def cleanup(self):
+        self._record("cleanup")
+
+
+def stub_worker(*args):
+    process_pool.Pypps = FakePypps
+    process_pool._worker_main(*args)
+
+
+def claims(prefix, count):
+    return [Claim(claimid=f"{prefix}{i}") for i in range(count)]
+
+
+def claim_ids(outputs):
+    return [output.claim_id for output in outputs]
+
+
+@pytest.fixture
+def stub_target(monkeypatch):
+    monkeypatch.setattr(process_pool, "_worker_main", stub_worker)
+
+
+@pytest.fixture(scope="class")
+def pool():
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(process_pool, "_worker_main", stub_worker)
+        with PyppsProcessPool(processes=2, chunk_size=1, start_timeout=60) as pool:
+            yield pool
+
+
+class TestWorkerLifecycle:
+    """Test spawn start-up, warm-up and shutdown."""
+
+    def test_warmup_runs_before_claims_and_cleanup_on_shutdown(
+        self, stub_target, tmp_path
+    ):
+        with PyppsProcessPool(
+            processes=2,
+            chunk_size=2,
+            warmup_claims=[Claim(claimid="warm")],
+            start_timeout=60,
+            record_dir=str(tmp_path),
+        ) as pool:
+            assert all(worker.is_alive() for worker in pool._workers)
+            assert claim_ids(pool.process_many(claims("c", 6))) == [
+                f"c{i}" for i in range(6)
+            ]
+        assert pool._workers == []
+
+        logs = [path.read_text().split() for path in tmp_path.iterdir()]
+        assert len(logs) == 2
+        assert all(log[0] == "warm" and log[-1] == "cleanup" for log in logs)
+        assert sorted(c for log in logs for c in log[1:-1]) == [
+            f"c{i}" for i in range(6)
+        ]
+
+    def test_failed_start_raises(self, stub_target):
+        pool = PyppsProcessPool(processes=1, start_timeout=60, fail=True)
+        with pytest.raises(RuntimeError, match="failed to start: no JARs"):
+            pool.start()
+        assert not pool._started
+
+    def test_invalid_claim_is_reported_with_its_id(self, monkeypatch):
+        monkeypatch.setattr(process_pool, "Pypps", FakePypps)
+        tasks, results = queue.Queue(), queue.Queue()
+        payloads = [
+            '{"claimid": "bad", "los": "many"}',
+            "not json",
+            Claim(claimid="ok").model_dump_json(),
+        ]
+        tasks.put((0, payloads, {}))
+        tasks.put(None)
+        process_pool._worker_main(0, {}, [], tasks, results)
+        assert results.get_nowait()[0] == "ready"
+        _, chunk_id, outputs = results.get_nowait()
+        outputs = [PyppsOutput.model_validate_json(output) for output in outputs]
+        assert [output.claim_id for output in outputs] == ["bad", None, "ok"]
+        assert outputs[0].error.startswith("Invalid claim")
+        assert outputs[1].error.startswith("Invalid claim")
+        assert outputs[2].error is None
+
+    def test_chunk_size_must_be_positive(self):
+        with pytest.raises(ValueError):
+            PyppsProcessPool(chunk_size=0)
+
+
+class TestProcessMany:
+    """Test chunked IPC, ordering, backpressure and run isolation."""
+
+    def test_results_follow_input_order(self, pool):
+        outputs = list(pool.process_many(claims("c", 8), slow={"c0": 0.5}))
+        assert claim_ids(outputs) == [f"c{i}" for i in range(8)]
+
+    def test_unordered_yields_completed_chunks_first(self, pool):
+        ids = claim_ids(
+            pool.process_many(claims("c", 8), ordered=False, slow={"c0": 0.5})
+        )
+        assert sorted(ids) == sorted(f"c{i}" for i in range(8))
+        assert ids[0] != "c0"
+
+    def test_claims_are_consumed_lazily(self, pool):
+        pulled = []
+
+        def source():
+            for claim in claims("c", 40):
+                pulled.append(claim.claimid)
+                yield claim
+
+        outputs = pool.process_many(source())
+        assert next(outputs).claim_id == "c0"
+        assert len(pulled) <= pool.max_chunks_in_flight * pool.chunk_size
+        assert len(list(outputs)) == 39
+
+    def test_abandoned_run_does_not_leak_into_the_next(self, pool):
+        first = pool.process_many(claims("a", 6), slow={"a0": 0.3, "a3": 0.3})
+        assert next(first).claim_id == "a0"
+        first.close()
+        assert claim_ids(pool.process_many(claims("b", 6))) == [
+            f"b{i}" for i in range(6)
+        ]
+
+    def test_worker_dying_mid_run_raises(self, stub_target):
+        with PyppsProcessPool(processes=2, chunk_size=1, start_timeout=60) as pool:
+            outputs = pool.process_many(
+                claims("c", 2) + [Claim(claimid="die")] + claims("d", 4)
+            )
+            with pytest.raises(RuntimeError, match="exited unexpectedly"):
+                list(outputs)
+        assert pool._workers == []
+
+
+def test_round_trip_matches_in_process(pypps_or_skip):
+    claim = claim_example()
+    claim.modules = [Modules.MCE, Modules.MSDRG]
+    expected = pypps_or_skip.process(claim)
+    with PyppsProcessPool(
+        processes=1,
+        build_jar_dirs=False,
+        jar_path=jars_dir(),
+        db_path=os.path.join(project_root_dir(), "data", "pypps.db"),
+        build_db=False,
+    ) as pool:
+        [output] = list(pool.process_many([claim]))
+    assert output.model_dump(exclude={"timings"}) == expected.model_dump(
+        exclude={"timings"}
+    )
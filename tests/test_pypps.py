@@ -1,4 +1,3 @@
-import os
 from datetime import datetime
 import pytest
 
@@ -16,66 +15,7 @@ from pydrg.input import (
     OasisAssessment,
     Modules,
 )
-from pydrg.pypps import Pypps
-
-
-def project_root_dir():
-    return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-
-
-def jars_dir():
-    return os.path.join(project_root_dir(), "jars")
-
-
-def pricers_dir():
-    return os.path.join(jars_dir(), "pricers")
-
-
-def _file_exists(dir_path, name_substring):
-    if not os.path.exists(dir_path):
-        return False
-    try:
-        for f in os.listdir(dir_path):
-            if f.endswith(".jar") and name_substring in f:
-                return True
-    except Exception:
-        return False
-    return False
-
-
-def base_jars_present():
-    d = jars_dir()
-    # Require core runtime deps and at least one of the main components
-    required_substrings = [
-        "gfc-base-api",
-        "protobuf-java",
-        "slf4j-",
-    ]
-    return all(_file_exists(d, s) for s in required_substrings)
-
-
-def pricer_available(name_substring):
-    return _file_exists(pricers_dir(), name_substring)
-
-
-@pytest.fixture(scope="module")
-def pypps_or_skip():
-    if not base_jars_present():
-        pytest.skip(
-            "Required runtime JARs not found in ./jars. Populate real CMS jars to run integration tests."
-        )
-
-    jar_path = jars_dir()
-    db_path = os.path.join(project_root_dir(), "data", "pypps.db")
-
-    pypps = Pypps(
-        build_jar_dirs=False, jar_path=jar_path, db_path=db_path, build_db=False
-    )
-    pypps.setup_clients()
-    try:
-        yield pypps
-    finally:
-        pypps.cleanup()
+from .conftest import pricer_available
 
 
 def test_mce_process_example_claim(pypps_or_skip):
@@ -328,3 +268,52 @@ def test_hhag_grouper(pypps_or_skip):
     claim.oasis_assessment.ambulation = "3"
     output = pypps_or_skip.hhag_client.process(claim)
     assert hasattr(output, "model_dump")
+
+
+def test_msdrg_thread_local_parallel_outputs_match(pypps_or_skip):
+    import json
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pydrg.input import Claim
+    from pydrg.msdrg import DrgClient
+    from .conftest import project_root_dir
+
+    path = os.path.join(project_root_dir(), "example_data", "claims.jsonl")
+    with open(path) as f:
+        claims = [Claim.model_validate_json(line) for line in f if line.strip()]
+    client = DrgClient(thread_local=True)
+
+    def grouped(claim):
+        try:
+            return json.loads(client.process(claim).model_dump_json())
+        except Exception as e:
+            return {"error": str(e)}
+
+    expected = [grouped(claim) for claim in claims]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(5):
+            assert list(executor.map(grouped, claims * 4)) == expected * 4
+
+
+def test_ioce_thread_local_parallel_outputs_match(pypps_or_skip):
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pydrg.helpers.claim_examples import opps_claim_example
+    from pydrg.ioce import IoceClient
+
+    client = IoceClient(thread_local=True)
+    claims = [opps_claim_example() for _ in range(8)]
+
+    def edited(claim):
+        output = json.loads(client.process(claim).model_dump_json())
+        # Timestamps differ from run to run
+        output["processing_information"].pop("time_started", None)
+        output["processing_information"].pop("time_ended", None)
+        return output
+
+    expected = [edited(claim) for claim in claims]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(5):
+            assert list(executor.map(edited, claims * 4)) == expected * 4
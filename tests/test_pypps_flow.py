@@ -0,0 +1,355 @@
+"""
+Tests for how Pypps builds its clients and schedules the modules of a claim.
+
+The database manager and JVM start-up are stubbed and stand-in clients record
+when they run, so the flow is tested without CMS JARs.
+"""
+
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from pydrg.input.claim import Claim, Modules
+from pydrg.ioce.ioce_output import IoceExtractionProfile, IoceOutput, IoceOutputLineItem
+from pydrg.msdrg.msdrg_output import MsdrgOutput
+from pydrg.pricers.ipps import IppsOutput
+from pydrg.pricers.opps import OppsOutput
+from pydrg.pypps import pypps as pypps_module
+from pydrg.pypps.pypps import MODULE_CLIENTS, Pypps, PyppsOutput
+from pydrg.pypps.result_cache import ResultCache
+
+
+class FakeDatabaseManager:
+    icd10_converter = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def make_pypps(monkeypatch, tmp_path):
+    monkeypatch.setattr(pypps_module, "DatabaseManager", FakeDatabaseManager)
+    monkeypatch.setattr(Pypps, "_setup_jvm", lambda self: None)
+    created = []
+
+    def make(**kwargs):
+        pypps = Pypps(
+            build_jar_dirs=False,
+            jar_path=str(tmp_path / "jars"),
+            db_path=str(tmp_path / "data" / "pypps.db"),
+            **kwargs,
+        )
+        created.append(pypps)
+        return pypps
+
+    yield make
+    for pypps in created:
+        pypps.cleanup()
+
+
+class StubClient:
+    """Returns ``output`` after ``delay`` seconds, logging start and end."""
+
+    def __init__(self, name, output, log, delay=0.0, barrier=None, error=None):
+        self.name = name
+        self.output = output
+        self.log = log
+        self.delay = delay
+        self.barrier = barrier
+        self.error = error
+        self.upstream = None
+        self.kwargs = None
+
+    def process(self, claim, upstream=None, **kwargs):
+        self.log.append(("start", self.name))
+        self.upstream = upstream
+        self.kwargs = kwargs
+        if self.barrier is not None:
+            # Only passes if the other module of the barrier runs at the same time
+            self.barrier.wait(timeout=5)
+        time.sleep(self.delay)
+        self.log.append(("end", self.name))
+        if self.error is not None:
+            raise self.error
+        return self.output
+
+    def close(self):
+        pass
+
+
+def install_clients(pypps, log, barrier=None, drg_error=None):
+    clients = {
+        Modules.MSDRG: StubClient(
+            "MSDRG", MsdrgOutput(final_drg_value="291"), log, 0.05, barrier, drg_error
+        ),
+        Modules.IOCE: StubClient(
+            "IOCE", IoceOutput(version="26.1"), log, 0.05, barrier
+        ),
+        Modules.IPPS: StubClient("IPPS", IppsOutput(), log),
+        Modules.OPPS: StubClient("OPPS", OppsOutput(), log),
+    }
+    for module, client in clients.items():
+        setattr(pypps, MODULE_CLIENTS[module][0], client)
+    return clients
+
+
+def flow_claim():
+    return Claim(
+        claimid="1",
+        modules=[Modules.MSDRG, Modules.IPPS, Modules.IOCE, Modules.OPPS],
+    )
+
+
+class TestModuleGraph:
+    """Test the concurrent scheduler behind ``module_workers``."""
+
+    def test_independent_modules_run_concurrently(self, make_pypps):
+        pypps = make_pypps(module_workers=4)
+        log = []
+        install_clients(pypps, log, barrier=threading.Barrier(2))
+        output = pypps.process(flow_claim())
+        assert output.error is None
+        assert output.msdrg.final_drg_value == "291"
+        assert output.ioce.version == "26.1"
+
+    def test_dependents_wait_for_their_upstream(self, make_pypps):
+        pypps = make_pypps(module_workers=4)
+        log = []
+        clients = install_clients(pypps, log)
+        output = pypps.process(flow_claim())
+        for upstream, dependent in (
+            (Modules.MSDRG, Modules.IPPS),
+            (Modules.IOCE, Modules.OPPS),
+        ):
+            assert log.index(("end", upstream.name)) < log.index(
+                ("start", dependent.name)
+            )
+        assert clients[Modules.IPPS].upstream is output.msdrg
+        assert clients[Modules.OPPS].upstream is output.ioce
+
+    def test_failed_upstream_skips_its_dependents(self, make_pypps):
+        pypps = make_pypps(module_workers=4)
+        log = []
+        install_clients(pypps, log, drg_error=RuntimeError("grouper failed"))
+        output = pypps._process_safe(flow_claim())
+        assert output.error == "grouper failed"
+        started = {name for event, name in log if event == "start"}
+        assert "IPPS" not in started
+        assert {"MSDRG", "IOCE", "OPPS"} <= started
+        with pytest.raises(RuntimeError, match="grouper failed"):
+            pypps.process(flow_claim())
+
+    def test_matches_sequential_flow(self, make_pypps):
+        outputs = []
+        for workers in (1, 4):
+            pypps = make_pypps(module_workers=workers)
+            install_clients(pypps, [])
+            outputs.append(pypps.process(flow_claim()).model_dump())
+        assert outputs[0] == outputs[1]
+
+
+class TestIoceProfile:
+    """Test the per-call IOCE extraction profile and whether IOCE output is kept."""
+
+    def test_full_output_is_kept_by_default(self, make_pypps):
+        pypps = make_pypps()
+        clients = install_clients(pypps, [])
+        output = pypps.process(flow_claim())
+        assert clients[Modules.IOCE].kwargs == {"profile": None}
+        assert output.ioce.version == "26.1"
+        assert clients[Modules.OPPS].upstream is output.ioce
+
+    def test_dropping_ioce_output_uses_the_pricing_profile(self, make_pypps):
+        pypps = make_pypps()
+        clients = install_clients(pypps, [])
+        output = pypps.process(flow_claim(), keep_ioce=False)
+        assert clients[Modules.IOCE].kwargs == {
+            "profile": IoceExtractionProfile.PRICING
+        }
+        assert clients[Modules.OPPS].upstream is clients[Modules.IOCE].output
+        assert output.ioce is None
+        assert output.opps is not None
+
+    def test_explicit_profile_wins(self, make_pypps):
+        pypps = make_pypps()
+        clients = install_clients(pypps, [])
+        output = pypps.process(flow_claim(), ioce_profile="full", keep_ioce=False)
+        assert clients[Modules.IOCE].kwargs == {"profile": IoceExtractionProfile.FULL}
+        assert output.ioce is None
+        pypps.process(flow_claim(), ioce_profile="pricing")
+        assert clients[Modules.IOCE].kwargs == {
+            "profile": IoceExtractionProfile.PRICING
+        }
+
+    def test_run_module_passes_the_profile_and_keys_the_cache(
+        self, make_pypps, monkeypatch
+    ):
+        pypps = make_pypps(result_cache=ResultCache())
+        clients = install_clients(pypps, [])
+        keys = []
+        key = pypps.result_cache.key
+        monkeypatch.setattr(
+            pypps.result_cache,
+            "key",
+            lambda module, claim, upstream, options: (
+                keys.append((module, options)) or key(module, claim, upstream, options)
+            ),
+        )
+        claim = flow_claim()
+        results = PyppsOutput(claim_id=claim.claimid)
+        pypps._run_module(Modules.IOCE, claim, results, IoceExtractionProfile.PRICING)
+        pypps._run_module(Modules.OPPS, claim, results)
+
+        assert clients[Modules.IOCE].kwargs == {
+            "profile": IoceExtractionProfile.PRICING
+        }
+        assert results.ioce is clients[Modules.IOCE].output
+        assert clients[Modules.OPPS].upstream is results.ioce
+        assert results.opps is clients[Modules.OPPS].output
+        assert (Modules.IOCE, {"ioce_profile": "pricing"}) in keys
+
+
+class DescribingComponent:
+    """Stand-in IoceComponent that counts its description lookups."""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def getHcpcsDescription(self, hcpcs, internal_version):
+        self.calls["getHcpcsDescription"] += 1
+        return f"HCPCS {hcpcs}"
+
+
+class TestCachedIoceOutput:
+    """Test that cached IOCE outputs keep their descriptions lazy."""
+
+    def test_descriptions_are_looked_up_only_when_read(
+        self, make_pypps, make_ioce_client, monkeypatch
+    ):
+        pypps = make_pypps(
+            result_cache=ResultCache(), ioce_options={"lazy_descriptions": True}
+        )
+        client = make_ioce_client(DescribingComponent, lazy_descriptions=True)
+
+        def process(claim, profile=None):
+            output = IoceOutput(line_item_list=[IoceOutputLineItem(hcpcs="99283")])
+            output.processing_information.internal_version = 261
+            return client.append_descriptions(output, lazy=True)
+
+        monkeypatch.setattr(client, "process", process)
+        pypps.ioce_client = client
+        claim = Claim(claimid="1", modules=[Modules.IOCE])
+        for _ in range(2):
+            results = PyppsOutput(claim_id=claim.claimid)
+            pypps._run_module(Modules.IOCE, claim, results)
+
+        assert pypps.result_cache.stats()["IOCE"]["hits"] == 1
+        assert sum(client.ioce_component.calls.values()) == 0
+        assert results.ioce.line_item_list[0].hcpcs_description == "HCPCS 99283"
+        assert client.ioce_component.calls == {"getHcpcsDescription": 1}
+
+
+class CountingClient:
+    """Stand-in client class that counts how often it is constructed."""
+
+    built = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).built += 1
+        time.sleep(0.05)
+
+    def process(self, claim, *args, **kwargs):
+        return type(self).__name__
+
+    def close(self):
+        pass
+
+
+def counting_client(monkeypatch, name):
+    client_class = type(name, (CountingClient,), {"built": 0})
+    monkeypatch.setattr(pypps_module, name, client_class)
+    return client_class
+
+
+class TestClientConstruction:
+    """Test lazy and allow-listed client construction."""
+
+    def test_lazy_clients_builds_nothing_up_front(self, make_pypps, monkeypatch):
+        classes = [
+            counting_client(monkeypatch, name)
+            for name in (
+                "DrgClient",
+                "MceClient",
+                "IoceClient",
+                "HhagClient",
+                "IrfgClient",
+            )
+        ]
+        pypps = make_pypps(lazy_clients=True)
+        pypps.setup_clients()
+        assert all(
+            getattr(pypps, attr) is None for attr, _, _ in MODULE_CLIENTS.values()
+        )
+        assert all(client_class.built == 0 for client_class in classes)
+
+    def test_concurrent_requests_build_a_client_once(self, make_pypps, monkeypatch):
+        mce_class = counting_client(monkeypatch, "MceClient")
+        pypps = make_pypps(lazy_clients=True)
+        start = threading.Barrier(8)
+        clients = []
+
+        def request():
+            start.wait(timeout=5)
+            clients.append(pypps.get_client(Modules.MCE))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert mce_class.built == 1
+        assert len({id(client) for client in clients}) == 1
+        assert clients[0] is pypps.mce_client
+
+    def test_module_outside_the_allow_list_is_unavailable(
+        self, make_pypps, monkeypatch
+    ):
+        counting_client(monkeypatch, "MceClient")
+        drg_class = counting_client(monkeypatch, "DrgClient")
+        pypps = make_pypps(modules=[Modules.MCE])
+        pypps.setup_clients()
+        assert pypps.mce_client is not None
+        assert pypps.drg_client is None
+
+        output = pypps.process(Claim(claimid="1", modules=[Modules.MCE, Modules.MSDRG]))
+        assert output.error == "DRG client not initialized"
+        assert output.mce == "MceClient"
+        assert output.msdrg is None
+        assert drg_class.built == 0
+
+    def test_unavailable_client_is_remembered(self, make_pypps, monkeypatch):
+        pypps = make_pypps(lazy_clients=True)
+        calls = []
+        setup_pricer = pypps.setup_pricer
+        monkeypatch.setattr(
+            pypps,
+            "setup_pricer",
+            lambda pricer: calls.append(pricer) or setup_pricer(pricer),
+        )
+        # No OPPS pricer JAR under jar_path/pricers
+        assert pypps.get_client(Modules.OPPS) is None
+        assert Modules.OPPS in pypps._unavailable_clients
+        assert pypps.get_client(Modules.OPPS) is None
+        assert calls == ["Opps"]
+
+        output = pypps.process(Claim(claimid="1", modules=[Modules.OPPS]))
+        assert output.error == "OPPS client not initialized"
+        assert calls == ["Opps"]
@@ -0,0 +1,153 @@
+"""
+Tests for the per-module result cache.
+
+These tests exercise the cache directly with pydantic outputs and do not need
+a JVM.
+"""
+
+import os
+import pickle
+
+import pytest
+
+from pydrg.helpers.metrics import get_registry
+from pydrg.input.claim import Claim, DiagnosisCode, LineItem, Modules
+from pydrg.ioce.ioce_output import IoceOutput, IoceOutputLineItem
+from pydrg.irfg.irfg_output import IrfgOutput
+from pydrg.msdrg.msdrg_output import MsdrgOutput
+from pydrg.pypps.result_cache import CACHE_REQUESTS, ResultCache
+
+
+def make_claim(claimid="1", charges=100.0, dx="I5020"):
+    return Claim(
+        claimid=claimid,
+        total_charges=charges,
+        los=3,
+        principal_dx=DiagnosisCode(code=dx),
+        lines=[LineItem(hcpcs="99213", charges=charges)],
+    )
+
+
+class TestCacheKeys:
+    """Test that keys only depend on the fields a module reads."""
+
+    def test_unread_fields_do_not_change_key(self):
+        cache = ResultCache()
+        first = cache.key(Modules.MSDRG, make_claim("1", 100.0))
+        second = cache.key(Modules.MSDRG, make_claim("2", 999.0))
+        assert first == second
+
+    def test_read_fields_change_key(self):
+        cache = ResultCache()
+        assert cache.key(Modules.MSDRG, make_claim(dx="I5020")) != cache.key(
+            Modules.MSDRG, make_claim(dx="I5021")
+        )
+        # IOCE reads line charges, MS-DRG does not
+        assert cache.key(Modules.IOCE, make_claim(charges=1.0)) != cache.key(
+            Modules.IOCE, make_claim(charges=2.0)
+        )
+
+    def test_upstream_and_options_change_key(self):
+        cache = ResultCache(fields={Modules.IPPS: ("billing_provider.other_id",)})
+        claim = make_claim()
+        base = cache.key(Modules.IPPS, claim, MsdrgOutput(final_drg_value="291"))
+        assert base != cache.key(
+            Modules.IPPS, claim, MsdrgOutput(final_drg_value="292")
+        )
+        assert base != cache.key(
+            Modules.IPPS, claim, MsdrgOutput(final_drg_value="291"), {"rate": 1}
+        )
+
+    def test_unknown_module_rejected(self):
+        with pytest.raises(ValueError):
+            ResultCache(modules=[Modules.OPPS])
+
+
+class TestCacheTiers:
+    """Test the LRU tier, the SQLite tier and invalidation."""
+
+    def test_hits_misses_and_metrics(self):
+        registry = get_registry()
+        before = registry.counter_value(CACHE_REQUESTS, module="cmg", result="hit")
+        cache = ResultCache()
+        key = cache.key(Modules.CMG, make_claim())
+        assert cache.get(Modules.CMG, key, IrfgOutput) is None
+        cache.put(Modules.CMG, key, IrfgOutput(cmg_group="A0101"))
+        assert cache.get(Modules.CMG, key, IrfgOutput).cmg_group == "A0101"
+
+        stats = cache.stats()["CMG"]
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert (
+            registry.counter_value(CACHE_REQUESTS, module="cmg", result="hit")
+            == before + 1
+        )
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = ResultCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.put(Modules.CMG, key, IrfgOutput())
+        cache.get(Modules.CMG, "a", IrfgOutput)
+        cache.put(Modules.CMG, "c", IrfgOutput())
+        assert cache.get(Modules.CMG, "b", IrfgOutput) is None
+        assert cache.get(Modules.CMG, "a", IrfgOutput) is not None
+        assert cache.stats()["entries"]["memory"] == 2
+
+    def test_put_leaves_lazy_descriptions_unresolved(self):
+        lookups = []
+        output = IoceOutput(line_item_list=[IoceOutputLineItem(hcpcs="99283")])
+        line = output.line_item_list[0]
+        line.defer_description(
+            "hcpcs_description", lambda: lookups.append(1) or "Visit"
+        )
+        line.defer_description("status_indicator_description", lambda: "Paid")
+        assert line.status_indicator_description == "Paid"
+        cache = ResultCache()
+        cache.put(Modules.IOCE, "k", output)
+        assert lookups == []
+
+        cached = cache.get(Modules.IOCE, "k", IoceOutput).line_item_list[0]
+        assert (cached.hcpcs_description, cached.status_indicator_description) == (
+            "",
+            "Paid",
+        )
+        assert line.hcpcs_description == "Visit"
+
+    def test_sqlite_tier_survives_restart(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        cache = ResultCache(max_entries=0, sqlite_path=path)
+        cache.put(Modules.CMG, "k", IrfgOutput(ric=5))
+        cache.close()
+
+        reopened = pickle.loads(pickle.dumps(ResultCache(sqlite_path=path)))
+        assert reopened.get(Modules.CMG, "k", IrfgOutput).ric == 5
+        reopened.close()
+
+    def test_jar_change_invalidates(self, tmp_path):
+        jars = tmp_path / "jars"
+        jars.mkdir()
+        jar = jars / "grouper.jar"
+        jar.write_bytes(b"v1")
+        path = str(tmp_path / "cache.db")
+
+        cache = ResultCache(sqlite_path=path)
+        cache.watch(str(jars))
+        key = cache.key(Modules.CMG, make_claim())
+        cache.put(Modules.CMG, key, IrfgOutput())
+        cache.watch(str(jars))
+        assert cache.get(Modules.CMG, key, IrfgOutput) is not None
+
+        jar.write_bytes(b"v2 with a new size")
+        os.utime(jar, (1, 1))
+        cache.watch(str(jars))
+        assert cache.stats()["entries"]["memory"] == 0
+        assert cache.get(Modules.CMG, key, IrfgOutput) is None
+        assert cache.key(Modules.CMG, make_claim()) != key
+        cache.close()
+
+    def test_invalidate_module(self):
+        cache = ResultCache()
+        cache.put(Modules.CMG, "k", IrfgOutput())
+        cache.put(Modules.MSDRG, "k", MsdrgOutput())
+        cache.invalidate(Modules.CMG)
+        assert cache.get(Modules.CMG, "k", IrfgOutput) is None
+        assert cache.get(Modules.MSDRG, "k", MsdrgOutput) is not None